@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Monitoring middleware benchmark
+Measures the per-request cost of request accounting by driving a minimal FastAPI
+app in-process (no sockets) with three stacks:
+
+  none      no monitoring
+  legacy    the former @app.middleware("http") function (BaseHTTPMiddleware, a lock
+            per counter update, JSON log line written on the request path)
+  asgi      MonitoringMiddleware (raw ASGI, batched counters, background log writer)
+
+Two loads are run per stack: a closed loop of back-to-back requests for the CPU cost
+per request, and an open loop at a fixed arrival rate (5k rps by default) for the
+latency seen under steady load. Results are printed as JSON.
+
+Usage:
+  python benchmark_monitoring_middleware.py
+  python benchmark_monitoring_middleware.py --rps 5000 --duration 5 --requests 50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from fastapi import FastAPI, Request
+
+from asgi_monitoring import MonitoringMiddleware
+from performance_monitor import PerformanceMonitor
+from structured_logger import StructuredLogger
+
+STACKS = ("none", "legacy", "asgi")
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/ping/42",
+    "raw_path": b"/api/ping/42",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [(b"host", b"benchmark")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("benchmark", 80),
+}
+
+
+def quiet_logger(name: str) -> StructuredLogger:
+    """StructuredLogger whose lines go to /dev/null, so serialization is measured but not the terminal"""
+    struct_logger = StructuredLogger(name)
+    struct_logger.logger.propagate = False
+    for handler in struct_logger.logger.handlers:
+        handler.setStream(open(os.devnull, "w"))
+    return struct_logger
+
+
+def build_app(stack: str):
+    app = FastAPI()
+
+    @app.get("/api/ping/{item_id}")
+    async def ping(item_id: int):
+        return {"item_id": item_id}
+
+    monitor = PerformanceMonitor()
+    struct_logger = quiet_logger(f"benchmark-{stack}")
+
+    if stack == "legacy":
+        @app.middleware("http")
+        async def monitoring_middleware(request: Request, call_next):
+            monitor.increment_connections()
+            start_time = time.time()
+            is_error = False
+            try:
+                response = await call_next(request)
+                is_error = response.status_code >= 400
+                return response
+            except Exception as e:
+                is_error = True
+                struct_logger.error(f"Request failed: {str(e)}", path=request.url.path, method=request.method)
+                raise
+            finally:
+                response_time_ms = (time.time() - start_time) * 1000
+                route = request.scope.get("route")
+                route_key = f"{request.method} {route.path if route is not None else 'UNMATCHED'}"
+                monitor.record_request(response_time_ms, is_error, route=route_key)
+                monitor.decrement_connections()
+                struct_logger.info(
+                    f"{request.method} {request.url.path}",
+                    response_time_ms=round(response_time_ms, 2),
+                    status="error" if is_error else "success"
+                )
+
+    elif stack == "asgi":
+        def log_access(record):
+            method, path, response_time_ms, is_error = record
+            struct_logger.info(f"{method} {path}", response_time_ms=round(response_time_ms, 2),
+                               status="error" if is_error else "success")
+
+        app.add_middleware(MonitoringMiddleware, perf_monitor=monitor, access_log=log_access)
+
+    return app, monitor
+
+
+async def call(app) -> int:
+    """One request through the ASGI app; returns its latency in ns"""
+    received = False
+    status = 0
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    start = time.perf_counter_ns()
+    await app(dict(SCOPE), receive, send)
+    elapsed = time.perf_counter_ns() - start
+    if status != 200:
+        raise RuntimeError(f"Unexpected status {status}")
+    return elapsed
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def closed_loop(app, requests: int) -> Dict:
+    for _ in range(min(1000, requests)):
+        await call(app)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return {
+        "requests": requests,
+        "cpu_us_per_request": round(cpu / requests * 1e6, 2),
+        "throughput_rps": round(requests / wall, 1)
+    }
+
+
+async def open_loop(app, rps: float, duration: float) -> Dict:
+    """Start requests at a fixed arrival rate regardless of completions"""
+    latencies: List[int] = []
+    tasks = set()
+
+    async def one():
+        latencies.append(await call(app))
+
+    loop = asyncio.get_running_loop()
+    total = int(rps * duration)
+    cpu_start = time.process_time()
+    start = loop.time()
+    started = 0
+    while started < total:
+        due = min(total, int((loop.time() - start) * rps) + 1)
+        while started < due:
+            task = loop.create_task(one())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            started += 1
+        await asyncio.sleep(0.001)
+    while tasks:
+        await asyncio.gather(*list(tasks))
+    elapsed = loop.time() - start
+    cpu = time.process_time() - cpu_start
+
+    values = sorted(ns / 1e6 for ns in latencies)
+    return {
+        "target_rps": rps,
+        "achieved_rps": round(len(values) / elapsed, 1),
+        "cpu_utilisation": round(cpu / elapsed, 3),
+        "latency_ms": {
+            "mean": round(statistics.mean(values), 4),
+            "p50": round(percentile(values, 50), 4),
+            "p99": round(percentile(values, 99), 4),
+            "max": round(values[-1], 4)
+        }
+    }
+
+
+async def run_stack(stack: str, requests: int, rps: float, duration: float) -> Dict:
+    app, monitor = build_app(stack)
+    result = {"stack": stack}
+    result["closed_loop"] = await closed_loop(app, requests)
+    result["open_loop"] = await open_loop(app, rps, duration)
+    await asyncio.sleep(0.6)  # let batched counters flush
+    result["recorded_requests"] = monitor.get_snapshot().request_count
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the request monitoring middleware")
+    parser.add_argument("--stacks", nargs="+", choices=STACKS, default=list(STACKS))
+    parser.add_argument("--requests", type=int, default=20000, help="Back-to-back requests per stack")
+    parser.add_argument("--rps", type=float, default=5000, help="Open-loop arrival rate")
+    parser.add_argument("--duration", type=float, default=3.0, help="Open-loop duration in seconds")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+
+    results = []
+    for stack in args.stacks:
+        item = asyncio.run(run_stack(stack, args.requests, args.rps, args.duration))
+        results.append(item)
+        print(f"{stack:>8}  {item['closed_loop']['cpu_us_per_request']:8.1f} us/req  "
+              f"open-loop p99 {item['open_loop']['latency_ms']['p99']:7.3f} ms  "
+              f"at {item['open_loop']['achieved_rps']:.0f} rps", file=sys.stderr)
+
+    by_stack = {r["stack"]: r for r in results}
+    overhead = {}
+    if "none" in by_stack:
+        base = by_stack["none"]["closed_loop"]["cpu_us_per_request"]
+        for stack, item in by_stack.items():
+            if stack != "none":
+                overhead[stack] = round(item["closed_loop"]["cpu_us_per_request"] - base, 2)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "config": {"requests": args.requests, "rps": args.rps, "duration": args.duration},
+        "overhead_us_per_request": overhead,
+        "results": results
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
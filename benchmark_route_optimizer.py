@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Route optimizer benchmark
+Runs the multi-stop optimizer used by navigate_baidu_map_multi / navigate_amap_multi
+and POST /api/navigate/multi over reproducible instances, reporting wall time,
+peak memory and tour length against the best known tour as JSON.
+
+Instances:
+  uniform-N      N stops spread uniformly over a 40 km square
+  clustered-N    N stops in a few dense neighbourhoods
+  places-N       real cities and attractions from the bundled gazetteer
+  <city>-N       delivery stops scattered around a real city's attractions
+
+Usage:
+  python benchmark_route_optimizer.py
+  python benchmark_route_optimizer.py --sizes 10 20 30 --repeats 10 --output bench.json
+  python benchmark_route_optimizer.py --best-known best_known.json --max-gap-pct 5 --max-time-ms 100
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import numpy as np
+
+from distance_matrix import DistanceMatrixService
+from gazetteer import Gazetteer, get_gazetteer
+from route_optimizer import (DEFAULT_TIME_BUDGET_MS, _held_karp, _improve, optimize_route,
+                             path_length, solve_open_path)
+
+DEFAULT_SIZES = [5, 10, 12, 20, 30, 50, 100, 200]
+DELIVERY_CITIES = ["北京", "上海", "杭州"]
+EXACT_REFERENCE_MAX_STOPS = 15
+
+Point = Tuple[str, float, float]
+
+
+def generate_uniform(rng: random.Random, stops: int) -> List[Point]:
+    lat0, lon0 = 30.25, 120.15
+    return [(f"U{i:03d}", lat0 + rng.uniform(-0.18, 0.18), lon0 + rng.uniform(-0.21, 0.21))
+            for i in range(stops + 1)]
+
+
+def generate_clustered(rng: random.Random, stops: int) -> List[Point]:
+    centers = [(31.23 + rng.uniform(-0.2, 0.2), 121.47 + rng.uniform(-0.2, 0.2)) for _ in range(max(2, stops // 15))]
+    points = []
+    for i in range(stops + 1):
+        lat, lon = rng.choice(centers)
+        points.append((f"C{i:03d}", rng.gauss(lat, 0.02), rng.gauss(lon, 0.02)))
+    return points
+
+
+def gazetteer_places() -> list:
+    gazetteer = get_gazetteer()
+    len(gazetteer)  # loads the bundled file
+    return gazetteer._places
+
+
+def generate_delivery(rng: random.Random, stops: int, city: str) -> List[Point]:
+    anchors = [p for p in gazetteer_places() if p.city == city]
+    points = []
+    for i in range(stops + 1):
+        anchor = rng.choice(anchors)
+        points.append((f"D{i:03d}", rng.gauss(anchor.lat, 0.01), rng.gauss(anchor.lon, 0.01)))
+    return points
+
+
+def build_instances(sizes: List[int], seed: int, suite: str) -> List[Dict]:
+    instances = []
+    for stops in sizes:
+        rng = random.Random(f"{seed}-{stops}")
+        if suite in ("generated", "all"):
+            instances.append({"name": f"uniform-{stops}", "kind": "generated", "points": generate_uniform(rng, stops)})
+            instances.append({"name": f"clustered-{stops}", "kind": "generated", "points": generate_clustered(rng, stops)})
+        if suite in ("real", "all"):
+            places = gazetteer_places()
+            if stops + 1 <= len(places):
+                sample = rng.sample(places, stops + 1)
+                instances.append({"name": f"places-{stops}", "kind": "real", "gazetteer": True,
+                                  "names": [p.name for p in sample]})
+            for city in DELIVERY_CITIES:
+                instances.append({"name": f"{city}-{stops}", "kind": "real",
+                                  "points": generate_delivery(rng, stops, city)})
+    return instances
+
+
+def instance_gazetteer(points: List[Point], directory: str) -> Gazetteer:
+    """Write generated points to a gazetteer file so they resolve like real place names"""
+    path = os.path.join(directory, f"instance-{len(os.listdir(directory))}.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "lat", "lon", "kind", "city", "aliases"])
+        for name, lat, lon in points:
+            writer.writerow([name, f"{lat:.6f}", f"{lon:.6f}", "poi", "benchmark", ""])
+    return Gazetteer(path)
+
+
+def reference_length(matrix: np.ndarray, budget_ms: float, restarts: int, seed: int) -> Tuple[float, str]:
+    """Best tour length found by exact search where feasible, otherwise by long multi-start local search"""
+    stops = len(matrix) - 1
+    if stops <= EXACT_REFERENCE_MAX_STOPS:
+        return path_length(matrix, _held_karp(np.asarray(matrix))), "exact"
+
+    path, _ = solve_open_path(matrix, time_budget_ms=budget_ms)
+    best = path_length(matrix, path)
+    rng = random.Random(seed)
+    dist = np.asarray(matrix).tolist()
+    for _ in range(restarts):
+        candidate = [0] + rng.sample(range(1, stops + 1), stops)
+        _improve(dist, candidate, time.perf_counter() + budget_ms / 1000.0)
+        best = min(best, path_length(dist, candidate))
+    return best, "local_search"
+
+
+def run_instance(instance: Dict, repeats: int, time_budget_ms: float,
+                 reference_budget_ms: float, restarts: int, seed: int,
+                 directory: str) -> Dict:
+    if instance.get("gazetteer"):
+        gazetteer = get_gazetteer()
+        names = instance["names"]
+    else:
+        gazetteer = instance_gazetteer(instance["points"], directory)
+        names = [name for name, _, _ in instance["points"]]
+    origin, destinations = names[0], names[1:]
+    len(gazetteer)  # load the place file before timing
+
+    timings = []
+    result = None
+    for _ in range(repeats):
+        service = DistanceMatrixService(gazetteer=gazetteer)
+        start = time.perf_counter()
+        result = optimize_route(origin, destinations, time_budget_ms=time_budget_ms, distance_service=service)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    optimize_route(origin, destinations, time_budget_ms=time_budget_ms,
+                   distance_service=DistanceMatrixService(gazetteer=gazetteer))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    service = DistanceMatrixService(gazetteer=gazetteer)
+    places = [gazetteer.find(name) for name in names]
+    matrix = service.matrix_for_points([(p.lat, p.lon) for p in places])
+    index = {name: i for i, name in enumerate(names)}
+    length = path_length(matrix, [0] + [index[name] for name in result.order])
+    best, reference = reference_length(matrix, reference_budget_ms, restarts, seed)
+    if length < best:
+        best, reference = length, "optimizer"
+
+    return {
+        "instance": instance["name"],
+        "kind": instance["kind"],
+        "stops": len(destinations),
+        "method": result.method,
+        "unresolved": len(result.unresolved),
+        "time_ms": {
+            "min": round(min(timings), 3),
+            "median": round(statistics.median(timings), 3),
+            "max": round(max(timings), 3)
+        },
+        "peak_memory_kb": round(peak_bytes / 1024, 1),
+        "tour_km": round(length, 3),
+        "given_order_km": round(path_length(matrix, range(len(names))), 3),
+        "best_known_km": round(best, 3),
+        "best_known_source": reference,
+        "gap_pct": round((length - best) / best * 100, 3) if best > 0 else 0.0
+    }
+
+
+def apply_best_known(results: List[Dict], path: Optional[str]):
+    """Compare against and update a persisted best-known table so references only ever improve"""
+    if not path:
+        return
+    known = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            known = json.load(f)
+
+    for item in results:
+        key = item["instance"]
+        best = min(item["best_known_km"], item["tour_km"], known.get(key, float("inf")))
+        if best < item["best_known_km"]:
+            item["best_known_km"] = round(best, 3)
+            item["best_known_source"] = "file" if best == known.get(key) else "run"
+            item["gap_pct"] = round((item["tour_km"] - best) / best * 100, 3) if best > 0 else 0.0
+        known[key] = best
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(known, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the multi-stop route optimizer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Stop counts to benchmark")
+    parser.add_argument("--suite", choices=["generated", "real", "all"], default="all")
+    parser.add_argument("--seed", type=int, default=2024, help="Seed for instance generation")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per instance")
+    parser.add_argument("--time-budget-ms", type=float, default=DEFAULT_TIME_BUDGET_MS,
+                        help="Optimizer time budget, as used by the navigation tools")
+    parser.add_argument("--reference-budget-ms", type=float, default=1000.0,
+                        help="Time per local-search run when computing best-known tours")
+    parser.add_argument("--restarts", type=int, default=5, help="Random restarts for best-known tours")
+    parser.add_argument("--best-known", help="JSON file of best-known tour lengths, updated in place")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--max-gap-pct", type=float, help="Fail if any instance exceeds this gap")
+    parser.add_argument("--max-time-ms", type=float, help="Fail if any median time exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    instances = build_instances(args.sizes, args.seed, args.suite)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for instance in instances:
+            item = run_instance(instance, args.repeats, args.time_budget_ms,
+                                args.reference_budget_ms, args.restarts, args.seed, directory)
+            results.append(item)
+            print(f"{item['instance']:>16}  {item['method']:>14}  "
+                  f"{item['time_ms']['median']:9.2f} ms  gap {item['gap_pct']:6.2f}%", file=sys.stderr)
+
+    apply_best_known(results, args.best_known)
+
+    failures = []
+    for item in results:
+        if args.max_gap_pct is not None and item["gap_pct"] > args.max_gap_pct:
+            failures.append(f"{item['instance']}: gap {item['gap_pct']}% > {args.max_gap_pct}%")
+        if args.max_time_ms is not None and item["time_ms"]["median"] > args.max_time_ms:
+            failures.append(f"{item['instance']}: median {item['time_ms']['median']} ms > {args.max_time_ms} ms")
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform()
+        },
+        "config": {
+            "sizes": args.sizes,
+            "suite": args.suite,
+            "seed": args.seed,
+            "repeats": args.repeats,
+            "time_budget_ms": args.time_budget_ms,
+            "reference_budget_ms": args.reference_budget_ms,
+            "restarts": args.restarts
+        },
+        "summary": {
+            "instances": len(results),
+            "mean_gap_pct": round(statistics.mean(r["gap_pct"] for r in results), 3) if results else 0.0,
+            "max_gap_pct": max((r["gap_pct"] for r in results), default=0.0),
+            "max_median_time_ms": max((r["time_ms"]["median"] for r in results), default=0.0),
+            "failures": failures
+        },
+        "results": results
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 import webbrowser
@@ -12,17 +12,23 @@ import subprocess
 import re
 import uvicorn
 import os
-import time
 import asyncio
 from destination_reminder import DestinationReminder
 from speed_monitor import SpeedMonitor
 from travel_guide import TravelGuidePlanner, TravelGuide
 from transportation_recommender import TransportationRecommender, RouteRecommendation, TransportationOption
+from distance_matrix import get_distance_service
+from route_optimizer import optimize_route
 from performance_monitor import PerformanceMonitor
 from exception_handler import ExceptionHandler
+from bulkhead import BulkheadFullError
+from hedging import HedgePolicy
 from sre_notifier import SRENotifier, NotificationConfig
 from auto_scaler import AutoScaler
 from structured_logger import StructuredLogger
+from metrics_exporter import MetricsExporter, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from shared_metrics import SharedMetrics
+from asgi_monitoring import MonitoringMiddleware
 
 app = FastAPI(
     title="AI Navigation Assistant API",
@@ -30,21 +36,40 @@ app = FastAPI(
     version="2.0.0"
 )
 
-reminder_service = DestinationReminder()
 speed_monitor = SpeedMonitor()
 travel_planner = TravelGuidePlanner()
 transport_recommender = TransportationRecommender()
+distance_service = get_distance_service()
+
+# None unless AI_NAVIGATOR_SHARED_METRICS is set; then all workers report pod-wide figures
+shared_metrics = SharedMetrics.from_env()
 
 perf_monitor = PerformanceMonitor(
     cpu_threshold=80.0,
     memory_threshold=85.0,
     error_rate_threshold=0.05,
-    response_time_threshold_ms=1000.0
+    response_time_threshold_ms=1000.0,
+    shared_metrics=shared_metrics
 )
 
 exception_handler = ExceptionHandler(
     max_retry_attempts=3,
-    circuit_breaker_threshold=5
+    circuit_breaker_threshold=5,
+    shared_metrics=shared_metrics
+)
+
+# Each slow dependency gets its own concurrency limit so it cannot take every worker
+# thread; blocking kubectl and webhook calls run in threads inside their bulkhead
+weather_bulkhead = exception_handler.bulkhead("weather", max_concurrent=20, max_queue=50)
+kubectl_bulkhead = exception_handler.bulkhead("kubectl", max_concurrent=1, max_queue=2)
+notification_bulkhead = exception_handler.bulkhead("notifications", max_concurrent=4, max_queue=16)
+
+# Hedged weather requests; WEATHER_HEDGE_RATIO=0 disables hedging
+weather_hedge_ratio = float(os.getenv("WEATHER_HEDGE_RATIO", "0.1"))
+reminder_service = DestinationReminder(
+    weather_bulkhead=weather_bulkhead,
+    weather_hedge=HedgePolicy("weather", percentile=95.0, max_hedge_ratio=weather_hedge_ratio)
+    if weather_hedge_ratio > 0 else None
 )
 
 notifier_config = NotificationConfig(
@@ -56,10 +81,22 @@ auto_scaler = AutoScaler(
     deployment_type=os.getenv("DEPLOYMENT_TYPE", "kubernetes"),
     min_replicas=3,
     max_replicas=10,
-    deployment_name="ai-navigator"
+    deployment_name="ai-navigator",
+    shared_metrics=shared_metrics
 )
 
-struct_logger = StructuredLogger("ai-navigator", log_level=os.getenv("LOG_LEVEL", "INFO"))
+struct_logger = StructuredLogger(
+    "ai-navigator",
+    log_level=os.getenv("LOG_LEVEL", "INFO"),
+    async_mode=os.getenv("LOG_MODE", "async") == "async",
+    overflow=os.getenv("LOG_OVERFLOW", "drop"),
+    sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+    slow_threshold_ms=float(os.getenv("LOG_SLOW_MS", "1000")),
+    rate_limit_per_second=float(os.getenv("LOG_RATE_LIMIT", "0")),
+    rate_limit_burst=int(os.getenv("LOG_RATE_BURST", "20"))
+)
+
+metrics_exporter = MetricsExporter(perf_monitor, exception_handler, auto_scaler, sre_notifier, struct_logger)
 
 perf_monitor.start_monitoring(interval_seconds=30)
 
@@ -71,30 +108,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.middleware("http")
-async def monitoring_middleware(request: Request, call_next):
-    perf_monitor.increment_connections()
-    start_time = time.time()
-    is_error = False
-    
+def log_access(record):
+    method, path, response_time_ms, is_error, route_key = record
+    struct_logger.info(
+        f"{method} {path}",
+        log_key=route_key,
+        response_time_ms=round(response_time_ms, 2),
+        status="error" if is_error else "success"
+    )
+
+def log_request_error(method: str, path: str, error: Exception):
+    struct_logger.error(f"Request failed: {str(error)}", path=path, method=method)
+
+async def send_notification(send, *args, **kwargs):
+    # A full notification bulkhead drops the notification rather than failing the request
     try:
-        response = await call_next(request)
-        is_error = response.status_code >= 400
-        return response
-    except Exception as e:
-        is_error = True
-        struct_logger.error(f"Request failed: {str(e)}", path=request.url.path, method=request.method)
-        raise
-    finally:
-        response_time_ms = (time.time() - start_time) * 1000
-        perf_monitor.record_request(response_time_ms, is_error)
-        perf_monitor.decrement_connections()
-        
-        struct_logger.info(
-            f"{request.method} {request.url.path}",
-            response_time_ms=round(response_time_ms, 2),
-            status="error" if is_error else "success"
-        )
+        await notification_bulkhead.run_sync(send, *args, **kwargs)
+    except BulkheadFullError as e:
+        struct_logger.warning(f"Notification dropped: {str(e)}", log_key="notification_dropped")
+
+
+app.add_middleware(
+    MonitoringMiddleware,
+    perf_monitor=perf_monitor,
+    access_log=log_access,
+    error_log=log_request_error,
+    access_log_in_background=not struct_logger.async_mode
+)
 
 static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 if os.path.exists(static_dir):
@@ -125,6 +165,10 @@ class MultiNavigationRequest(BaseModel):
         description="Map service to use"
     )
 
+class DistanceMatrixRequest(BaseModel):
+    locations: List[str] = Field(..., min_items=2, max_items=200, description="Locations to compute pairwise distances for")
+    road_distance: bool = Field(False, description="Scale great-circle distances by the road detour factor")
+
 class LocationRequest(BaseModel):
     location: str = Field(..., description="Location to display on map")
     map_type: Optional[Literal["baidu", "amap"]] = Field(
@@ -145,6 +189,10 @@ class NavigationResponse(BaseModel):
     url: str
     details: dict
 
+class BatchWeatherRequest(BaseModel):
+    locations: List[str] = Field(..., min_items=1, max_items=50, description="Locations to fetch weather for")
+    include_recommendations: bool = Field(False, description="Also return travel recommendations for each location")
+
 class SpeedCheckRequest(BaseModel):
     current_speed: float = Field(..., description="Current speed in km/h")
     road_type: Optional[Literal["城市道路", "城市快速路", "普通公路", "高速公路", "学校区域", "居民区"]] = Field(
@@ -348,6 +396,16 @@ def parse_natural_language(query: str) -> dict:
     
     return result
 
+@app.on_event("startup")
+async def start_loop_lag_monitoring():
+    perf_monitor.start_loop_monitoring()
+
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    await perf_monitor.stop_loop_monitoring()
+    await reminder_service.aclose()
+    struct_logger.close()
+
 @app.get("/", tags=["Info"])
 async def root():
     static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
@@ -426,8 +484,10 @@ async def navigate_multi(request: MultiNavigationRequest):
     """
     Navigate through multiple destinations using specified map service.
     
+    When optimize is set, destinations are reordered to shorten the total route.
+    
     Args:
-        request: MultiNavigationRequest with origin, destinations list, mode, and map_type
+        request: MultiNavigationRequest with origin, destinations list, mode, optimize flag, and map_type
         
     Returns:
         NavigationResponse with success status, message, URL, and details
@@ -442,14 +502,20 @@ async def navigate_multi(request: MultiNavigationRequest):
             if not dest or not dest.strip():
                 raise HTTPException(status_code=400, detail=f"第{i+1}个目的地地址不能为空")
         
+        destinations = request.destinations
+        optimization = None
+        if request.optimize:
+            optimization = await asyncio.to_thread(optimize_route, request.origin, request.destinations)
+            destinations = optimization.order
+        
         if request.map_type == "baidu":
-            waypoints = "|".join([quote(dest) for dest in request.destinations[:-1]])
+            waypoints = "|".join([quote(dest) for dest in destinations[:-1]])
             origin_encoded = quote(request.origin)
-            final_destination_encoded = quote(request.destinations[-1])
+            final_destination_encoded = quote(destinations[-1])
             url = f"https://map.baidu.com/?ugc_type=3&ugc_ver=1&qt=nav&start=0,{origin_encoded}&end=0,{final_destination_encoded}&sy=3&mode={request.mode}"
             webbrowser.open(url)
         else:
-            all_points = [request.origin] + request.destinations
+            all_points = [request.origin] + destinations
             urls = []
             for i in range(len(all_points) - 1):
                 from_point = quote(all_points[i])
@@ -474,11 +540,12 @@ async def navigate_multi(request: MultiNavigationRequest):
             url=url,
             details={
                 "origin": request.origin,
-                "destinations": request.destinations,
+                "destinations": destinations,
                 "mode": request.mode,
                 "optimize": request.optimize,
+                "route_optimization": optimization.to_dict() if optimization else None,
                 "map_type": request.map_type,
-                "total_stops": len(request.destinations),
+                "total_stops": len(destinations),
                 "music_status": music_status
             }
         )
@@ -487,6 +554,36 @@ async def navigate_multi(request: MultiNavigationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/distance/matrix", tags=["Navigation"])
+async def get_distance_matrix(request: DistanceMatrixRequest):
+    """
+    Compute pairwise distances between locations.
+    
+    Locations are resolved through the offline gazetteer; unknown locations are
+    listed separately and left out of the matrix.
+    
+    Args:
+        request: DistanceMatrixRequest with locations and road_distance flag
+        
+    Returns:
+        Resolved locations, unresolved names and the distance matrix in km
+    """
+    try:
+        result = distance_service.matrix_for_locations(request.locations)
+        matrix = result["matrix"]
+        if request.road_distance:
+            matrix = matrix * distance_service.road_detour_factor
+        return {
+            "success": not result["unresolved"],
+            "unit": "km",
+            "distance_type": "road_estimate" if request.road_distance else "great_circle",
+            "locations": result["resolved"],
+            "unresolved": result["unresolved"],
+            "matrix": matrix.round(3).tolist()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/location", response_model=NavigationResponse, tags=["Location"])
 async def show_location(request: LocationRequest):
     """
@@ -589,7 +686,7 @@ async def health_check():
 @app.get("/api/weather/{location}", tags=["Destination Info"])
 async def get_weather(location: str):
     try:
-        weather_info = reminder_service.get_weather(location)
+        weather_info = await reminder_service.get_weather_async(location)
         if "error" in weather_info:
             raise HTTPException(status_code=500, detail=weather_info["error"])
         return {
@@ -600,6 +697,31 @@ async def get_weather(location: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/weather/batch", tags=["Destination Info"])
+async def get_weather_batch(request: BatchWeatherRequest):
+    """
+    Fetch weather for multiple locations concurrently.
+    
+    Repeated locations are fetched once; failures are reported per item.
+    
+    Args:
+        request: BatchWeatherRequest with locations and include_recommendations flag
+        
+    Returns:
+        Per-location results with success and failure counts
+    """
+    try:
+        batch = await reminder_service.get_weather_batch_async(
+            request.locations,
+            include_recommendations=request.include_recommendations
+        )
+        return {
+            "success": batch["failed"] == 0,
+            **batch
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/recommendations/{location}", tags=["Destination Info"])
 async def get_recommendations(location: str):
     try:
@@ -615,7 +737,7 @@ async def get_recommendations(location: str):
 @app.get("/api/destination-info/{location}", tags=["Destination Info"])
 async def get_destination_info(location: str):
     try:
-        info = reminder_service.get_destination_info(location)
+        info = await reminder_service.get_destination_info_async(location)
         return {
             "success": True,
             "location": location,
@@ -882,6 +1004,13 @@ async def get_transportation_modes():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics", tags=["Monitoring"], response_class=Response)
+async def get_prometheus_metrics():
+    """
+    Prometheus/OpenMetrics 格式的监控指标,供 Prometheus 抓取
+    """
+    return Response(content=metrics_exporter.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/api/monitoring/status", tags=["Monitoring"])
 async def get_monitoring_status():
     """
@@ -893,22 +1022,58 @@ async def get_monitoring_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/monitoring/endpoints", tags=["Monitoring"])
+async def get_endpoint_latencies(sort_by: Literal["p50", "p90", "p99", "p999", "count", "error_rate", "max_ms"] = "p99"):
+    """
+    获取各接口(方法 + 路由模板)的延迟分布,包括 p50/p90/p99/p999 与错误率
+    """
+    try:
+        endpoints = perf_monitor.get_endpoint_latencies(sort_by=sort_by)
+        return {
+            "success": True,
+            "count": len(endpoints),
+            "overall": perf_monitor.get_latency_summary(),
+            "endpoints": endpoints
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/monitoring/event-loop", tags=["Monitoring"])
+async def get_event_loop_lag(recent: int = 10):
+    """
+    获取事件循环延迟分布与最近的阻塞记录(含阻塞时事件循环线程的调用栈)
+    
+    Args:
+        recent: 返回最近N次阻塞记录
+    """
+    try:
+        return {
+            "success": True,
+            **perf_monitor.loop_monitor.get_stats(recent=recent)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/monitoring/metrics/history", tags=["Monitoring"])
-async def get_metrics_history(minutes: Optional[int] = 60):
+async def get_metrics_history(minutes: Optional[int] = 60, resolution: Optional[str] = None):
     """
     获取历史性能指标数据
     
     Args:
         minutes: 获取最近N分钟的数据(默认60分钟)
+        resolution: 聚合粒度 1m / 5m / 1h,每个时间桶返回 min/max/avg/p95;不指定则返回原始采样
     """
     try:
-        metrics = perf_monitor.get_metrics_history(minutes=minutes)
+        metrics = perf_monitor.get_metrics_history(minutes=minutes, resolution=resolution)
         return {
             "success": True,
             "data": metrics,
             "count": len(metrics),
-            "time_range_minutes": minutes
+            "time_range_minutes": minutes,
+            "resolution": resolution or "raw"
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -944,6 +1109,19 @@ async def resolve_alert(metric_type: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/monitoring/weather", tags=["Monitoring"])
+async def get_weather_stats():
+    """
+    获取天气服务缓存命中率及上游请求统计
+    """
+    try:
+        return {
+            "success": True,
+            "stats": reminder_service.get_weather_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/exceptions/summary", tags=["Exception Handling"])
 async def get_exception_summary():
     """
@@ -970,6 +1148,35 @@ async def get_unresolved_exceptions():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/exceptions/fingerprints", tags=["Exception Handling"])
+async def get_exception_fingerprints(limit: int = 20):
+    """
+    按指纹（异常类型 + 最内层调用帧）聚合的异常统计，按出现次数降序
+    """
+    try:
+        fingerprints = exception_handler.get_fingerprints(limit)
+        return {
+            "success": True,
+            "fingerprints": fingerprints,
+            "count": len(fingerprints)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/exceptions/fingerprints/{fingerprint}/traceback", tags=["Exception Handling"])
+async def get_exception_traceback(fingerprint: str):
+    """
+    获取指定指纹的完整调用栈（首次请求时生成）
+    """
+    traceback_text = exception_handler.get_fingerprint_traceback(fingerprint)
+    if traceback_text is None:
+        raise HTTPException(status_code=404, detail=f"未找到异常指纹 {fingerprint}")
+    return {
+        "success": True,
+        "fingerprint": fingerprint,
+        "traceback": traceback_text
+    }
+
 @app.post("/api/exceptions/{exception_type}/resolve", tags=["Exception Handling"])
 async def mark_exception_resolved(exception_type: str):
     """
@@ -1004,11 +1211,11 @@ async def evaluate_and_scale():
     try:
         recommendation = perf_monitor.get_scaling_recommendation()
         
-        scaling_event = auto_scaler.evaluate_scaling(recommendation)
+        scaling_event = await kubectl_bulkhead.run_sync(auto_scaler.evaluate_scaling, recommendation)
         
         if scaling_event.success and scaling_event.action != "no_action":
             report = auto_scaler.generate_scaling_report(scaling_event)
-            sre_notifier.send_scaling_report(report)
+            await send_notification(sre_notifier.send_scaling_report, report)
         
         return {
             "success": True,
@@ -1020,6 +1227,8 @@ async def evaluate_and_scale():
                 "success": scaling_event.success
             }
         }
+    except BulkheadFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1033,11 +1242,11 @@ async def manual_scale(replicas: int, reason: str = "Manual scaling request"):
         reason: 扩缩容原因
     """
     try:
-        event = auto_scaler.manual_scale(replicas, reason)
+        event = await kubectl_bulkhead.run_sync(auto_scaler.manual_scale, replicas, reason)
         
         if event.success:
             report = auto_scaler.generate_scaling_report(event)
-            sre_notifier.send_scaling_report(report)
+            await send_notification(sre_notifier.send_scaling_report, report)
         
         return {
             "success": event.success,
@@ -1051,6 +1260,8 @@ async def manual_scale(replicas: int, reason: str = "Manual scaling request"):
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except BulkheadFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1112,7 +1323,8 @@ async def send_test_notification():
     发送测试通知
     """
     try:
-        sre_notifier.send_alert(
+        await notification_bulkhead.run_sync(
+            sre_notifier.send_alert,
             subject="测试通知",
             message="这是一条测试通知,用于验证通知系统配置是否正确",
             severity="info"
@@ -1121,6 +1333,8 @@ async def send_test_notification():
             "success": True,
             "message": "测试通知已发送"
         }
+    except BulkheadFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
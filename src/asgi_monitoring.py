@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+ASGI Monitoring Middleware
+Request accounting as a raw ASGI middleware: timing with perf_counter_ns, counters
+handed to PerformanceMonitor in batches and access-log lines written off the event
+loop by a background thread
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from performance_monitor import PerformanceMonitor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.5
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# (method, path, response_time_ms, is_error, route_key)
+AccessRecord = Tuple[str, str, float, bool, str]
+
+
+class AccessLogWriter:
+    """Bounded queue of access records drained by a daemon thread; full queue drops records"""
+
+    def __init__(self, emit: Callable[[AccessRecord], None], max_queue: int = DEFAULT_LOG_QUEUE_SIZE):
+        self.emit = emit
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: AccessRecord):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            try:
+                self.emit(record)
+            except Exception as e:
+                logger.error(f"Access log write failed: {e}")
+
+    def close(self, timeout: float = 1.0):
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+
+
+class MonitoringMiddleware:
+    """
+    Counts requests, errors (exceptions or status >= 400), in-flight connections and
+    per-route latency. Samples are buffered on the event loop thread and flushed to
+    the monitor every batch_size requests or flush_interval_seconds, whichever is first.
+    """
+
+    def __init__(self, app,
+                 perf_monitor: PerformanceMonitor,
+                 access_log: Optional[Callable[[AccessRecord], None]] = None,
+                 error_log: Optional[Callable[[str, str, Exception], None]] = None,
+                 access_log_in_background: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        """
+        Args:
+            app: Wrapped ASGI application
+            perf_monitor: Receives the batched samples
+            access_log: Called with each AccessRecord
+            error_log: Called inline with (method, path, exception) when a request raises
+            access_log_in_background: Call access_log from a writer thread; disable when
+                access_log itself only enqueues (e.g. an async StructuredLogger)
+            batch_size: Samples buffered before a flush
+            flush_interval_seconds: Longest a sample waits before a flush
+        """
+        self.app = app
+        self.perf_monitor = perf_monitor
+        self.error_log = error_log
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.access_log = None
+        if access_log is not None:
+            self.access_log = AccessLogWriter(access_log) if access_log_in_background else access_log
+
+        self._pending: List[Tuple[float, bool, Optional[str]]] = []
+        self._connections_delta = 0
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            if scope["type"] == "lifespan":
+                await self._lifespan(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+            return
+
+        if self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+        self._connections_delta += 1
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        is_error = True
+        try:
+            await self.app(scope, receive, send_wrapper)
+            is_error = status_code >= 400
+        except Exception as e:
+            if self.error_log is not None:
+                self.error_log(scope["method"], scope["path"], e)
+            raise
+        finally:
+            response_time_ms = (time.perf_counter_ns() - start) / 1_000_000
+            route = scope.get("route")
+            route_key = f"{scope['method']} {route.path if route is not None else 'UNMATCHED'}"
+            self._pending.append((response_time_ms, is_error, route_key))
+            self._connections_delta -= 1
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            if self.access_log is not None:
+                record = (scope["method"], scope["path"], response_time_ms, is_error, route_key)
+                if isinstance(self.access_log, AccessLogWriter):
+                    self.access_log.submit(record)
+                else:
+                    self.access_log(record)
+
+    async def _lifespan(self, scope, receive, send):
+        async def send_wrapper(message):
+            if message["type"] == "lifespan.shutdown.complete":
+                self.close()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            self.flush()
+
+    def flush(self):
+        if not self._pending and not self._connections_delta:
+            return
+        samples, self._pending = self._pending, []
+        delta, self._connections_delta = self._connections_delta, 0
+        self.perf_monitor.record_requests(samples, connections_delta=delta)
+
+    def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        self.flush()
+        if isinstance(self.access_log, AccessLogWriter):
+            self.access_log.close()
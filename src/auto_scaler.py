@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Literal
 from dataclasses import dataclass, asdict
 
+from shared_metrics import SharedMetrics
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -23,7 +25,8 @@ class AutoScaler:
                  deployment_type: Literal["kubernetes", "docker-compose", "systemd"] = "kubernetes",
                  min_replicas: int = 3,
                  max_replicas: int = 10,
-                 deployment_name: str = "ai-navigator"):
+                 deployment_name: str = "ai-navigator",
+                 shared_metrics: Optional[SharedMetrics] = None):
         
         self.deployment_type = deployment_type
         self.min_replicas = min_replicas
@@ -31,10 +34,26 @@ class AutoScaler:
         self.deployment_name = deployment_name
         
         self.scaling_history: List[ScalingEvent] = []
-        self.current_replicas = min_replicas
+        # Workers of one pod share the replica count so they do not scale independently
+        self.shared_metrics = shared_metrics
+        self._current_replicas = min_replicas
+        if shared_metrics is not None and shared_metrics.replicas == 0:
+            shared_metrics.replicas = min_replicas
         
         logger.info(f"Auto-scaler initialized: type={deployment_type}, replicas={min_replicas}-{max_replicas}")
 
+    @property
+    def current_replicas(self) -> int:
+        if self.shared_metrics is not None:
+            return self.shared_metrics.replicas
+        return self._current_replicas
+
+    @current_replicas.setter
+    def current_replicas(self, value: int):
+        if self.shared_metrics is not None:
+            self.shared_metrics.replicas = value
+        self._current_replicas = value
+
     def evaluate_scaling(self, recommendation: Dict) -> Optional[ScalingEvent]:
         should_scale_up = recommendation.get("should_scale_up", False)
         should_scale_down = recommendation.get("should_scale_down", False)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Bulkhead Module
+Per-dependency concurrency limits: an asyncio semaphore with a bounded wait queue
+that rejects immediately once both are full, so one slow dependency cannot take
+every worker thread or pile up unbounded coroutines on the event loop
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class BulkheadFullError(Exception):
+    """Raised when a bulkhead has no free slot and its wait queue is full"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        super().__init__(f"Bulkhead {name} is full ({max_concurrent} running, {max_queue} queued)")
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+
+
+class Bulkhead:
+    """
+    At most max_concurrent calls run; up to max_queue more wait for a slot (for at
+    most queue_timeout_seconds, if set) and anything beyond that is rejected with
+    BulkheadFullError. The semaphore belongs to the event loop that last used it.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = 10, max_queue: int = 20,
+                 queue_timeout_seconds: Optional[float] = None):
+        """
+        Args:
+            name: Dependency the bulkhead protects
+            max_concurrent: Calls allowed to run at once
+            max_queue: Calls allowed to wait for a slot
+            queue_timeout_seconds: Longest wait for a slot before rejecting
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+
+        self.active = 0
+        self.queued = 0
+        self.accepted_total = 0
+        self.rejected_total = 0
+        self.queue_timeouts_total = 0
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            self.active = self.queued = 0
+        return self._semaphore
+
+    async def acquire(self):
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            if self.queued >= self.max_queue:
+                self.rejected_total += 1
+                raise BulkheadFullError(self.name, self.max_concurrent, self.max_queue)
+            self.queued += 1
+            try:
+                if self.queue_timeout_seconds is None:
+                    await semaphore.acquire()
+                else:
+                    await asyncio.wait_for(semaphore.acquire(), self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self.rejected_total += 1
+                self.queue_timeouts_total += 1
+                raise BulkheadFullError(self.name, self.max_concurrent, self.max_queue)
+            finally:
+                self.queued -= 1
+        else:
+            await semaphore.acquire()
+        self.active += 1
+        self.accepted_total += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self) -> "Bulkhead":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) inside the bulkhead"""
+        async with self:
+            return await func(*args, **kwargs)
+
+    async def run_sync(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking func in the default executor inside the bulkhead"""
+        async with self:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    def get_stats(self) -> Dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.queued,
+            "accepted_total": self.accepted_total,
+            "rejected_total": self.rejected_total,
+            "queue_timeouts_total": self.queue_timeouts_total
+        }
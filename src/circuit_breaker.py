@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Module
+Closed / open / half-open breaker per dependency. Trips on consecutive failures or
+on the failure rate over a sliding window, admits a bounded number of concurrent
+probes once the open timeout passes, and guards every transition with a lock so it
+can be shared by coroutines and threads
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker rejects the call"""
+
+    def __init__(self, name: str, retry_after_seconds: float):
+        super().__init__(f"Circuit breaker open for {name}")
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(frozen=True)
+class CircuitPermit:
+    """Proof that a call was admitted; hand it back with the call's outcome"""
+    generation: int
+    probe: bool
+
+
+class CircuitBreaker:
+    """
+    CLOSED: every call is admitted; the breaker opens after failure_threshold
+    consecutive failures, or when at least minimum_calls in the window failed at
+    failure_rate_threshold or more.
+    OPEN: calls are rejected until open_timeout_seconds have passed.
+    HALF_OPEN: at most half_open_max_probes calls are in flight; that many successes
+    in a row close the breaker, any failure reopens it.
+
+    Outcomes of calls admitted before the last transition are ignored. A call that
+    ends without an outcome must hand its permit back through release().
+    """
+
+    def __init__(self, name: str,
+                 failure_threshold: int = 5,
+                 failure_rate_threshold: float = 0.5,
+                 window_seconds: int = 30,
+                 minimum_calls: int = 10,
+                 open_timeout_seconds: float = 60.0,
+                 half_open_max_probes: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: Dependency the breaker protects
+            failure_threshold: Consecutive failures that open the breaker
+            failure_rate_threshold: Failure fraction in the window that opens the breaker
+            window_seconds: Sliding window length, kept as one bucket per second
+            minimum_calls: Calls in the window before the failure rate is considered
+            open_timeout_seconds: Time spent open before probing
+            half_open_max_probes: Concurrent probes, and successes needed to close
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.open_timeout_seconds = open_timeout_seconds
+        self.half_open_max_probes = half_open_max_probes
+        self.clock = clock
+
+        self.consecutive_failures = 0
+        self.rejected_total = 0
+        self.transitions_total = 0
+        self.opened_at: Optional[float] = None
+
+        self._state = CircuitState.CLOSED
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # [second, calls, failures], oldest first
+        self._buckets: deque = deque()
+        self._calls = 0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self.clock() - self.opened_at >= self.open_timeout_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState):
+        previous = self._state
+        self._state = state
+        self._generation += 1
+        self.transitions_total += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state is CircuitState.OPEN:
+            self.opened_at = self.clock()
+            logger.error(f"Circuit breaker OPENED for {self.name} (from {previous.value}, "
+                         f"consecutive failures: {self.consecutive_failures}, "
+                         f"window: {self._failures}/{self._calls})")
+        elif state is CircuitState.HALF_OPEN:
+            logger.info(f"Circuit breaker for {self.name} moved to half-open state")
+        else:
+            self.opened_at = None
+            self.consecutive_failures = 0
+            self._buckets.clear()
+            self._calls = self._failures = 0
+            logger.info(f"Circuit breaker for {self.name} recovered and CLOSED")
+
+    def _bucket(self) -> list:
+        second = int(self.clock())
+        horizon = second - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= horizon:
+            _, calls, failures = self._buckets.popleft()
+            self._calls -= calls
+            self._failures -= failures
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def acquire(self) -> Optional[CircuitPermit]:
+        """A permit when the call may proceed, None (counted as rejected) otherwise"""
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return CircuitPermit(self._generation, probe=False)
+            if state is CircuitState.HALF_OPEN and self._probes_in_flight < self.half_open_max_probes:
+                self._probes_in_flight += 1
+                return CircuitPermit(self._generation, probe=True)
+            self.rejected_total += 1
+            return None
+
+    def retry_after_seconds(self) -> float:
+        with self._lock:
+            if self._current_state() is not CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.open_timeout_seconds - self.clock())
+
+    def on_success(self, permit: CircuitPermit):
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            if permit.probe:
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_probes:
+                    self._transition(CircuitState.CLOSED)
+                return
+            self._bucket()[1] += 1
+            self._calls += 1
+            self.consecutive_failures = 0
+
+    def on_failure(self, permit: CircuitPermit):
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            self.consecutive_failures += 1
+            if permit.probe:
+                self._transition(CircuitState.OPEN)
+                return
+            bucket = self._bucket()
+            bucket[1] += 1
+            bucket[2] += 1
+            self._calls += 1
+            self._failures += 1
+            if self.consecutive_failures >= self.failure_threshold or (
+                    self._calls >= self.minimum_calls
+                    and self._failures / self._calls >= self.failure_rate_threshold):
+                self._transition(CircuitState.OPEN)
+
+    def release(self, permit: CircuitPermit):
+        """Return a permit whose call ended without an outcome (e.g. it was cancelled)"""
+        with self._lock:
+            if permit.generation == self._generation and permit.probe:
+                self._probes_in_flight -= 1
+
+    def reset(self):
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+            self.consecutive_failures = 0
+
+    def get_state(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            if self._buckets:
+                self._bucket()
+            return {
+                "state": state.value,
+                "status": state.name,
+                "is_open": state is CircuitState.OPEN,
+                "failure_count": self.consecutive_failures,
+                "window_calls": self._calls,
+                "window_failures": self._failures,
+                "failure_rate": round(self._failures / self._calls, 4) if self._calls else 0.0,
+                "probes_in_flight": self._probes_in_flight,
+                "rejected_total": self.rejected_total,
+                "transitions_total": self.transitions_total
+            }
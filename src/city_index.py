@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+City Index Module
+Canonical city names, aliases and immutable helpers shared by the destination knowledge tables
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+
+CITY_ALIASES = {
+    "北京": ("北京市", "Beijing", "Peking", "帝都", "京城"),
+    "上海": ("上海市", "Shanghai", "魔都", "申城"),
+    "杭州": ("杭州市", "Hangzhou"),
+    "广州": ("广州市", "Guangzhou", "Canton", "羊城", "花城"),
+    "深圳": ("深圳市", "Shenzhen", "鹏城"),
+    "成都": ("成都市", "Chengdu", "蓉城"),
+    "西安": ("西安市", "Xi'an", "Xian"),
+    "天津": ("天津市", "Tianjin"),
+    "南京": ("南京市", "Nanjing", "金陵"),
+    "重庆": ("重庆市", "Chongqing", "山城"),
+}
+
+CANONICAL_CITIES = tuple(CITY_ALIASES.keys())
+
+_ALIAS_INDEX: Mapping[str, str] = MappingProxyType({
+    name.casefold(): canonical
+    for canonical, aliases in CITY_ALIASES.items()
+    for name in (canonical,) + aliases
+})
+
+
+@lru_cache(maxsize=2048)
+def resolve_city(name: str) -> Optional[str]:
+    """
+    Resolve a free-form location to a canonical city name
+
+    Exact names and aliases ("Beijing", "北京市", "帝都") resolve through a hash
+    lookup. Otherwise the first canonical city contained in the location
+    ("北京天安门") or containing it is returned, matching the substring rules
+    the knowledge tables have always used.
+
+    Args:
+        name: Location name
+
+    Returns:
+        Canonical city name, or None if the location is not a known city
+    """
+    key = name.strip()
+    if not key:
+        return None
+
+    canonical = _ALIAS_INDEX.get(key.casefold())
+    if canonical:
+        return canonical
+
+    for city in CANONICAL_CITIES:
+        if city in key or key in city:
+            return city
+
+    return None
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
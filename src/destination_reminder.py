@@ -3,22 +3,277 @@
 Destination Reminder Module
 Provides weather information and travel recommendations for destinations
 """
+import asyncio
+import httpx
 import requests
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote
 import json
+from weather_cache import WeatherCache
+from weather_client import AsyncWeatherClient
+from single_flight import AsyncSingleFlight
+from bulkhead import Bulkhead, BulkheadFullError
+from hedging import HedgePolicy
+from city_index import freeze
+from destination_store import DestinationStore, get_destination_store
+
+
+DESTINATION_TIPS = freeze({
+    "北京": {
+        "best_time": "春季(3-5月)和秋季(9-11月)最佳,天气宜人",
+        "tips": [
+            "提前在线预约故宫、长城等热门景点门票",
+            "避开国庆、春节等节假日高峰期",
+            "冬季天气寒冷,注意保暖",
+            "建议办理公交卡,方便乘坐地铁和公交"
+        ],
+        "transportation": [
+            "地铁网络发达,覆盖主要景点",
+            "首都机场和大兴机场都有机场快轨",
+            "共享单车适合短距离出行"
+        ],
+        "attractions": [
+            "故宫博物院 - 中国古代皇家宫殿",
+            "八达岭长城 - 明长城最具代表性的地段",
+            "天坛公园 - 明清皇帝祭天的场所",
+            "颐和园 - 中国现存最大的皇家园林",
+            "南锣鼓巷 - 老北京胡同文化体验"
+        ],
+        "cuisine": [
+            "北京烤鸭 - 全聚德、便宜坊",
+            "老北京炸酱面",
+            "铜锅涮肉",
+            "豆汁儿、焦圈(传统早餐)"
+        ]
+    },
+    "上海": {
+        "best_time": "春季(3-5月)和秋季(9-11月)最适宜游览",
+        "tips": [
+            "外滩夜景最佳观赏时间为傍晚",
+            "迪士尼乐园建议购买快速通行证",
+            "梅雨季节(6-7月)记得带伞",
+            "使用上海地铁APP规划行程"
+        ],
+        "transportation": [
+            "地铁线路众多,是主要交通工具",
+            "磁悬浮列车连接浦东机场",
+            "轮渡体验黄浦江风光"
+        ],
+        "attractions": [
+            "外滩 - 万国建筑博览群",
+            "东方明珠塔 - 上海地标建筑",
+            "上海迪士尼乐园",
+            "豫园 - 江南古典园林",
+            "田子坊 - 创意艺术街区"
+        ],
+        "cuisine": [
+            "小笼包 - 南翔馒头店",
+            "生煎包",
+            "本帮菜 - 红烧肉、糖醋小排",
+            "上海菜饭、阳春面"
+        ]
+    },
+    "杭州": {
+        "best_time": "春季(3-5月)赏花,秋季(9-11月)观桂",
+        "tips": [
+            "西湖环湖骑行约1-2小时",
+            "雷峰塔日落时分景色最美",
+            "夏季荷花盛开,值得一看",
+            "使用杭州通APP享受公交地铁优惠"
+        ],
+        "transportation": [
+            "公共自行车系统发达",
+            "地铁覆盖主要景区",
+            "西湖周边步行或骑行为佳"
+        ],
+        "attractions": [
+            "西湖 - 世界文化遗产",
+            "灵隐寺 - 江南著名古刹",
+            "宋城 - 大型文化主题公园",
+            "西溪湿地 - 都市中的天然湿地",
+            "千岛湖 - 天下第一秀水"
+        ],
+        "cuisine": [
+            "西湖醋鱼",
+            "东坡肉",
+            "龙井虾仁",
+            "叫花鸡",
+            "知味观小笼包"
+        ]
+    },
+    "广州": {
+        "best_time": "秋季(10-12月)气候最宜人",
+        "tips": [
+            "尝试早茶文化,体验'一盅两件'",
+            "夏季炎热多雨,注意防暑防雨",
+            "使用羊城通乘坐公交地铁",
+            "珠江夜游推荐傍晚时段"
+        ],
+        "transportation": [
+            "地铁网络便捷",
+            "有轨电车串联珠江新城",
+            "水上巴士体验珠江风光"
+        ],
+        "attractions": [
+            "广州塔 - 小蛮腰地标",
+            "沙面岛 - 欧陆风情建筑群",
+            "陈家祠 - 岭南建筑艺术",
+            "长隆野生动物世界",
+            "白云山 - 羊城第一秀"
+        ],
+        "cuisine": [
+            "早茶 - 虾饺、肠粉、叉烧包",
+            "广式烧腊",
+            "白切鸡",
+            "艇仔粥",
+            "双皮奶"
+        ]
+    },
+    "深圳": {
+        "best_time": "全年气候温和,秋冬季最舒适",
+        "tips": [
+            "世界之窗、欢乐谷建议预留一整天",
+            "海边景点注意防晒",
+            "关口通关高峰期避开",
+            "深圳通卡可刷地铁公交"
+        ],
+        "transportation": [
+            "地铁覆盖主要区域",
+            "共享单车普及率高",
+            "滴滴、出租车方便"
+        ],
+        "attractions": [
+            "世界之窗 - 微缩世界景观",
+            "欢乐谷 - 大型主题公园",
+            "大梅沙海滨公园",
+            "深圳湾公园 - 滨海休闲",
+            "OCT创意文化园"
+        ],
+        "cuisine": [
+            "潮汕牛肉火锅",
+            "客家菜",
+            "海鲜",
+            "港式茶餐厅",
+            "各地美食汇聚"
+        ]
+    },
+    "成都": {
+        "best_time": "春季(3-5月)和秋季(9-11月)最佳",
+        "tips": [
+            "大熊猫基地早上去,熊猫更活跃",
+            "品尝正宗川菜,注意辣度选择",
+            "宽窄巷子、锦里晚上更热闹",
+            "成都地铁天府通卡很便利"
+        ],
+        "transportation": [
+            "地铁线路不断扩展",
+            "公交车覆盖全市",
+            "共享单车适合市区游览"
+        ],
+        "attractions": [
+            "大熊猫繁育研究基地",
+            "宽窄巷子 - 成都名片",
+            "锦里古街 - 三国文化",
+            "武侯祠 - 三国圣地",
+            "都江堰 - 世界水利文化遗产"
+        ],
+        "cuisine": [
+            "火锅 - 麻辣鲜香",
+            "串串香",
+            "担担面",
+            "夫妻肺片",
+            "龙抄手"
+        ]
+    },
+    "西安": {
+        "best_time": "春季(3-5月)和秋季(9-11月)",
+        "tips": [
+            "兵马俑建议请讲解员",
+            "回民街品尝美食避开正餐高峰",
+            "城墙骑行约2-3小时",
+            "长安通卡乘公交地铁有优惠"
+        ],
+        "transportation": [
+            "地铁连接主要景点",
+            "城墙可租自行车游览",
+            "景区间可乘旅游专线"
+        ],
+        "attractions": [
+            "兵马俑 - 世界第八大奇迹",
+            "西安城墙 - 中国现存最完整古城墙",
+            "大雁塔 - 唐代建筑",
+            "华清宫 - 唐代皇家园林",
+            "回民街 - 美食文化街"
+        ],
+        "cuisine": [
+            "肉夹馍",
+            "羊肉泡馍",
+            "凉皮",
+            "biangbiang面",
+            "胡辣汤"
+        ]
+    }
+})
+
+DEFAULT_DESTINATION_TIPS = freeze({
+    "best_time": "建议根据当地气候选择合适的出行时间",
+    "tips": [
+        "建议提前查询目的地天气预报",
+        "了解当地交通状况和出行方式",
+        "预订酒店时查看用户评价",
+        "携带常用药品和个人用品",
+        "保管好贵重物品和证件"
+    ],
+    "transportation": [
+        "提前规划交通路线",
+        "下载当地地图和交通APP",
+        "考虑使用公共交通工具"
+    ],
+    "attractions": [],
+    "cuisine": []
+})
 
 
 class DestinationReminder:
     """Handle destination weather and travel recommendations"""
     
-    def __init__(self):
+    def __init__(self,
+                 cache_ttl_seconds: float = 600.0,
+                 cache_stale_seconds: float = 1800.0,
+                 cache_max_entries: int = 256,
+                 batch_max_concurrency: int = 8,
+                 store: Optional[DestinationStore] = None,
+                 weather_bulkhead: Optional[Bulkhead] = None,
+                 weather_hedge: Optional[HedgePolicy] = None):
         self.weather_base_url = "https://wttr.in"
+        self.store = store or get_destination_store()
+        self.batch_max_concurrency = batch_max_concurrency
+        self.weather_cache = WeatherCache(
+            ttl_seconds=cache_ttl_seconds,
+            stale_ttl_seconds=cache_stale_seconds,
+            max_entries=cache_max_entries
+        )
+        self.weather_client = AsyncWeatherClient(base_url=self.weather_base_url)
+        # Caps concurrent upstream weather requests; excess lookups fail fast with an error entry
+        self.weather_bulkhead = weather_bulkhead
+        # Sends a second upstream request when the first runs past the observed p95
+        self.weather_hedge = weather_hedge
+        self._background_tasks: set = set()
+        self._weather_flight = AsyncSingleFlight("weather")
+        self._info_flight = AsyncSingleFlight("destination_info")
+    
+    def _weather_cache_key(self, location: str, language: str) -> Tuple[str, str]:
+        return location.strip(), language
         
     def get_weather(self, location: str, language: str = "zh-CN") -> Dict:
         """
         Get weather information for a location
         
+        Fresh cache entries are returned directly. Expired entries still inside
+        the stale window are returned immediately while a background thread
+        refreshes them from upstream.
+        
         Args:
             location: Location name (e.g., "北京", "上海")
             language: Language code (default: zh-CN for Chinese)
@@ -26,6 +281,124 @@ class DestinationReminder:
         Returns:
             Dictionary containing weather information
         """
+        location = location.strip()
+        key = self._weather_cache_key(location, language)
+        cached, state = self.weather_cache.lookup(key)
+        
+        if state == WeatherCache.FRESH:
+            return cached
+        
+        if state == WeatherCache.STALE:
+            if self.weather_cache.begin_refresh(key):
+                threading.Thread(
+                    target=self._refresh_weather,
+                    args=(key, location, language),
+                    daemon=True
+                ).start()
+            return cached
+        
+        weather_info = self._fetch_weather(location, language)
+        if "error" not in weather_info:
+            self.weather_cache.store(key, weather_info)
+        return weather_info
+    
+    def _refresh_weather(self, key: Tuple[str, str], location: str, language: str):
+        success = False
+        try:
+            weather_info = self._fetch_weather(location, language)
+            if "error" not in weather_info:
+                self.weather_cache.store(key, weather_info)
+                success = True
+        finally:
+            self.weather_cache.end_refresh(key, success)
+    
+    async def get_weather_async(self, location: str, language: str = "zh-CN",
+                                timeout: Optional[float] = None) -> Dict:
+        """
+        Get weather information for a location without blocking the event loop
+        
+        Shares the cache with get_weather; stale entries are refreshed by a
+        background task on the running loop. Concurrent misses for the same
+        location are coalesced into a single upstream request.
+        
+        Args:
+            location: Location name (e.g., "北京", "上海")
+            language: Language code (default: zh-CN for Chinese)
+            timeout: Per-request deadline in seconds for the upstream call
+            
+        Returns:
+            Dictionary containing weather information
+        """
+        location = location.strip()
+        key = self._weather_cache_key(location, language)
+        cached, state = self.weather_cache.lookup(key)
+        
+        if state == WeatherCache.FRESH:
+            return cached
+        
+        if state == WeatherCache.STALE:
+            if self.weather_cache.begin_refresh(key):
+                task = asyncio.create_task(self._refresh_weather_async(key, location, language, timeout))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return cached
+        
+        return await self._weather_flight.do(
+            key, lambda: self._load_weather_async(key, location, language, timeout)
+        )
+    
+    async def _load_weather_async(self, key: Tuple[str, str], location: str, language: str,
+                                  timeout: Optional[float]) -> Dict:
+        weather_info = await self._fetch_weather_async(location, language, timeout)
+        if "error" not in weather_info:
+            self.weather_cache.store(key, weather_info)
+        return weather_info
+    
+    async def _refresh_weather_async(self, key: Tuple[str, str], location: str, language: str,
+                                     timeout: Optional[float]):
+        success = False
+        try:
+            weather_info = await self._fetch_weather_async(location, language, timeout)
+            if "error" not in weather_info:
+                self.weather_cache.store(key, weather_info)
+                success = True
+        finally:
+            self.weather_cache.end_refresh(key, success)
+    
+    async def aclose(self):
+        """Close pooled upstream connections"""
+        await self.weather_client.aclose()
+    
+    def get_weather_stats(self) -> Dict:
+        """
+        Get weather lookup statistics
+        
+        Returns:
+            Dictionary with cache hit/miss/refresh counters, upstream client counters
+            and bulkhead and hedging statistics
+        """
+        return {
+            "cache": self.weather_cache.get_stats(),
+            "client": self.weather_client.get_stats(),
+            "bulkhead": self.weather_bulkhead.get_stats() if self.weather_bulkhead is not None else None,
+            "hedging": self.weather_hedge.get_stats() if self.weather_hedge is not None else None,
+            "single_flight": {
+                "weather": self._weather_flight.get_stats(),
+                "destination_info": self._info_flight.get_stats()
+            }
+        }
+    
+    def _fetch_weather(self, location: str, language: str = "zh-CN") -> Dict:
+        """
+        Fetch weather information for a location from wttr.in, bypassing the cache
+        
+        Args:
+            location: Location name
+            language: Language code
+            
+        Returns:
+            Dictionary containing weather information, or an "error" entry on failure
+        """
         try:
             location_encoded = quote(location)
             url = f"{self.weather_base_url}/{location_encoded}?format=j1&lang=zh"
@@ -33,38 +406,7 @@ class DestinationReminder:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            
-            current = data.get('current_condition', [{}])[0]
-            weather_info = {
-                "location": location,
-                "current": {
-                    "temperature": current.get('temp_C', 'N/A'),
-                    "feels_like": current.get('FeelsLikeC', 'N/A'),
-                    "condition": current.get('lang_zh', [{}])[0].get('value', current.get('weatherDesc', [{}])[0].get('value', 'N/A')) if current.get('lang_zh') else current.get('weatherDesc', [{}])[0].get('value', 'N/A'),
-                    "humidity": current.get('humidity', 'N/A'),
-                    "wind_speed": current.get('windspeedKmph', 'N/A'),
-                    "wind_dir": current.get('winddir16Point', 'N/A'),
-                    "uv_index": current.get('uvIndex', 'N/A'),
-                    "visibility": current.get('visibility', 'N/A')
-                },
-                "forecast": []
-            }
-            
-            weather_data = data.get('weather', [])
-            for day in weather_data[:3]:
-                forecast_day = {
-                    "date": day.get('date', 'N/A'),
-                    "max_temp": day.get('maxtempC', 'N/A'),
-                    "min_temp": day.get('mintempC', 'N/A'),
-                    "condition": day.get('lang_zh', [{}])[0].get('value', day.get('hourly', [{}])[0].get('weatherDesc', [{}])[0].get('value', 'N/A')) if day.get('lang_zh') else day.get('hourly', [{}])[0].get('weatherDesc', [{}])[0].get('value', 'N/A'),
-                    "sunrise": day.get('astronomy', [{}])[0].get('sunrise', 'N/A'),
-                    "sunset": day.get('astronomy', [{}])[0].get('sunset', 'N/A'),
-                    "avg_humidity": day.get('hourly', [{}])[0].get('humidity', 'N/A')
-                }
-                weather_info["forecast"].append(forecast_day)
-            
-            return weather_info
+            return self._parse_weather(location, response.json())
             
         except requests.RequestException as e:
             return {
@@ -77,6 +419,80 @@ class DestinationReminder:
                 "location": location
             }
     
+    async def _fetch_weather_async(self, location: str, language: str = "zh-CN",
+                                   timeout: Optional[float] = None) -> Dict:
+        """
+        Fetch weather information through the pooled async client, bypassing the cache
+        
+        Args:
+            location: Location name
+            language: Language code
+            timeout: Per-request deadline in seconds
+            
+        Returns:
+            Dictionary containing weather information, or an "error" entry on failure
+        """
+        async def fetch() -> Dict:
+            if self.weather_bulkhead is not None:
+                return await self.weather_bulkhead.call(self.weather_client.fetch_weather_json, location, timeout=timeout)
+            return await self.weather_client.fetch_weather_json(location, timeout=timeout)
+        
+        try:
+            data = await (self.weather_hedge.run(fetch) if self.weather_hedge is not None else fetch())
+            return self._parse_weather(location, data)
+        except BulkheadFullError:
+            return {
+                "error": "获取天气信息失败: 天气服务繁忙,请稍后重试",
+                "location": location
+            }
+        except asyncio.TimeoutError:
+            return {
+                "error": "获取天气信息失败: 请求超时",
+                "location": location
+            }
+        except httpx.HTTPError as e:
+            return {
+                "error": f"获取天气信息失败: {str(e)}",
+                "location": location
+            }
+        except (KeyError, IndexError, ValueError) as e:
+            return {
+                "error": f"解析天气数据失败: {str(e)}",
+                "location": location
+            }
+    
+    def _parse_weather(self, location: str, data: Dict) -> Dict:
+        current = data.get('current_condition', [{}])[0]
+        weather_info = {
+            "location": location,
+            "current": {
+                "temperature": current.get('temp_C', 'N/A'),
+                "feels_like": current.get('FeelsLikeC', 'N/A'),
+                "condition": current.get('lang_zh', [{}])[0].get('value', current.get('weatherDesc', [{}])[0].get('value', 'N/A')) if current.get('lang_zh') else current.get('weatherDesc', [{}])[0].get('value', 'N/A'),
+                "humidity": current.get('humidity', 'N/A'),
+                "wind_speed": current.get('windspeedKmph', 'N/A'),
+                "wind_dir": current.get('winddir16Point', 'N/A'),
+                "uv_index": current.get('uvIndex', 'N/A'),
+                "visibility": current.get('visibility', 'N/A')
+            },
+            "forecast": []
+        }
+        
+        weather_data = data.get('weather', [])
+        for day in weather_data[:3]:
+            forecast_day = {
+                "date": day.get('date', 'N/A'),
+                "max_temp": day.get('maxtempC', 'N/A'),
+                "min_temp": day.get('mintempC', 'N/A'),
+                "condition": day.get('lang_zh', [{}])[0].get('value', day.get('hourly', [{}])[0].get('weatherDesc', [{}])[0].get('value', 'N/A')) if day.get('lang_zh') else day.get('hourly', [{}])[0].get('weatherDesc', [{}])[0].get('value', 'N/A'),
+                "sunrise": day.get('astronomy', [{}])[0].get('sunrise', 'N/A'),
+                "sunset": day.get('astronomy', [{}])[0].get('sunset', 'N/A'),
+                "avg_humidity": day.get('hourly', [{}])[0].get('humidity', 'N/A')
+            }
+            weather_info["forecast"].append(forecast_day)
+        
+        return weather_info
+    
     def format_weather_message(self, weather_info: Dict) -> str:
         """
         Format weather information into a readable message
@@ -121,241 +537,22 @@ class DestinationReminder:
             location: Location name
             
         Returns:
-            Dictionary containing travel recommendations
+            Dictionary containing travel recommendations. The tips, transportation,
+            attractions and cuisine entries are shared read-only tuples.
         """
-        recommendations = {
-            "location": location,
-            "tips": [],
-            "best_time": "",
-            "transportation": [],
-            "attractions": [],
-            "cuisine": []
-        }
+        city_data = self.store.lookup("tips", location, DESTINATION_TIPS)
         
-        location_lower = location.lower()
-        
-        tips_database = {
-            "北京": {
-                "best_time": "春季(3-5月)和秋季(9-11月)最佳,天气宜人",
-                "tips": [
-                    "提前在线预约故宫、长城等热门景点门票",
-                    "避开国庆、春节等节假日高峰期",
-                    "冬季天气寒冷,注意保暖",
-                    "建议办理公交卡,方便乘坐地铁和公交"
-                ],
-                "transportation": [
-                    "地铁网络发达,覆盖主要景点",
-                    "首都机场和大兴机场都有机场快轨",
-                    "共享单车适合短距离出行"
-                ],
-                "attractions": [
-                    "故宫博物院 - 中国古代皇家宫殿",
-                    "八达岭长城 - 明长城最具代表性的地段",
-                    "天坛公园 - 明清皇帝祭天的场所",
-                    "颐和园 - 中国现存最大的皇家园林",
-                    "南锣鼓巷 - 老北京胡同文化体验"
-                ],
-                "cuisine": [
-                    "北京烤鸭 - 全聚德、便宜坊",
-                    "老北京炸酱面",
-                    "铜锅涮肉",
-                    "豆汁儿、焦圈(传统早餐)"
-                ]
-            },
-            "上海": {
-                "best_time": "春季(3-5月)和秋季(9-11月)最适宜游览",
-                "tips": [
-                    "外滩夜景最佳观赏时间为傍晚",
-                    "迪士尼乐园建议购买快速通行证",
-                    "梅雨季节(6-7月)记得带伞",
-                    "使用上海地铁APP规划行程"
-                ],
-                "transportation": [
-                    "地铁线路众多,是主要交通工具",
-                    "磁悬浮列车连接浦东机场",
-                    "轮渡体验黄浦江风光"
-                ],
-                "attractions": [
-                    "外滩 - 万国建筑博览群",
-                    "东方明珠塔 - 上海地标建筑",
-                    "上海迪士尼乐园",
-                    "豫园 - 江南古典园林",
-                    "田子坊 - 创意艺术街区"
-                ],
-                "cuisine": [
-                    "小笼包 - 南翔馒头店",
-                    "生煎包",
-                    "本帮菜 - 红烧肉、糖醋小排",
-                    "上海菜饭、阳春面"
-                ]
-            },
-            "杭州": {
-                "best_time": "春季(3-5月)赏花,秋季(9-11月)观桂",
-                "tips": [
-                    "西湖环湖骑行约1-2小时",
-                    "雷峰塔日落时分景色最美",
-                    "夏季荷花盛开,值得一看",
-                    "使用杭州通APP享受公交地铁优惠"
-                ],
-                "transportation": [
-                    "公共自行车系统发达",
-                    "地铁覆盖主要景区",
-                    "西湖周边步行或骑行为佳"
-                ],
-                "attractions": [
-                    "西湖 - 世界文化遗产",
-                    "灵隐寺 - 江南著名古刹",
-                    "宋城 - 大型文化主题公园",
-                    "西溪湿地 - 都市中的天然湿地",
-                    "千岛湖 - 天下第一秀水"
-                ],
-                "cuisine": [
-                    "西湖醋鱼",
-                    "东坡肉",
-                    "龙井虾仁",
-                    "叫花鸡",
-                    "知味观小笼包"
-                ]
-            },
-            "广州": {
-                "best_time": "秋季(10-12月)气候最宜人",
-                "tips": [
-                    "尝试早茶文化,体验'一盅两件'",
-                    "夏季炎热多雨,注意防暑防雨",
-                    "使用羊城通乘坐公交地铁",
-                    "珠江夜游推荐傍晚时段"
-                ],
-                "transportation": [
-                    "地铁网络便捷",
-                    "有轨电车串联珠江新城",
-                    "水上巴士体验珠江风光"
-                ],
-                "attractions": [
-                    "广州塔 - 小蛮腰地标",
-                    "沙面岛 - 欧陆风情建筑群",
-                    "陈家祠 - 岭南建筑艺术",
-                    "长隆野生动物世界",
-                    "白云山 - 羊城第一秀"
-                ],
-                "cuisine": [
-                    "早茶 - 虾饺、肠粉、叉烧包",
-                    "广式烧腊",
-                    "白切鸡",
-                    "艇仔粥",
-                    "双皮奶"
-                ]
-            },
-            "深圳": {
-                "best_time": "全年气候温和,秋冬季最舒适",
-                "tips": [
-                    "世界之窗、欢乐谷建议预留一整天",
-                    "海边景点注意防晒",
-                    "关口通关高峰期避开",
-                    "深圳通卡可刷地铁公交"
-                ],
-                "transportation": [
-                    "地铁覆盖主要区域",
-                    "共享单车普及率高",
-                    "滴滴、出租车方便"
-                ],
-                "attractions": [
-                    "世界之窗 - 微缩世界景观",
-                    "欢乐谷 - 大型主题公园",
-                    "大梅沙海滨公园",
-                    "深圳湾公园 - 滨海休闲",
-                    "OCT创意文化园"
-                ],
-                "cuisine": [
-                    "潮汕牛肉火锅",
-                    "客家菜",
-                    "海鲜",
-                    "港式茶餐厅",
-                    "各地美食汇聚"
-                ]
-            },
-            "成都": {
-                "best_time": "春季(3-5月)和秋季(9-11月)最佳",
-                "tips": [
-                    "大熊猫基地早上去,熊猫更活跃",
-                    "品尝正宗川菜,注意辣度选择",
-                    "宽窄巷子、锦里晚上更热闹",
-                    "成都地铁天府通卡很便利"
-                ],
-                "transportation": [
-                    "地铁线路不断扩展",
-                    "公交车覆盖全市",
-                    "共享单车适合市区游览"
-                ],
-                "attractions": [
-                    "大熊猫繁育研究基地",
-                    "宽窄巷子 - 成都名片",
-                    "锦里古街 - 三国文化",
-                    "武侯祠 - 三国圣地",
-                    "都江堰 - 世界水利文化遗产"
-                ],
-                "cuisine": [
-                    "火锅 - 麻辣鲜香",
-                    "串串香",
-                    "担担面",
-                    "夫妻肺片",
-                    "龙抄手"
-                ]
-            },
-            "西安": {
-                "best_time": "春季(3-5月)和秋季(9-11月)",
-                "tips": [
-                    "兵马俑建议请讲解员",
-                    "回民街品尝美食避开正餐高峰",
-                    "城墙骑行约2-3小时",
-                    "长安通卡乘公交地铁有优惠"
-                ],
-                "transportation": [
-                    "地铁连接主要景点",
-                    "城墙可租自行车游览",
-                    "景区间可乘旅游专线"
-                ],
-                "attractions": [
-                    "兵马俑 - 世界第八大奇迹",
-                    "西安城墙 - 中国现存最完整古城墙",
-                    "大雁塔 - 唐代建筑",
-                    "华清宫 - 唐代皇家园林",
-                    "回民街 - 美食文化街"
-                ],
-                "cuisine": [
-                    "肉夹馍",
-                    "羊肉泡馍",
-                    "凉皮",
-                    "biangbiang面",
-                    "胡辣汤"
-                ]
-            }
-        }
+        if city_data is None:
+            city_data = DEFAULT_DESTINATION_TIPS
         
-        for city_name, city_data in tips_database.items():
-            if city_name in location or location in city_name:
-                recommendations["best_time"] = city_data["best_time"]
-                recommendations["tips"] = city_data["tips"]
-                recommendations["transportation"] = city_data["transportation"]
-                recommendations["attractions"] = city_data["attractions"]
-                recommendations["cuisine"] = city_data["cuisine"]
-                break
-        
-        if not recommendations["tips"]:
-            recommendations["tips"] = [
-                "建议提前查询目的地天气预报",
-                "了解当地交通状况和出行方式",
-                "预订酒店时查看用户评价",
-                "携带常用药品和个人用品",
-                "保管好贵重物品和证件"
-            ]
-            recommendations["best_time"] = "建议根据当地气候选择合适的出行时间"
-            recommendations["transportation"] = [
-                "提前规划交通路线",
-                "下载当地地图和交通APP",
-                "考虑使用公共交通工具"
-            ]
-        
-        return recommendations
+        return {
+            "location": location,
+            "tips": city_data["tips"],
+            "best_time": city_data["best_time"],
+            "transportation": city_data["transportation"],
+            "attractions": city_data["attractions"],
+            "cuisine": city_data["cuisine"]
+        }
     
     def format_recommendations_message(self, recommendations: Dict) -> str:
         """
@@ -418,3 +615,102 @@ class DestinationReminder:
             "weather_message": self.format_weather_message(weather),
             "recommendations_message": self.format_recommendations_message(recommendations)
         }
+    
+    async def get_destination_info_async(self, location: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Get comprehensive destination information without blocking the event loop
+        
+        Concurrent calls for the same location (ignoring surrounding whitespace)
+        share one computation; the result carries the stripped location.
+        
+        Args:
+            location: Location name
+            timeout: Per-request deadline in seconds for the weather lookup
+            
+        Returns:
+            Dictionary containing weather and recommendations
+        """
+        location = location.strip()
+        return await self._info_flight.do(
+            location, lambda: self._build_destination_info_async(location, timeout)
+        )
+    
+    async def _build_destination_info_async(self, location: str, timeout: Optional[float]) -> Dict:
+        weather = await self.get_weather_async(location, timeout=timeout)
+        recommendations = self.get_travel_recommendations(location)
+        
+        return {
+            "location": location,
+            "weather": weather,
+            "recommendations": recommendations,
+            "weather_message": self.format_weather_message(weather),
+            "recommendations_message": self.format_recommendations_message(recommendations)
+        }
+    
+    async def get_weather_batch_async(self, locations: List[str],
+                                      include_recommendations: bool = False,
+                                      timeout: Optional[float] = None) -> Dict:
+        """
+        Get weather (and optionally recommendations) for several locations concurrently
+        
+        Repeated locations are fetched once and upstream concurrency is bounded
+        by batch_max_concurrency. A failure for one location is reported on
+        that item and does not fail the batch.
+        
+        Args:
+            locations: Location names, in the order results should be returned
+            include_recommendations: Also return travel recommendations per location
+            timeout: Per-request deadline in seconds for each weather lookup
+            
+        Returns:
+            Dictionary with per-location results and success/failure counts
+        """
+        unique_locations: Dict[str, str] = {}
+        for location in locations:
+            key = location.strip()
+            if key and key not in unique_locations:
+                unique_locations[key] = location
+        
+        semaphore = asyncio.Semaphore(self.batch_max_concurrency)
+        
+        async def fetch_one(location: str) -> Dict:
+            async with semaphore:
+                try:
+                    if include_recommendations:
+                        return await self.get_destination_info_async(location, timeout=timeout)
+                    return {"weather": await self.get_weather_async(location, timeout=timeout)}
+                except Exception as e:
+                    return {"weather": {"error": f"获取天气信息失败: {str(e)}", "location": location}}
+        
+        fetched = await asyncio.gather(*[fetch_one(loc) for loc in unique_locations.values()])
+        results_by_key = dict(zip(unique_locations.keys(), fetched))
+        
+        results = []
+        for location in locations:
+            key = location.strip()
+            if not key:
+                results.append({"location": location, "success": False, "error": "地点不能为空"})
+                continue
+            
+            result = results_by_key[key]
+            weather = result["weather"]
+            item = {
+                "location": location,
+                "success": "error" not in weather,
+                "weather": weather
+            }
+            if "error" in weather:
+                item["error"] = weather["error"]
+            if include_recommendations:
+                item["recommendations"] = result.get("recommendations")
+            results.append(item)
+        
+        succeeded = sum(1 for item in results if item["success"])
+        
+        return {
+            "results": results,
+            "total": len(results),
+            "unique_locations": len(unique_locations),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded
+        }
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Destination Store Module
+SQLite-backed city knowledge store with lazy loading, an in-process LRU cache
+and hot reload when the database file changes on disk.
+
+The built-in tables in destination_reminder, travel_guide and speed_monitor
+remain the fallback; any city present in the store overrides them. Stored
+distances override the gazetteer-based estimates in transportation_recommender.
+Build or extend a store with:
+
+    python src/destination_store.py build [path]
+    python src/destination_store.py import cities.json [path]
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from city_index import CITY_ALIASES, freeze, resolve_city
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "destinations.db")
+
+SECTIONS = ("tips", "attractions", "speed_limits", "budget", "travel_tips", "best_season")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS city_data (
+    city TEXT NOT NULL,
+    section TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (city, section)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS city_aliases (
+    alias TEXT PRIMARY KEY,
+    city TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS city_distances (
+    city_a TEXT NOT NULL,
+    city_b TEXT NOT NULL,
+    distance_km REAL NOT NULL,
+    PRIMARY KEY (city_a, city_b)
+) WITHOUT ROWID;
+"""
+
+_MISSING = object()
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_MAX_PREFIX_CHARS = 8
+
+
+class DestinationStore:
+    """Read-only view over a destinations SQLite file, reloaded when the file changes"""
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 cache_size: int = 1024,
+                 reload_check_interval_seconds: float = 5.0):
+        """
+        Args:
+            path: SQLite file (defaults to $DESTINATION_DB_PATH or src/data/destinations.db)
+            cache_size: Maximum number of decoded lookups kept in memory
+            reload_check_interval_seconds: Minimum time between file change checks
+        """
+        self.path = path or os.getenv("DESTINATION_DB_PATH", DEFAULT_DB_PATH)
+        self.cache_size = cache_size
+        self.reload_check_interval_seconds = reload_check_interval_seconds
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file_signature: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.loads = 0
+        self.reloads = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.reload_check_interval_seconds
+
+        signature = self._signature()
+        if signature == self._file_signature:
+            return
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self.reloads += 1
+            logger.info(f"Destination store changed on disk, reloading {self.path}")
+
+        self._cache.clear()
+        self._file_signature = signature
+
+        if signature is not None:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self.loads += 1
+
+    def _cached(self, key: Tuple, query: str, params: Tuple, decode) -> Any:
+        with self._lock:
+            self._ensure_current()
+            if self._conn is None:
+                return None
+
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return value
+
+            self.cache_misses += 1
+            row = self._conn.execute(query, params).fetchone()
+            value = decode(row[0]) if row else None
+
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return value
+
+    @property
+    def available(self) -> bool:
+        with self._lock:
+            self._ensure_current()
+            return self._conn is not None
+
+    def _alias(self, name: str) -> Optional[str]:
+        return self._cached(
+            ("alias", name),
+            "SELECT city FROM city_aliases WHERE alias = ?",
+            (name,),
+            str
+        )
+
+    def resolve(self, location: str) -> Optional[str]:
+        """
+        Resolve a location to a canonical city name
+
+        Built-in names and aliases are tried first, then exact aliases stored
+        in the database, then the location's leading characters so that
+        addresses such as "拉萨布达拉宫" resolve to a stored "拉萨".
+
+        Args:
+            location: Location name
+
+        Returns:
+            Canonical city name, or None if unknown
+        """
+        city = resolve_city(location)
+        if city is not None:
+            return city
+
+        key = location.strip().casefold()
+        if not key or not self.available:
+            return None
+
+        city = self._alias(key)
+        if city is not None:
+            return city
+
+        for length in range(min(len(key) - 1, _MAX_PREFIX_CHARS), 1, -1):
+            city = self._alias(key[:length])
+            if city is not None:
+                return city
+        return None
+
+    def get(self, section: str, city: str) -> Optional[Any]:
+        """
+        Get a read-only section payload for a canonical city
+
+        Returns:
+            Frozen payload, or None if the store has no such entry
+        """
+        return self._cached(
+            ("data", section, city),
+            "SELECT payload FROM city_data WHERE city = ? AND section = ?",
+            (city, section),
+            lambda payload: freeze(json.loads(payload))
+        )
+
+    def lookup(self, section: str, location: str, builtin: Mapping[str, Any] = _EMPTY) -> Optional[Any]:
+        """
+        Resolve a location and return its section payload, preferring the store over built-ins
+
+        Args:
+            section: One of SECTIONS
+            location: Free-form location name
+            builtin: Built-in table keyed by canonical city used as fallback
+
+        Returns:
+            Payload for the city, or None if neither source knows it
+        """
+        city = self.resolve(location)
+        if city is None:
+            return None
+        value = self.get(section, city)
+        return value if value is not None else builtin.get(city)
+
+    def get_distance(self, origin: str, destination: str) -> Optional[float]:
+        """Get a stored road distance in km between two locations, in either direction"""
+        city_a = self.resolve(origin)
+        city_b = self.resolve(destination)
+        if city_a is None or city_b is None:
+            return None
+        pair = tuple(sorted((city_a, city_b)))
+        return self._cached(
+            ("distance",) + pair,
+            "SELECT distance_km FROM city_distances WHERE city_a = ? AND city_b = ?",
+            pair,
+            float
+        )
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "available": self._conn is not None,
+                "cached_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "loads": self.loads,
+                "reloads": self.reloads
+            }
+
+
+_default_store: Optional[DestinationStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_destination_store() -> DestinationStore:
+    """Get the process-wide destination store"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = DestinationStore()
+    return _default_store
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return value
+
+
+def builtin_documents() -> Dict:
+    """Collect the built-in knowledge tables into an importable document"""
+    from destination_reminder import DESTINATION_TIPS
+    from speed_monitor import CITY_SPEED_LIMITS
+    from travel_guide import BEST_SEASONS, CITY_BASE_BUDGETS, TravelGuidePlanner, _CITY_SPECIFIC_TIPS
+
+    sections = {
+        "tips": DESTINATION_TIPS,
+        "attractions": TravelGuidePlanner.CITY_ATTRACTIONS,
+        "speed_limits": CITY_SPEED_LIMITS,
+        "budget": CITY_BASE_BUDGETS,
+        "travel_tips": _CITY_SPECIFIC_TIPS,
+        "best_season": BEST_SEASONS,
+    }
+
+    cities: Dict[str, Dict] = {city: {"aliases": list(aliases)} for city, aliases in CITY_ALIASES.items()}
+    for section, table in sections.items():
+        for city, payload in table.items():
+            cities.setdefault(city, {"aliases": []})[section] = _thaw(payload)
+
+    return {"cities": cities, "distances": []}
+
+
+def write_store(document: Dict, path: str, merge: bool = True):
+    """
+    Write a knowledge document into a store file atomically
+
+    The new database is written next to the target and moved into place, so
+    running workers pick it up on their next reload check without ever seeing
+    a half-written file.
+
+    Args:
+        document: {"cities": {name: {"aliases": [...], <section>: payload}}, "distances": [[a, b, km]]}
+        path: Target SQLite file
+        merge: Start from the existing file's contents instead of an empty store
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        if merge and os.path.exists(path):
+            conn.execute("ATTACH DATABASE ? AS current", (path,))
+            for table in ("city_data", "city_aliases", "city_distances"):
+                conn.execute(f"INSERT INTO {table} SELECT * FROM current.{table}")
+            conn.commit()
+            conn.execute("DETACH DATABASE current")
+
+        for city, entry in document.get("cities", {}).items():
+            names: Iterable[str] = [city] + list(entry.get("aliases", []))
+            conn.executemany(
+                "INSERT OR REPLACE INTO city_aliases (alias, city) VALUES (?, ?)",
+                [(name.strip().casefold(), city) for name in names]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO city_data (city, section, payload) VALUES (?, ?, ?)",
+                [
+                    (city, section, json.dumps(entry[section], ensure_ascii=False))
+                    for section in SECTIONS if section in entry
+                ]
+            )
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO city_distances (city_a, city_b, distance_km) VALUES (?, ?, ?)",
+            [tuple(sorted((a, b))) + (float(km),) for a, b, km in document.get("distances", [])]
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2 or argv[1] not in ("build", "import"):
+        print(__doc__)
+        return 1
+
+    if argv[1] == "build":
+        path = argv[2] if len(argv) > 2 else DEFAULT_DB_PATH
+        write_store(builtin_documents(), path, merge=False)
+        print(f"Built destination store from built-in data: {path}")
+        return 0
+
+    if len(argv) < 3:
+        print("Usage: python destination_store.py import cities.json [path]")
+        return 1
+
+    path = argv[3] if len(argv) > 3 else DEFAULT_DB_PATH
+    with open(argv[2], encoding="utf-8") as f:
+        document = json.load(f)
+    write_store(document, path, merge=True)
+    print(f"Imported {len(document.get('cities', {}))} cities into {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Distance Matrix Module
+Vectorized great-circle distance matrices over gazetteer locations, cached by point set
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gazetteer import EARTH_RADIUS_KM, Gazetteer, Place, get_gazetteer
+
+ROAD_DETOUR_FACTOR = 1.2
+
+Point = Tuple[float, float]
+
+
+def haversine_matrix(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Compute the N×N great-circle distance matrix in one vectorized pass
+
+    Args:
+        lats: Latitudes in degrees, shape (N,)
+        lons: Longitudes in degrees, shape (N,)
+
+    Returns:
+        Symmetric matrix of distances in kilometres, shape (N, N)
+    """
+    phi = np.radians(np.asarray(lats, dtype=np.float64))
+    lam = np.radians(np.asarray(lons, dtype=np.float64))
+
+    dphi = phi[:, None] - phi[None, :]
+    dlam = lam[:, None] - lam[None, :]
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class DistanceMatrixService:
+    """Great-circle distance matrices for places, with an LRU cache keyed by the sorted point set"""
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None,
+                 cache_size: int = 256,
+                 road_detour_factor: float = ROAD_DETOUR_FACTOR):
+        """
+        Args:
+            gazetteer: Place index used to resolve names (defaults to the bundled gazetteer)
+            cache_size: Number of point-set matrices kept in memory
+            road_detour_factor: Ratio of road distance to great-circle distance for estimates
+        """
+        self.gazetteer = gazetteer or get_gazetteer()
+        self.cache_size = cache_size
+        self.road_detour_factor = road_detour_factor
+
+        self._cache: "OrderedDict[Tuple[Point, ...], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def matrix_for_points(self, points: Sequence[Point]) -> np.ndarray:
+        """
+        Get the distance matrix for points in the given order
+
+        The matrix is computed once per distinct point set; requests for the
+        same set in any order are served by re-indexing the cached matrix.
+
+        Args:
+            points: (lat, lon) pairs
+
+        Returns:
+            Read-only distance matrix in km, shape (len(points), len(points))
+        """
+        normalized = [(round(lat, 6), round(lon, 6)) for lat, lon in points]
+        key = tuple(sorted(set(normalized)))
+
+        with self._lock:
+            base = self._cache.get(key)
+            if base is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if base is None:
+            coords = np.array(key, dtype=np.float64).reshape(-1, 2)
+            base = haversine_matrix(coords[:, 0], coords[:, 1])
+            base.setflags(write=False)
+            with self._lock:
+                self._cache[key] = base
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        position = {point: i for i, point in enumerate(key)}
+        order = np.fromiter((position[p] for p in normalized), dtype=np.intp, count=len(normalized))
+        if len(order) == len(key) and np.array_equal(order, np.arange(len(key))):
+            return base
+        return base[np.ix_(order, order)]
+
+    def resolve(self, locations: Sequence[str]) -> List[Optional[Place]]:
+        """Resolve each location to a gazetteer place (None if unknown)"""
+        return [self.gazetteer.find(location) for location in locations]
+
+    def matrix_for_locations(self, locations: Sequence[str]) -> Dict:
+        """
+        Build a distance matrix for named locations
+
+        Args:
+            locations: Location names or addresses
+
+        Returns:
+            Dictionary with the resolved locations, unresolved names and the
+            matrix (km) over the resolved locations in input order
+        """
+        places = self.resolve(locations)
+        resolved = [(location, place) for location, place in zip(locations, places) if place is not None]
+        unresolved = [location for location, place in zip(locations, places) if place is None]
+
+        matrix = self.matrix_for_points([(p.lat, p.lon) for _, p in resolved]) if resolved else np.zeros((0, 0))
+
+        return {
+            "resolved": [
+                {"location": location, "place": place.name, "city": place.city, "lat": place.lat, "lon": place.lon}
+                for location, place in resolved
+            ],
+            "unresolved": unresolved,
+            "matrix": matrix
+        }
+
+    def distance_km(self, origin: str, destination: str) -> Optional[float]:
+        """Great-circle distance between two named locations, or None if either is unknown or they coincide"""
+        origin_place = self.gazetteer.find(origin)
+        destination_place = self.gazetteer.find(destination)
+        if origin_place is None or destination_place is None or origin_place == destination_place:
+            return None
+        matrix = self.matrix_for_points([
+            (origin_place.lat, origin_place.lon),
+            (destination_place.lat, destination_place.lon)
+        ])
+        return float(matrix[0, 1])
+
+    def road_distance_km(self, origin: str, destination: str) -> Optional[float]:
+        """Estimated road distance between two named locations using the detour factor"""
+        distance = self.distance_km(origin, destination)
+        return distance * self.road_detour_factor if distance is not None else None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "cached_matrices": len(self._cache),
+                "cache_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_default_service: Optional[DistanceMatrixService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_distance_service() -> DistanceMatrixService:
+    """Get the process-wide distance matrix service"""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                _default_service = DistanceMatrixService()
+    return _default_service
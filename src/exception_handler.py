@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 import logging
-import traceback
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Callable, Any
-from dataclasses import dataclass, asdict
 from enum import Enum
+import threading
 import time
 
+from bulkhead import Bulkhead
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from exception_store import ExceptionRecord, ExceptionStore
+from retry_policy import RetryBudget, full_jitter_delay, retry_fits_deadline
+from shared_metrics import SharedMetrics
+
 logger = logging.getLogger(__name__)
 
 class ExceptionSeverity(Enum):
@@ -16,32 +21,44 @@ class ExceptionSeverity(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
-class ExceptionRecord:
-    timestamp: str
-    exception_type: str
-    exception_message: str
-    traceback: str
-    severity: str
-    context: Dict
-    retry_count: int
-    resolved: bool
-    resolution_time: Optional[str] = None
-
 class ExceptionHandler:
     def __init__(self, 
                  max_retry_attempts: int = 3,
                  retry_delay_seconds: float = 1.0,
+                 max_retry_delay_seconds: float = 30.0,
+                 retry_budget_ratio: float = 0.2,
+                 retry_budget_min_per_second: float = 1.0,
                  circuit_breaker_threshold: int = 5,
-                 circuit_breaker_timeout_seconds: int = 60):
+                 circuit_breaker_timeout_seconds: int = 60,
+                 circuit_breaker_failure_rate: float = 0.5,
+                 circuit_breaker_window_seconds: int = 30,
+                 circuit_breaker_min_calls: int = 10,
+                 circuit_breaker_half_open_probes: int = 2,
+                 bulkhead_max_concurrent: int = 10,
+                 bulkhead_max_queue: int = 20,
+                 shared_metrics: Optional[SharedMetrics] = None,
+                 max_history: int = 1000):
         
         self.max_retry_attempts = max_retry_attempts
         self.retry_delay_seconds = retry_delay_seconds
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self.retry_budget_ratio = retry_budget_ratio
+        self.retry_budget_min_per_second = retry_budget_min_per_second
         self.circuit_breaker_threshold = circuit_breaker_threshold
         self.circuit_breaker_timeout_seconds = circuit_breaker_timeout_seconds
+        self.circuit_breaker_failure_rate = circuit_breaker_failure_rate
+        self.circuit_breaker_window_seconds = circuit_breaker_window_seconds
+        self.circuit_breaker_min_calls = circuit_breaker_min_calls
+        self.circuit_breaker_half_open_probes = circuit_breaker_half_open_probes
+        self.bulkhead_max_concurrent = bulkhead_max_concurrent
+        self.bulkhead_max_queue = bulkhead_max_queue
         
-        self.exception_history: List[ExceptionRecord] = []
-        self.circuit_breaker_state: Dict[str, Dict] = {}
+        self.exception_store = ExceptionStore(capacity=max_history)
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_budgets: Dict[str, RetryBudget] = {}
+        self.bulkheads: Dict[str, Bulkhead] = {}
+        self.shared_metrics = shared_metrics
+        self._lock = threading.Lock()
         
         logger.info("Exception handler initialized with auto-retry and circuit breaker")
 
@@ -49,89 +66,139 @@ class ExceptionHandler:
                                  func: Callable, 
                                  *args, 
                                  context: Optional[Dict] = None,
+                                 dependency: Optional[str] = None,
+                                 deadline: Optional[float] = None,
                                  **kwargs) -> Any:
+        # deadline is on the time.monotonic() clock; retries share the budget and the
+        # circuit breaker of `dependency` (the function name by default)
         context = context or {}
         func_name = func.__name__
+        dependency = dependency or func_name
+        breaker = self.circuit_breaker(dependency)
+        budget = self._retry_budget(dependency)
+        budget.record_request()
         
         for attempt in range(self.max_retry_attempts):
+            permit = breaker.acquire()
+            if permit is None:
+                logger.warning(f"Circuit breaker for {dependency} rejected {func_name}")
+                raise CircuitOpenError(dependency, breaker.retry_after_seconds())
+            
+            started = time.monotonic()
             try:
-                if self._is_circuit_open(func_name):
-                    raise Exception(f"Circuit breaker open for {func_name}")
-                
                 result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
                 
-                self._record_success(func_name)
+                breaker.on_success(permit)
                 
                 return result
                 
             except Exception as e:
-                severity = self._classify_exception(e)
+                breaker.on_failure(permit)
                 
-                exc_record = ExceptionRecord(
-                    timestamp=datetime.now().isoformat(),
-                    exception_type=type(e).__name__,
-                    exception_message=str(e),
-                    traceback=traceback.format_exc(),
-                    severity=severity.value,
-                    context={**context, "function": func_name, "attempt": attempt + 1},
-                    retry_count=attempt + 1,
-                    resolved=False
-                )
+                self._record_exception(e, {**context, "function": func_name, "attempt": attempt + 1},
+                                       retry_count=attempt + 1)
                 
-                self.exception_history.append(exc_record)
-                
-                self._update_circuit_breaker(func_name)
-                
-                if attempt < self.max_retry_attempts - 1:
-                    logger.warning(f"Attempt {attempt + 1} failed for {func_name}: {str(e)}. Retrying in {self.retry_delay_seconds}s...")
-                    await asyncio.sleep(self.retry_delay_seconds)
-                else:
-                    logger.error(f"All {self.max_retry_attempts} attempts failed for {func_name}: {str(e)}")
+                delay = self._next_retry_delay(budget, func_name, attempt + 1, time.monotonic() - started, deadline, e)
+                if delay is None:
                     raise
+                logger.warning(f"Attempt {attempt + 1} failed for {func_name}: {str(e)}. Retrying in {delay:.2f}s...")
+                await asyncio.sleep(delay)
+            
+            except BaseException:
+                # Cancelled or interrupted: no outcome, but a probe slot must be returned
+                breaker.release(permit)
+                raise
 
     def handle_sync_with_retry(self, 
                                func: Callable, 
                                *args, 
                                context: Optional[Dict] = None,
+                               dependency: Optional[str] = None,
+                               deadline: Optional[float] = None,
                                **kwargs) -> Any:
+        # Sleeps the calling thread between attempts; from async code use handle_with_retry
         context = context or {}
         func_name = func.__name__
+        dependency = dependency or func_name
+        breaker = self.circuit_breaker(dependency)
+        budget = self._retry_budget(dependency)
+        budget.record_request()
         
         for attempt in range(self.max_retry_attempts):
+            permit = breaker.acquire()
+            if permit is None:
+                logger.warning(f"Circuit breaker for {dependency} rejected {func_name}")
+                raise CircuitOpenError(dependency, breaker.retry_after_seconds())
+            
+            started = time.monotonic()
             try:
-                if self._is_circuit_open(func_name):
-                    raise Exception(f"Circuit breaker open for {func_name}")
-                
                 result = func(*args, **kwargs)
                 
-                self._record_success(func_name)
+                breaker.on_success(permit)
                 
                 return result
                 
             except Exception as e:
-                severity = self._classify_exception(e)
-                
-                exc_record = ExceptionRecord(
-                    timestamp=datetime.now().isoformat(),
-                    exception_type=type(e).__name__,
-                    exception_message=str(e),
-                    traceback=traceback.format_exc(),
-                    severity=severity.value,
-                    context={**context, "function": func_name, "attempt": attempt + 1},
-                    retry_count=attempt + 1,
-                    resolved=False
-                )
+                breaker.on_failure(permit)
                 
-                self.exception_history.append(exc_record)
+                self._record_exception(e, {**context, "function": func_name, "attempt": attempt + 1},
+                                       retry_count=attempt + 1)
                 
-                self._update_circuit_breaker(func_name)
-                
-                if attempt < self.max_retry_attempts - 1:
-                    logger.warning(f"Attempt {attempt + 1} failed for {func_name}: {str(e)}. Retrying in {self.retry_delay_seconds}s...")
-                    time.sleep(self.retry_delay_seconds)
-                else:
-                    logger.error(f"All {self.max_retry_attempts} attempts failed for {func_name}: {str(e)}")
+                delay = self._next_retry_delay(budget, func_name, attempt + 1, time.monotonic() - started, deadline, e)
+                if delay is None:
                     raise
+                logger.warning(f"Attempt {attempt + 1} failed for {func_name}: {str(e)}. Retrying in {delay:.2f}s...")
+                time.sleep(delay)
+            
+            except BaseException:
+                # Cancelled or interrupted: no outcome, but a probe slot must be returned
+                breaker.release(permit)
+                raise
+
+    def bulkhead(self, name: str,
+                 max_concurrent: Optional[int] = None,
+                 max_queue: Optional[int] = None,
+                 queue_timeout_seconds: Optional[float] = None) -> Bulkhead:
+        # Limits apply when the bulkhead is first created; later calls return it as is
+        bulkhead = self.bulkheads.get(name)
+        if bulkhead is None:
+            with self._lock:
+                bulkhead = self.bulkheads.setdefault(name, Bulkhead(
+                    name,
+                    max_concurrent=max_concurrent or self.bulkhead_max_concurrent,
+                    max_queue=self.bulkhead_max_queue if max_queue is None else max_queue,
+                    queue_timeout_seconds=queue_timeout_seconds
+                ))
+        return bulkhead
+
+    def _retry_budget(self, dependency: str) -> RetryBudget:
+        budget = self.retry_budgets.get(dependency)
+        if budget is None:
+            with self._lock:
+                budget = self.retry_budgets.setdefault(dependency, RetryBudget(
+                    ratio=self.retry_budget_ratio,
+                    min_retries_per_second=self.retry_budget_min_per_second
+                ))
+        return budget
+
+    def _next_retry_delay(self, budget: RetryBudget, func_name: str, attempt: int,
+                          attempt_seconds: float, deadline: Optional[float],
+                          exception: Exception) -> Optional[float]:
+        # None means give up: attempts used, the retry could not finish before the
+        # deadline (the failed attempt's duration is the estimate) or the budget is spent
+        if attempt >= self.max_retry_attempts:
+            logger.error(f"All {self.max_retry_attempts} attempts failed for {func_name}: {str(exception)}")
+            return None
+
+        delay = full_jitter_delay(attempt, self.retry_delay_seconds, self.max_retry_delay_seconds)
+        if not retry_fits_deadline(deadline, delay, attempt_seconds):
+            budget.record_deadline_exceeded()
+            logger.error(f"Not retrying {func_name}: a retry would not finish before the deadline ({str(exception)})")
+            return None
+        if not budget.try_acquire():
+            logger.error(f"Retry budget exhausted, not retrying {func_name}: {str(exception)}")
+            return None
+        return delay
 
     def _classify_exception(self, exception: Exception) -> ExceptionSeverity:
         exc_type = type(exception).__name__
@@ -149,103 +216,117 @@ class ExceptionHandler:
         else:
             return ExceptionSeverity.LOW
 
-    def _is_circuit_open(self, func_name: str) -> bool:
-        if func_name not in self.circuit_breaker_state:
-            return False
-        
-        state = self.circuit_breaker_state[func_name]
-        
-        if state.get("is_open", False):
-            time_since_open = time.time() - state.get("opened_at", 0)
-            
-            if time_since_open > self.circuit_breaker_timeout_seconds:
-                state["is_open"] = False
-                state["failure_count"] = 0
-                logger.info(f"Circuit breaker for {func_name} moved to half-open state")
-                return False
-            else:
-                logger.warning(f"Circuit breaker for {func_name} is OPEN (failures: {state.get('failure_count', 0)})")
-                return True
-        
-        return False
+    def circuit_breaker(self, dependency: str) -> CircuitBreaker:
+        breaker = self.circuit_breakers.get(dependency)
+        if breaker is None:
+            with self._lock:
+                breaker = self.circuit_breakers.setdefault(dependency, CircuitBreaker(
+                    dependency,
+                    failure_threshold=self.circuit_breaker_threshold,
+                    failure_rate_threshold=self.circuit_breaker_failure_rate,
+                    window_seconds=self.circuit_breaker_window_seconds,
+                    minimum_calls=self.circuit_breaker_min_calls,
+                    open_timeout_seconds=self.circuit_breaker_timeout_seconds,
+                    half_open_max_probes=self.circuit_breaker_half_open_probes
+                ))
+        return breaker
 
-    def _update_circuit_breaker(self, func_name: str):
-        if func_name not in self.circuit_breaker_state:
-            self.circuit_breaker_state[func_name] = {
-                "failure_count": 0,
-                "is_open": False,
-                "opened_at": None
-            }
-        
-        state = self.circuit_breaker_state[func_name]
-        state["failure_count"] += 1
-        
-        if state["failure_count"] >= self.circuit_breaker_threshold:
-            state["is_open"] = True
-            state["opened_at"] = time.time()
-            logger.error(f"Circuit breaker OPENED for {func_name} after {state['failure_count']} failures")
+    @property
+    def exception_history(self) -> List[ExceptionRecord]:
+        with self._lock:
+            return list(self.exception_store)
+
+    def _record_exception(self, exception: Exception, context: Dict, retry_count: int):
+        # The traceback is only fingerprinted here; its text is rendered on first read
+        severity = self._classify_exception(exception)
+        with self._lock:
+            fingerprint = self.exception_store.record_occurrence(exception)
+            self.exception_store.add(ExceptionRecord(
+                timestamp=datetime.now().isoformat(),
+                exception_type=type(exception).__name__,
+                exception_message=str(exception),
+                fingerprint=fingerprint,
+                severity=severity.value,
+                context=context,
+                retry_count=retry_count,
+                resolved=False
+            ))
+            # The shared slot update is a read-modify-write; threads must not interleave it
+            if self.shared_metrics is not None:
+                self.shared_metrics.increment_exceptions()
 
-    def _record_success(self, func_name: str):
-        if func_name in self.circuit_breaker_state:
-            state = self.circuit_breaker_state[func_name]
-            if state.get("is_open", False):
-                logger.info(f"Circuit breaker for {func_name} recovered and CLOSED")
-            state["failure_count"] = 0
-            state["is_open"] = False
+    def get_exception_count(self) -> int:
+        if self.shared_metrics is not None:
+            return self.shared_metrics.aggregate()["exception_count"]
+        return self.exception_store.total_recorded
 
     def get_exception_summary(self) -> Dict:
-        total = len(self.exception_history)
-        unresolved = sum(1 for e in self.exception_history if not e.resolved)
-        
-        severity_counts = {
-            "critical": sum(1 for e in self.exception_history if e.severity == "critical"),
-            "high": sum(1 for e in self.exception_history if e.severity == "high"),
-            "medium": sum(1 for e in self.exception_history if e.severity == "medium"),
-            "low": sum(1 for e in self.exception_history if e.severity == "low")
-        }
-        
-        exception_types = {}
-        for exc in self.exception_history:
-            exc_type = exc.exception_type
-            exception_types[exc_type] = exception_types.get(exc_type, 0) + 1
-        
-        recent_exceptions = [asdict(e) for e in self.exception_history[-10:]]
+        store = self.exception_store
+        with self._lock:
+            total = store.total_recorded
+            retained = len(store)
+            unresolved = store.unresolved_count
+            severity_counts = dict(store.severity_counts)
+            exception_types = dict(store.type_counts)
+            recent_exceptions = [store.to_dict(e) for e in store.recent(10)]
+            distinct_fingerprints = store.distinct_fingerprints()
+            top_fingerprints = store.fingerprints(limit=10)
         
         circuit_breakers = {
-            func_name: {
-                "failure_count": state["failure_count"],
-                "is_open": state.get("is_open", False),
-                "status": "OPEN" if state.get("is_open", False) else "CLOSED"
-            }
-            for func_name, state in self.circuit_breaker_state.items()
+            dependency: breaker.get_state()
+            for dependency, breaker in list(self.circuit_breakers.items())
         }
         
         return {
             "timestamp": datetime.now().isoformat(),
             "total_exceptions": total,
+            "retained_exceptions": retained,
+            "pod_total_exceptions": self.get_exception_count(),
             "unresolved_exceptions": unresolved,
             "severity_distribution": severity_counts,
             "exception_types": exception_types,
             "recent_exceptions": recent_exceptions,
+            "distinct_fingerprints": distinct_fingerprints,
+            "top_fingerprints": top_fingerprints,
             "circuit_breakers": circuit_breakers,
+            "bulkheads": {
+                name: bulkhead.get_stats()
+                for name, bulkhead in list(self.bulkheads.items())
+            },
+            "retry_budgets": {
+                dependency: budget.get_stats()
+                for dependency, budget in list(self.retry_budgets.items())
+            },
             "config": {
                 "max_retry_attempts": self.max_retry_attempts,
                 "retry_delay_seconds": self.retry_delay_seconds,
+                "max_retry_delay_seconds": self.max_retry_delay_seconds,
+                "retry_budget_ratio": self.retry_budget_ratio,
+                "retry_budget_min_per_second": self.retry_budget_min_per_second,
                 "circuit_breaker_threshold": self.circuit_breaker_threshold,
-                "circuit_breaker_timeout_seconds": self.circuit_breaker_timeout_seconds
+                "circuit_breaker_timeout_seconds": self.circuit_breaker_timeout_seconds,
+                "circuit_breaker_failure_rate": self.circuit_breaker_failure_rate,
+                "circuit_breaker_window_seconds": self.circuit_breaker_window_seconds,
+                "circuit_breaker_min_calls": self.circuit_breaker_min_calls,
+                "circuit_breaker_half_open_probes": self.circuit_breaker_half_open_probes
             }
         }
 
     def get_unresolved_exceptions(self) -> List[Dict]:
-        return [asdict(e) for e in self.exception_history if not e.resolved]
+        with self._lock:
+            return [self.exception_store.to_dict(e) for e in self.exception_store.unresolved()]
+
+    def get_fingerprints(self, limit: Optional[int] = None) -> List[Dict]:
+        with self._lock:
+            return self.exception_store.fingerprints(limit)
+
+    def get_fingerprint_traceback(self, fingerprint: str) -> Optional[str]:
+        with self._lock:
+            return self.exception_store.traceback_for(fingerprint)
 
     def mark_resolved(self, exception_type: str):
-        resolved_count = 0
-        for exc in self.exception_history:
-            if exc.exception_type == exception_type and not exc.resolved:
-                exc.resolved = True
-                exc.resolution_time = datetime.now().isoformat()
-                resolved_count += 1
+        with self._lock:
+            resolved_count = self.exception_store.resolve_type(exception_type)
         
         if resolved_count > 0:
             logger.info(f"Marked {resolved_count} {exception_type} exceptions as resolved")
@@ -253,13 +334,15 @@ class ExceptionHandler:
         return resolved_count
 
     def clear_history(self):
-        self.exception_history.clear()
-        self.circuit_breaker_state.clear()
+        with self._lock:
+            self.exception_store.clear()
+            self.retry_budgets.clear()
+            self.circuit_breakers.clear()
         logger.info("Exception history and circuit breaker state cleared")
 
     def get_degraded_services(self) -> List[str]:
         return [
-            func_name 
-            for func_name, state in self.circuit_breaker_state.items() 
-            if state.get("is_open", False)
+            dependency 
+            for dependency, breaker in list(self.circuit_breakers.items()) 
+            if breaker.state is not CircuitState.CLOSED
         ]
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Exception Store Module
+Bounded history of handled exceptions with counters maintained on insert and
+eviction, an index of unresolved records by exception type, and per-fingerprint
+aggregates whose traceback is rendered once, on demand
+"""
+import hashlib
+import traceback
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+# Innermost frames that identify where an exception came from
+FINGERPRINT_FRAMES = 5
+
+
+@dataclass
+class ExceptionRecord:
+    timestamp: str
+    exception_type: str
+    exception_message: str
+    fingerprint: str
+    severity: str
+    context: Dict
+    retry_count: int
+    resolved: bool
+    resolution_time: Optional[str] = None
+
+
+@dataclass
+class ExceptionFingerprint:
+    fingerprint: str
+    exception_type: str
+    location: str
+    count: int
+    first_seen: str
+    last_seen: str
+    last_message: str
+
+
+def fingerprint_exception(exception: BaseException, frames: int = FINGERPRINT_FRAMES) -> Tuple[str, str]:
+    """
+    (fingerprint, innermost location) from the exception type and its innermost
+    frames; walks code objects only, no source lines are read
+    """
+    top = deque(maxlen=frames)
+    for frame, lineno in traceback.walk_tb(exception.__traceback__):
+        code = frame.f_code
+        top.append((code.co_filename, code.co_name, lineno))
+
+    exc_type = type(exception)
+    key = f"{exc_type.__module__}.{exc_type.__qualname__}|" + "|".join(f"{f}:{n}:{l}" for f, n, l in top)
+    location = f"{top[-1][0]}:{top[-1][2]} in {top[-1][1]}" if top else "unknown"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest(), location
+
+
+class _FingerprintEntry:
+    __slots__ = ("stats", "stack", "header", "rendered")
+
+    def __init__(self, stats: ExceptionFingerprint, exception: BaseException):
+        self.stats = stats
+        # Frame names and line numbers only; source lines are read if the text is requested
+        self.stack = traceback.StackSummary.extract(traceback.walk_tb(exception.__traceback__),
+                                                    lookup_lines=False)
+        self.header = traceback.format_exception_only(type(exception), exception)
+        self.rendered: Optional[str] = None
+
+    def render(self) -> str:
+        if self.rendered is None:
+            lines = ["Traceback (most recent call last):\n"] if self.stack else []
+            lines.extend(self.stack.format())
+            lines.extend(self.header)
+            self.rendered = "".join(lines)
+        return self.rendered
+
+
+class ExceptionStore:
+    """
+    Ring buffer of ExceptionRecords plus per-fingerprint aggregates
+
+    Counts (by type and severity, unresolved) cover the records currently held, so
+    they stay consistent with what the history shows; total_recorded never drops.
+    Fingerprint aggregates outlive the ring and are capped at max_fingerprints,
+    least recently seen first out. Not thread-safe; ExceptionHandler holds a lock.
+    """
+
+    def __init__(self, capacity: int = 1000, max_fingerprints: int = 500):
+        """
+        Args:
+            capacity: Records kept; the oldest is evicted when full
+            max_fingerprints: Distinct fingerprints tracked
+        """
+        self.capacity = capacity
+        self.max_fingerprints = max_fingerprints
+        self.total_recorded = 0
+        self.type_counts: Dict[str, int] = {}
+        self.severity_counts: Dict[str, int] = {s: 0 for s in SEVERITIES}
+        self.unresolved_count = 0
+
+        self._records: deque = deque()
+        self._unresolved_by_type: Dict[str, deque] = {}
+        self._fingerprints: "OrderedDict[str, _FingerprintEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ExceptionRecord]:
+        return iter(self._records)
+
+    def record_occurrence(self, exception: BaseException) -> str:
+        """Count an exception against its fingerprint and return the fingerprint"""
+        fingerprint, location = fingerprint_exception(exception)
+        now = datetime.now().isoformat()
+        entry = self._fingerprints.get(fingerprint)
+        if entry is None:
+            stats = ExceptionFingerprint(
+                fingerprint=fingerprint,
+                exception_type=type(exception).__name__,
+                location=location,
+                count=0,
+                first_seen=now,
+                last_seen=now,
+                last_message=str(exception)
+            )
+            entry = self._fingerprints[fingerprint] = _FingerprintEntry(stats, exception)
+            if len(self._fingerprints) > self.max_fingerprints:
+                self._fingerprints.popitem(last=False)
+        else:
+            self._fingerprints.move_to_end(fingerprint)
+            entry.stats.last_seen = now
+            entry.stats.last_message = str(exception)
+        entry.stats.count += 1
+        return fingerprint
+
+    def add(self, record: ExceptionRecord):
+        if len(self._records) >= self.capacity:
+            self._evict(self._records.popleft())
+
+        self._records.append(record)
+        self.total_recorded += 1
+        self.type_counts[record.exception_type] = self.type_counts.get(record.exception_type, 0) + 1
+        self.severity_counts[record.severity] = self.severity_counts.get(record.severity, 0) + 1
+        if not record.resolved:
+            self._unresolved_by_type.setdefault(record.exception_type, deque()).append(record)
+            self.unresolved_count += 1
+
+    def _evict(self, record: ExceptionRecord):
+        exc_type = record.exception_type
+        self.type_counts[exc_type] -= 1
+        if not self.type_counts[exc_type]:
+            del self.type_counts[exc_type]
+        self.severity_counts[record.severity] -= 1
+
+        if not record.resolved:
+            # Records of a type are evicted oldest first, so this one leads its queue
+            pending = self._unresolved_by_type[exc_type]
+            pending.popleft()
+            if not pending:
+                del self._unresolved_by_type[exc_type]
+            self.unresolved_count -= 1
+
+    def traceback_for(self, fingerprint: str) -> Optional[str]:
+        entry = self._fingerprints.get(fingerprint)
+        return entry.render() if entry is not None else None
+
+    def to_dict(self, record: ExceptionRecord) -> Dict:
+        """Record as a dict including its rendered traceback"""
+        data = asdict(record)
+        data["traceback"] = self.traceback_for(record.fingerprint)
+        return data
+
+    def fingerprints(self, limit: Optional[int] = None) -> List[Dict]:
+        """Fingerprint aggregates, most frequent first"""
+        ranked = sorted(self._fingerprints.values(), key=lambda e: e.stats.count, reverse=True)
+        return [asdict(e.stats) for e in ranked[:limit]]
+
+    def recent(self, limit: int = 10) -> List[ExceptionRecord]:
+        if limit <= 0:
+            return []
+        return list(islice(reversed(self._records), limit))[::-1]
+
+    def unresolved(self) -> List[ExceptionRecord]:
+        records = [r for pending in self._unresolved_by_type.values() for r in pending]
+        records.sort(key=lambda r: r.timestamp)
+        return records
+
+    def resolve_type(self, exception_type: str) -> int:
+        pending = self._unresolved_by_type.pop(exception_type, None)
+        if not pending:
+            return 0
+        resolution_time = datetime.now().isoformat()
+        for record in pending:
+            record.resolved = True
+            record.resolution_time = resolution_time
+        self.unresolved_count -= len(pending)
+        return len(pending)
+
+    def distinct_fingerprints(self) -> int:
+        return len(self._fingerprints)
+
+    def clear(self):
+        self._records.clear()
+        self._unresolved_by_type.clear()
+        self._fingerprints.clear()
+        self.type_counts.clear()
+        self.severity_counts = {s: 0 for s in SEVERITIES}
+        self.unresolved_count = 0
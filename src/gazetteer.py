@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Gazetteer Module
+Offline index of cities and points of interest with coordinates, supporting
+exact/alias lookup, free-text matching, nearest-neighbour and radius queries
+"""
+import csv
+import math
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    lat: float
+    lon: float
+    kind: str
+    city: str
+    aliases: Tuple[str, ...] = ()
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class Gazetteer:
+    """Place lookup backed by a bundled CSV file and a fixed-size lat/lon grid index"""
+
+    def __init__(self, path: Optional[str] = None, cell_degrees: float = 1.0):
+        """
+        Args:
+            path: CSV file with columns name,lat,lon,kind,city,aliases ("|" separated)
+            cell_degrees: Grid cell size of the spatial index
+        """
+        self.path = path or os.getenv("GAZETTEER_PATH", DEFAULT_GAZETTEER_PATH)
+        self.cell_degrees = cell_degrees
+
+        self._places: List[Place] = []
+        self._names: Dict[str, Place] = {}
+        self._grid: Dict[Tuple[int, int], List[Place]] = {}
+        self._max_name_length = 0
+        self._cell_bounds = (0, 0, 0, 0)
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+
+            places = []
+            with open(self.path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    aliases = tuple(a.strip() for a in (row.get("aliases") or "").split("|") if a.strip())
+                    places.append(Place(
+                        name=row["name"].strip(),
+                        lat=float(row["lat"]),
+                        lon=float(row["lon"]),
+                        kind=row.get("kind", "poi").strip() or "poi",
+                        city=(row.get("city") or row["name"]).strip(),
+                        aliases=aliases
+                    ))
+            self._index(places)
+            self._loaded = True
+
+    def _index(self, places: List[Place]):
+        names: Dict[str, Place] = {}
+        grid: Dict[Tuple[int, int], List[Place]] = defaultdict(list)
+
+        for place in places:
+            for name in (place.name,) + place.aliases:
+                names.setdefault(name.casefold(), place)
+            grid[self._cell(place.lat, place.lon)].append(place)
+
+        self._places = places
+        self._names = names
+        self._grid = dict(grid)
+        self._max_name_length = max((len(n) for n in names), default=0)
+        if grid:
+            rows = [cell[0] for cell in grid]
+            cols = [cell[1] for cell in grid]
+            self._cell_bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._places)
+
+    def get(self, name: str) -> Optional[Place]:
+        """Exact lookup by name or alias (case-insensitive)"""
+        self._ensure_loaded()
+        return self._names.get(name.strip().casefold())
+
+    def find(self, text: str) -> Optional[Place]:
+        """
+        Resolve free text such as "北京天安门" to the most specific known place
+
+        Tries an exact match first, then the longest place name or alias
+        contained in the text. Cost depends on the text length, not on the
+        size of the gazetteer.
+
+        Args:
+            text: Address or place description
+
+        Returns:
+            Matching place, or None
+        """
+        self._ensure_loaded()
+        key = text.strip().casefold()
+        if not key:
+            return None
+
+        place = self._names.get(key)
+        if place is not None:
+            return place
+
+        best: Optional[Place] = None
+        best_length = 1
+        for start in range(len(key)):
+            longest = min(self._max_name_length, len(key) - start)
+            for length in range(longest, best_length, -1):
+                candidate = self._names.get(key[start:start + length])
+                if candidate is not None:
+                    best, best_length = candidate, length
+                    break
+        return best
+
+    def nearest(self, lat: float, lon: float, k: int = 1, kind: Optional[str] = None) -> List[Tuple[Place, float]]:
+        """
+        Find the k places closest to a point
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            k: Number of places to return
+            kind: Optional filter ("city" or "poi")
+
+        Returns:
+            List of (place, distance_km) sorted by distance
+        """
+        self._ensure_loaded()
+        if k < 1 or not self._grid:
+            return []
+
+        row, col = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._cell_bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+
+        found: List[Tuple[float, Place]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(row, col, ring):
+                for place in self._grid.get(cell, ()):
+                    if kind is None or place.kind == kind:
+                        found.append((haversine_km(lat, lon, place.lat, place.lon), place))
+
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                if found[k - 1][0] <= self._ring_lower_bound_km(lat, ring + 1):
+                    break
+
+        found.sort(key=lambda item: item[0])
+        return [(place, distance) for distance, place in found[:k]]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float,
+                      kind: Optional[str] = None) -> List[Tuple[Place, float]]:
+        """
+        Find all places within a radius of a point
+
+        Returns:
+            List of (place, distance_km) sorted by distance
+        """
+        self._ensure_loaded()
+        dlat = radius_km / KM_PER_DEGREE
+        cos_lat = max(math.cos(math.radians(min(89.9, abs(lat) + dlat))), 1e-6)
+        dlon = min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+
+        min_row, min_col = self._cell(lat - dlat, lon - dlon)
+        max_row, max_col = self._cell(lat + dlat, lon + dlon)
+
+        results = []
+        for r in range(min_row, max_row + 1):
+            for c in range(min_col, max_col + 1):
+                for place in self._grid.get((r, c), ()):
+                    if kind is not None and place.kind != kind:
+                        continue
+                    distance = haversine_km(lat, lon, place.lat, place.lon)
+                    if distance <= radius_km:
+                        results.append((place, distance))
+
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def _ring_cells(self, row: int, col: int, ring: int):
+        if ring == 0:
+            yield row, col
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
+
+    def _ring_lower_bound_km(self, lat: float, ring: int) -> float:
+        """Smallest possible distance from the query point to any cell in the given ring"""
+        span_degrees = (ring - 1) * self.cell_degrees
+        if span_degrees <= 0:
+            return 0.0
+        cos_lat = math.cos(math.radians(min(89.9, abs(lat) + ring * self.cell_degrees)))
+        return span_degrees * KM_PER_DEGREE * min(1.0, cos_lat)
+
+
+_default_gazetteer: Optional[Gazetteer] = None
+_default_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Get the process-wide gazetteer loaded from the bundled data file"""
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        with _default_gazetteer_lock:
+            if _default_gazetteer is None:
+                _default_gazetteer = Gazetteer()
+    return _default_gazetteer
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Hedging Module
+Hedged requests: when a call has not completed by the observed latency percentile a
+second identical call is started, the first successful result wins and the other
+call is cancelled. Hedges are capped at a fraction of recent requests.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from latency_histogram import LatencyHistogram
+from retry_policy import RetryBudget
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Hedge delay is the `percentile` of successful call latencies over the last one
+    to two window_seconds (two rotating histograms), floored at min_delay_ms. No
+    hedge is sent before min_samples latencies are known or once hedges exceed
+    max_hedge_ratio of the requests in the last 10 seconds.
+    """
+
+    def __init__(self, name: str,
+                 percentile: float = 95.0,
+                 max_hedge_ratio: float = 0.1,
+                 min_samples: int = 20,
+                 min_delay_ms: float = 1.0,
+                 window_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: Dependency being hedged
+            percentile: Latency percentile after which a hedge is sent
+            max_hedge_ratio: Hedges allowed per request
+            min_samples: Latencies needed before hedging starts
+            min_delay_ms: Lower bound of the hedge delay
+            window_seconds: Age at which latency samples start to be forgotten
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.min_delay_ms = min_delay_ms
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.budget = RetryBudget(ratio=max_hedge_ratio, min_retries_per_second=0.0, clock=clock)
+
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.losers_cancelled = 0
+
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+        self._rotated_at = clock()
+        self._delay_ms: Optional[float] = None
+        self._delay_computed_at: Optional[float] = None
+
+    def record_latency(self, latency_ms: float):
+        now = self.clock()
+        if now - self._rotated_at >= self.window_seconds:
+            self._previous, self._current = self._current, self._previous
+            self._current.reset()
+            self._rotated_at = now
+        self._current.record(latency_ms)
+
+    def hedge_delay_seconds(self) -> Optional[float]:
+        """Current hedge delay, None while there are too few samples; recomputed at most once a second"""
+        now = self.clock()
+        if self._delay_computed_at is None or now - self._delay_computed_at >= 1.0:
+            window = self._current.copy()
+            window.merge(self._previous)
+            if window.count < self.min_samples:
+                self._delay_ms = None
+            else:
+                self._delay_ms = max(self.min_delay_ms, window.percentiles([self.percentile])[self.percentile])
+            self._delay_computed_at = now
+        return self._delay_ms / 1000 if self._delay_ms is not None else None
+
+    async def _timed(self, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await call()
+        self.record_latency((time.perf_counter() - start) * 1000)
+        return result
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await call(), hedging it with a second call() if it runs past the hedge delay
+
+        Returns:
+            The first successful result; if every call failed, the last failure is raised
+        """
+        self.requests += 1
+        self.budget.record_request()
+        primary = asyncio.ensure_future(self._timed(call))
+        tasks = {primary: "primary"}
+        try:
+            delay = self.hedge_delay_seconds()
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self.budget.try_acquire():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._timed(call))
+            tasks[hedge] = "hedge"
+            self.hedges_sent += 1
+
+            pending = set(tasks)
+            last = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    last = task
+                    if task.exception() is None:
+                        if tasks[task] == "hedge":
+                            self.hedge_wins += 1
+                        else:
+                            self.primary_wins += 1
+                        return task.result()
+            return last.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    self.losers_cancelled += 1
+                elif not task.cancelled():
+                    task.exception()  # mark a losing failure as retrieved
+
+    def get_stats(self) -> Dict:
+        delay = self.hedge_delay_seconds()
+        decided = self.hedge_wins + self.primary_wins
+        return {
+            "percentile": self.percentile,
+            "hedge_delay_ms": round(delay * 1000, 3) if delay is not None else None,
+            "max_hedge_ratio": self.max_hedge_ratio,
+            "requests": self.requests,
+            "hedges_sent": self.hedges_sent,
+            "hedge_rate": round(self.hedges_sent / self.requests, 4) if self.requests else 0.0,
+            "hedges_denied": self.budget.budget_exhausted_total,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "hedge_win_rate": round(self.hedge_wins / decided, 4) if decided else 0.0,
+            "losers_cancelled": self.losers_cancelled
+        }
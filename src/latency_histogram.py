@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Latency Histogram Module
+Fixed-size log-linear (HDR-style) histograms for request latencies: constant-time
+recording, bounded memory and percentiles with a bounded relative error
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in microseconds
+
+    Values below 2**sub_bucket_bits are counted exactly; above that, each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) equal buckets,
+    so every bucket is at most 1 / 2**(sub_bucket_bits - 1) of its value wide
+    (about 6% with the default of 5 bits). Not thread-safe; callers hold a lock.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 5, max_value_ms: float = 3_600_000.0):
+        """
+        Args:
+            sub_bucket_bits: Precision; buckets per power of two is 2**(bits - 1)
+            max_value_ms: Largest tracked value, larger values land in the last bucket
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self._linear_limit = 1 << sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._max_value_us = int(max_value_ms * 1000)
+
+        self.counts: List[int] = [0] * (self._index(self._max_value_us) + 1)
+        self.count = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self._linear_limit:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return shift * self._half + (value_us >> shift)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value (µs) counted in a bucket"""
+        if index < self._linear_limit:
+            return index, index
+        shift, offset = divmod(index - self._linear_limit, self._half)
+        shift += 1
+        low = (self._half + offset) << shift
+        return low, low + (1 << shift) - 1
+
+    def bucket_for(self, value_ms: float) -> Tuple[int, int]:
+        """Bucket index and clamped value in µs for a duration"""
+        value_us = min(max(int(value_ms * 1000), 0), self._max_value_us)
+        return self._index(value_us), value_us
+
+    def record(self, value_ms: float):
+        index, value_us = self.bucket_for(value_ms)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[int], sum_us: int, max_us: int,
+                    sub_bucket_bits: int = 5, max_value_ms: float = 3_600_000.0) -> "LatencyHistogram":
+        """Rebuild a histogram from raw bucket counts (e.g. aggregated across processes)"""
+        histogram = cls(sub_bucket_bits, max_value_ms)
+        histogram.counts = [int(c) for c in counts]
+        histogram.count = sum(histogram.counts)
+        histogram.sum_us = int(sum_us)
+        histogram.max_us = int(max_us)
+        first = next((i for i, c in enumerate(histogram.counts) if c), None)
+        histogram.min_us = histogram._bounds(first)[0] if first is not None else None
+        return histogram
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram.__new__(LatencyHistogram)
+        clone.__dict__.update(self.__dict__)
+        clone.counts = list(self.counts)
+        return clone
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.sub_bucket_bits != self.sub_bucket_bits or len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different layouts")
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.sum_us += other.sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+        """
+        Values in ms at the given percentiles, reported as the upper bound of
+        the bucket holding that rank (clamped to the observed min/max)
+        """
+        targets = sorted(percentiles)
+        results: Dict[float, float] = {}
+        if self.count == 0:
+            return {p: 0.0 for p in targets}
+
+        ranks = [max(1, -(-p * self.count // 100)) for p in targets]
+        seen = 0
+        t = 0
+        for index, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            while t < len(targets) and seen >= ranks[t]:
+                value_us = min(max(self._bounds(index)[1], self.min_us), self.max_us)
+                results[targets[t]] = value_us / 1000
+                t += 1
+            if t == len(targets):
+                break
+        return results
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict:
+        values = self.percentiles(percentiles)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_us / self.count / 1000, 3) if self.count else 0.0,
+            "min_ms": round((self.min_us or 0) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+            **{_percentile_label(p): round(v, 3) for p, v in values.items()}
+        }
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Non-empty buckets as (upper bound in ms, count)"""
+        return [(self._bounds(i)[1] / 1000, c) for i, c in enumerate(self.counts) if c]
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+
+def _percentile_label(p: float) -> str:
+    """50 -> "p50", 99.9 -> "p999" """
+    text = f"{p:g}".replace(".", "")
+    return f"p{text}"
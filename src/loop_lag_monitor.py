@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Event Loop Lag Monitor
+Measures how late the asyncio event loop wakes up and, when it stalls, captures the
+stack of the code blocking it so slow synchronous calls can be traced to a handler
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_FRAMES = 12
+
+
+@dataclass
+class LoopStall:
+    timestamp: str
+    lag_ms: float
+    task: Optional[str]
+    stack: List[str]
+
+
+class LoopLagMonitor:
+    """
+    A ticker coroutine sleeps for a fixed interval and records how late it resumes.
+    A watchdog thread notices when the ticker is overdue and samples the loop
+    thread's frames while the blocking call is still running.
+    """
+
+    def __init__(self,
+                 interval_seconds: float = 0.1,
+                 stall_threshold_ms: float = 100.0,
+                 max_stalls: int = 50,
+                 on_stall: Optional[Callable[[LoopStall], None]] = None):
+        """
+        Args:
+            interval_seconds: Ticker period; also bounds how short a stall can be seen
+            stall_threshold_ms: Lag at which a wake-up is recorded as a stall
+            max_stalls: Recent stalls kept with their stacks
+            on_stall: Called on the loop thread for every stall (e.g. to raise an alert)
+        """
+        self.interval_seconds = interval_seconds
+        self.stall_threshold_ms = stall_threshold_ms
+        self.on_stall = on_stall
+
+        self.lag_histogram = LatencyHistogram()
+        self.stalls: deque = deque(maxlen=max_stalls)
+        self.stall_count = 0
+        self.max_lag_ms = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Written by the ticker, read by the watchdog
+        self._tick = 0
+        self._deadline = 0.0
+        # (tick, task, stack) sampled by the watchdog during the current stall
+        self._captured = None
+
+    @property
+    def running(self) -> bool:
+        return self._ticker is not None and not self._ticker.done()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Start on the given (or running) loop; call from the loop thread"""
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._deadline = time.monotonic() + self.interval_seconds
+        self._ticker = self._loop.create_task(self._tick_loop(), name="loop-lag-ticker")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop lag monitor started: interval={self.interval_seconds}s, "
+                    f"threshold={self.stall_threshold_ms}ms")
+
+    async def stop(self):
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+
+    async def _tick_loop(self):
+        while not self._stop.is_set():
+            self._deadline = time.monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag_ms = max(0.0, (time.monotonic() - self._deadline) * 1000)
+            self._record(lag_ms)
+            self._tick += 1
+
+    def _record(self, lag_ms: float):
+        self.lag_histogram.record(lag_ms)
+        if lag_ms > self.max_lag_ms:
+            self.max_lag_ms = lag_ms
+        if lag_ms < self.stall_threshold_ms:
+            return
+
+        captured = self._captured
+        task, stack = (captured[1], captured[2]) if captured and captured[0] == self._tick else (None, [])
+        stall = LoopStall(
+            timestamp=datetime.now().isoformat(),
+            lag_ms=round(lag_ms, 3),
+            task=task,
+            stack=stack
+        )
+        self.stalls.append(stall)
+        self.stall_count += 1
+        where = stack[-1].strip().splitlines()[0] if stack else "unknown"
+        logger.warning(f"Event loop blocked for {lag_ms:.0f}ms at {where}")
+        if self.on_stall is not None:
+            try:
+                self.on_stall(stall)
+            except Exception as e:
+                logger.error(f"Loop stall callback failed: {e}")
+
+    def _watch(self):
+        poll = min(self.interval_seconds, self.stall_threshold_ms / 1000) / 2
+        while not self._stop.wait(poll):
+            tick = self._tick
+            overdue_ms = (time.monotonic() - self._deadline) * 1000
+            if overdue_ms >= self.stall_threshold_ms and (self._captured is None or self._captured[0] != tick):
+                self._captured = (tick, *self._sample_loop_thread())
+
+    def _sample_loop_thread(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=MAX_STACK_FRAMES) if frame is not None else []
+        # current_task only reads the loop's task registry, so it is safe off-thread
+        task = None
+        try:
+            current = asyncio.current_task(self._loop)
+            if current is not None:
+                coro = current.get_coro()
+                task = f"{current.get_name()} ({getattr(coro, '__qualname__', coro)})"
+        except Exception:
+            pass
+        return task, stack
+
+    def get_stats(self, recent: int = 5) -> Dict:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval_seconds * 1000,
+            "stall_threshold_ms": self.stall_threshold_ms,
+            "stalls": self.stall_count,
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "lag": self.lag_histogram.summary(),
+            "recent_stalls": [asdict(s) for s in list(self.stalls)[-recent:]]
+        }
+
+    def reset(self):
+        self.lag_histogram.reset()
+        self.stalls.clear()
+        self.stall_count = 0
+        self.max_lag_ms = 0.0
@@ -7,12 +7,12 @@ from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 import mcp.types as types
-from itertools import permutations
 import platform
 import subprocess
 from destination_reminder import DestinationReminder
 from speed_monitor import SpeedMonitor
 from transportation_recommender import TransportationRecommender
+from route_optimizer import optimize_route
 
 app = Server("map-navigator")
 reminder_service = DestinationReminder()
@@ -220,6 +220,27 @@ async def handle_list_tools() -> list[Tool]:
                 "required": ["location"]
             }
         ),
+        Tool(
+            name="get_weather_batch",
+            description="Get weather for multiple destinations at once, e.g. every stop of a multi-destination trip. Locations are fetched concurrently and repeated cities are only fetched once.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "locations": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Locations to get weather for (e.g., ['北京', '上海', '杭州'])",
+                        "minItems": 1
+                    },
+                    "include_recommendations": {
+                        "type": "boolean",
+                        "description": "Also include travel recommendations for each location (default: false)",
+                        "default": False
+                    }
+                },
+                "required": ["locations"]
+            }
+        ),
         Tool(
             name="get_travel_recommendations",
             description="Get travel recommendations for a destination including best visiting times, popular attractions, local cuisine, transportation tips, and travel advice.",
@@ -466,8 +487,11 @@ async def handle_call_tool(
         if not isinstance(destinations, list) or len(destinations) < 2:
             raise ValueError("destinations must be a list with at least 2 locations")
         
+        optimization_detail = ""
         if optimize:
-            destinations = _optimize_route_simple(destinations)
+            optimization = await asyncio.to_thread(optimize_route, origin, destinations)
+            destinations = optimization.order
+            optimization_detail = _format_optimization(optimization)
         
         waypoints = "|".join([quote(dest) for dest in destinations[:-1]])
         origin_encoded = quote(origin)
@@ -489,7 +513,7 @@ async def handle_call_tool(
             TextContent(
                 type="text",
                 text=f"✅ Baidu Map multi-destination navigation opened successfully!\n\n"
-                     f"📍 Route{optimization_note}:\n{route_display}\n"
+                     f"📍 Route{optimization_note}:\n{route_display}\n{optimization_detail}"
                      f"🚗 Mode: {mode}\n"
                      f"📊 Total stops: {len(destinations)}\n"
                      f"🎵 Music: {music_status}\n\n"
@@ -509,8 +533,11 @@ async def handle_call_tool(
         if not isinstance(destinations, list) or len(destinations) < 2:
             raise ValueError("destinations must be a list with at least 2 locations")
         
+        optimization_detail = ""
         if optimize:
-            destinations = _optimize_route_simple(destinations)
+            optimization = await asyncio.to_thread(optimize_route, origin, destinations)
+            destinations = optimization.order
+            optimization_detail = _format_optimization(optimization)
         
         all_points = [origin] + destinations
         route_display = f"{origin}"
@@ -533,7 +560,7 @@ async def handle_call_tool(
             TextContent(
                 type="text",
                 text=f"✅ Amap multi-destination navigation opened successfully!\n\n"
-                     f"📍 Route{optimization_note}:\n{route_display}\n"
+                     f"📍 Route{optimization_note}:\n{route_display}\n{optimization_detail}"
                      f"🚗 Mode: {mode}\n"
                      f"📊 Total stops: {len(destinations)}\n"
                      f"🗂️ Opened {len(tabs_opened)} navigation tabs (one for each leg)\n"
@@ -548,7 +575,7 @@ async def handle_call_tool(
         if not location:
             raise ValueError("location is required")
         
-        weather_info = reminder_service.get_weather(location)
+        weather_info = await reminder_service.get_weather_async(location)
         weather_message = reminder_service.format_weather_message(weather_info)
         
         return [
@@ -558,6 +585,36 @@ async def handle_call_tool(
             )
         ]
     
+    elif name == "get_weather_batch":
+        locations = arguments.get("locations")
+        include_recommendations = arguments.get("include_recommendations", False)
+        
+        if not isinstance(locations, list) or not locations:
+            raise ValueError("locations must be a non-empty list")
+        
+        batch = await reminder_service.get_weather_batch_async(
+            locations,
+            include_recommendations=include_recommendations
+        )
+        
+        sections = []
+        for item in batch["results"]:
+            if item["success"]:
+                section = reminder_service.format_weather_message(item["weather"])
+                if item.get("recommendations"):
+                    section += "\n" + reminder_service.format_recommendations_message(item["recommendations"])
+            else:
+                section = f"❌ {item['location']}: {item['error']}"
+            sections.append(section)
+        
+        return [
+            TextContent(
+                type="text",
+                text=f"✅ Weather retrieved for {batch['succeeded']}/{batch['total']} locations\n\n"
+                     + f"\n\n{'='*50}\n\n".join(sections)
+            )
+        ]
+    
     elif name == "get_travel_recommendations":
         location = arguments.get("location")
         
@@ -580,7 +637,7 @@ async def handle_call_tool(
         if not location:
             raise ValueError("location is required")
         
-        info = reminder_service.get_destination_info(location)
+        info = await reminder_service.get_destination_info_async(location)
         full_message = f"{info['weather_message']}\n\n{'='*50}\n\n{info['recommendations_message']}"
         
         return [
@@ -733,35 +790,32 @@ async def handle_call_tool(
     else:
         raise ValueError(f"Unknown tool: {name}")
 
-def _optimize_route_simple(destinations: list[str]) -> list[str]:
-    if len(destinations) <= 3:
-        min_route = destinations
-        min_length = len("".join(destinations))
-        
-        for perm in permutations(destinations):
-            route_length = len("".join(perm))
-            if route_length < min_length:
-                min_length = route_length
-                min_route = list(perm)
-        
-        return min_route
-    else:
-        return destinations
+def _format_optimization(optimization) -> str:
+    if optimization.distance_km is None:
+        return "⚠️ Stops could not be located, keeping the given order\n"
+    detail = (f"📏 Straight-line distance: {optimization.distance_km:.1f} km "
+              f"(given order: {optimization.original_distance_km:.1f} km)\n")
+    if optimization.unresolved:
+        detail += f"⚠️ Unlocated stops kept at the end: {', '.join(optimization.unresolved)}\n"
+    return detail
 
 async def main():
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="map-navigator",
-                server_version="1.0.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="map-navigator",
+                    server_version="1.0.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await reminder_service.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Metrics Exporter Module
+Renders PerformanceMonitor, ExceptionHandler, AutoScaler and SRENotifier state in
+the OpenMetrics text format for Prometheus scrapes
+"""
+from typing import Dict, List, Optional, Sequence
+
+from auto_scaler import AutoScaler
+from exception_handler import ExceptionHandler
+from latency_histogram import LatencyHistogram
+from performance_monitor import PerformanceMonitor
+from sre_notifier import SRENotifier
+from structured_logger import StructuredLogger
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Exported bucket bounds in seconds; internal log-linear buckets are folded into these
+DEFAULT_LATENCY_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+BREAKER_STATES = ("closed", "open", "half_open")
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class MetricsExporter:
+    """Builds the /metrics payload from the monitoring singletons (pod-wide when they share metrics)"""
+
+    def __init__(self,
+                 perf_monitor: PerformanceMonitor,
+                 exception_handler: Optional[ExceptionHandler] = None,
+                 auto_scaler: Optional[AutoScaler] = None,
+                 sre_notifier: Optional[SRENotifier] = None,
+                 struct_logger: Optional[StructuredLogger] = None,
+                 namespace: str = "ai_navigator",
+                 latency_bounds: Sequence[float] = DEFAULT_LATENCY_BOUNDS):
+        self.perf_monitor = perf_monitor
+        self.exception_handler = exception_handler
+        self.auto_scaler = auto_scaler
+        self.sre_notifier = sre_notifier
+        self.struct_logger = struct_logger
+        self.namespace = namespace
+        self.latency_bounds = tuple(latency_bounds)
+
+        # Reused across scrapes: the line buffer, bucket label strings, per-route
+        # label sets and the internal-bucket -> exported-bucket index
+        self._lines: List[str] = []
+        self._le_labels = tuple(format_value(b) for b in self.latency_bounds) + ("+Inf",)
+        self._route_labels: Dict[str, str] = {}
+        self._bucket_map: Optional[List[int]] = None
+
+    def _route_label(self, route: str) -> str:
+        label = self._route_labels.get(route)
+        if label is None:
+            label = self._route_labels[route] = f'route="{escape_label(route)}"'
+        return label
+
+    def _map_buckets(self, histogram: LatencyHistogram) -> List[int]:
+        if self._bucket_map is None or len(self._bucket_map) != len(histogram.counts):
+            bounds_us = [b * 1_000_000 for b in self.latency_bounds]
+            mapping = []
+            for index in range(len(histogram.counts)):
+                upper_us = histogram._bounds(index)[1]
+                slot = next((i for i, b in enumerate(bounds_us) if upper_us <= b), len(bounds_us))
+                mapping.append(slot)
+            self._bucket_map = mapping
+        return self._bucket_map
+
+    def _header(self, name: str, metric_type: str, help_text: str, unit: Optional[str] = None):
+        self._lines.append(f"# TYPE {name} {metric_type}")
+        if unit:
+            self._lines.append(f"# UNIT {name} {unit}")
+        self._lines.append(f"# HELP {name} {help_text}")
+
+    def _sample(self, name: str, value: float, labels: str = ""):
+        if labels:
+            self._lines.append(f"{name}{{{labels}}} {format_value(value)}")
+        else:
+            self._lines.append(f"{name} {format_value(value)}")
+
+    def _histogram(self, name: str, labels: str, histogram: LatencyHistogram):
+        mapping = self._map_buckets(histogram)
+        folded = [0] * len(self._le_labels)
+        for index, count in enumerate(histogram.counts):
+            if count:
+                folded[mapping[index]] += count
+
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for le, count in zip(self._le_labels, folded):
+            cumulative += count
+            self._lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+        self._sample(f"{name}_count", histogram.count, labels)
+        self._sample(f"{name}_sum", histogram.sum_us / 1_000_000, labels)
+
+    def render(self) -> str:
+        self._lines.clear()
+        ns = self.namespace
+
+        self._render_performance(ns)
+        if self.exception_handler is not None:
+            self._render_exceptions(ns)
+        if self.auto_scaler is not None:
+            self._render_scaling(ns)
+        if self.sre_notifier is not None:
+            self._render_notifications(ns)
+        if self.struct_logger is not None:
+            self._render_logging(ns)
+
+        self._lines.append("# EOF\n")
+        return "\n".join(self._lines)
+
+    def _render_performance(self, ns: str):
+        snapshot = self.perf_monitor.get_snapshot()
+
+        self._header(f"{ns}_requests", "counter", "HTTP requests handled")
+        self._sample(f"{ns}_requests_total", snapshot.request_count)
+        self._header(f"{ns}_request_errors", "counter", "HTTP requests that failed or returned status >= 400")
+        self._sample(f"{ns}_request_errors_total", snapshot.error_count)
+        self._header(f"{ns}_active_connections", "gauge", "Requests currently in progress")
+        self._sample(f"{ns}_active_connections", snapshot.active_connections)
+
+        for metric, value, help_text in (
+            ("cpu_usage_percent", snapshot.cpu_percent, "Host CPU utilisation from the latest sample"),
+            ("memory_usage_percent", snapshot.memory_percent, "Host memory utilisation from the latest sample"),
+            ("disk_usage_percent", snapshot.disk_percent, "Root filesystem utilisation from the latest sample"),
+        ):
+            self._header(f"{ns}_{metric}", "gauge", help_text)
+            self._sample(f"{ns}_{metric}", value)
+
+        alerts = self.perf_monitor.get_all_alerts()
+        self._header(f"{ns}_active_alerts", "gauge", "Unresolved performance alerts by severity")
+        for severity in ("warning", "error", "critical"):
+            self._sample(f"{ns}_active_alerts", sum(1 for a in alerts if a["severity"] == severity),
+                         f'severity="{severity}"')
+
+        histograms = self.perf_monitor.get_histograms()
+        name = f"{ns}_request_duration_seconds"
+        self._header(name, "histogram", "HTTP request latency by route template", unit="seconds")
+        for route, histogram in sorted(histograms.items()):
+            self._histogram(name, self._route_label(route), histogram)
+
+        loop_monitor = self.perf_monitor.loop_monitor
+        name = f"{ns}_event_loop_lag_seconds"
+        self._header(name, "histogram", "How late the event loop ticker woke up", unit="seconds")
+        self._histogram(name, "", loop_monitor.lag_histogram.copy())
+        self._header(f"{ns}_event_loop_stalls", "counter", "Event loop wake-ups later than the stall threshold")
+        self._sample(f"{ns}_event_loop_stalls_total", loop_monitor.stall_count)
+
+    def _render_exceptions(self, ns: str):
+        handler = self.exception_handler
+        self._header(f"{ns}_exceptions", "counter", "Exceptions recorded by the exception handler")
+        self._sample(f"{ns}_exceptions_total", handler.get_exception_count())
+
+        breakers = sorted((name, breaker.get_state()) for name, breaker in list(handler.circuit_breakers.items()))
+        name = f"{ns}_circuit_breaker_state"
+        self._header(name, "stateset", "Circuit breaker state per protected dependency")
+        for breaker, state in breakers:
+            label = f'breaker="{escape_label(breaker)}"'
+            for candidate in BREAKER_STATES:
+                self._sample(name, candidate == state["state"], f'{label},{name}="{candidate}"')
+
+        name = f"{ns}_circuit_breaker_failures"
+        self._header(name, "gauge", "Consecutive failures counted by each circuit breaker")
+        for breaker, state in breakers:
+            self._sample(name, state["failure_count"], f'breaker="{escape_label(breaker)}"')
+
+        name = f"{ns}_circuit_breaker_failure_rate"
+        self._header(name, "gauge", "Failure fraction over each circuit breaker's sliding window")
+        for breaker, state in breakers:
+            self._sample(name, state["failure_rate"], f'breaker="{escape_label(breaker)}"')
+
+        name = f"{ns}_circuit_breaker_rejections"
+        self._header(name, "counter", "Calls rejected by each circuit breaker")
+        for breaker, state in breakers:
+            self._sample(f"{name}_total", state["rejected_total"], f'breaker="{escape_label(breaker)}"')
+
+        bulkheads = sorted((name, bulkhead.get_stats()) for name, bulkhead in list(handler.bulkheads.items()))
+        for metric, kind, help_text, key in (
+                ("bulkhead_active", "gauge", "Calls running inside each bulkhead", "active"),
+                ("bulkhead_queue_depth", "gauge", "Calls waiting for a bulkhead slot", "queue_depth"),
+                ("bulkhead_rejections", "counter", "Calls rejected by a full bulkhead", "rejected_total")):
+            name = f"{ns}_{metric}"
+            self._header(name, kind, help_text)
+            for bulkhead, stats in bulkheads:
+                sample = f"{name}_total" if kind == "counter" else name
+                self._sample(sample, stats[key], f'bulkhead="{escape_label(bulkhead)}"')
+
+        name = f"{ns}_retries"
+        self._header(name, "counter", "Retry decisions per dependency")
+        for dependency, budget in sorted(handler.retry_budgets.items()):
+            stats = budget.get_stats()
+            label = f'dependency="{escape_label(dependency)}"'
+            for result in ("retries", "budget_exhausted", "deadline_exceeded"):
+                self._sample(f"{name}_total", stats[f"{result}_total"], f'{label},result="{result}"')
+
+    def _render_scaling(self, ns: str):
+        scaler = self.auto_scaler
+        self._header(f"{ns}_replicas", "gauge", "Replica counts known to the auto-scaler")
+        for kind, value in (("current", scaler.current_replicas),
+                            ("min", scaler.min_replicas),
+                            ("max", scaler.max_replicas)):
+            self._sample(f"{ns}_replicas", value, f'kind="{kind}"')
+        self._header(f"{ns}_scaling_events", "counter", "Scaling events executed or attempted")
+        self._sample(f"{ns}_scaling_events_total", len(scaler.scaling_history))
+
+    def _render_notifications(self, ns: str):
+        name = f"{ns}_notifications"
+        self._header(name, "counter", "SRE notification deliveries by channel and result")
+        for (channel, success), count in sorted(self.sre_notifier.delivery_counts.items()):
+            result = "success" if success else "failure"
+            self._sample(f"{name}_total", count, f'channel="{escape_label(channel)}",result="{result}"')
+        self._header(f"{ns}_notifier_enabled", "gauge", "Whether SRE notifications are enabled")
+        self._sample(f"{ns}_notifier_enabled", bool(self.sre_notifier.config.enabled))
+
+    def _render_logging(self, ns: str):
+        stats = self.struct_logger.get_stats()
+        name = f"{ns}_log_records"
+        self._header(name, "counter", "Structured log records by outcome")
+        self._sample(f"{name}_total", stats["written"], 'result="written"')
+        self._sample(f"{name}_total", stats["dropped"], 'result="dropped"')
+        self._sample(f"{name}_total", stats["sampled_out"], 'result="sampled_out"')
+        self._sample(f"{name}_total", stats["rate_limited"], 'result="rate_limited"')
+        self._header(f"{ns}_log_queue_depth", "gauge", "Log records waiting for the background writer")
+        self._sample(f"{ns}_log_queue_depth", stats["queue_depth"])
@@ -3,12 +3,16 @@ import time
 import psutil
 import logging
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Literal
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Literal, Tuple
+from dataclasses import dataclass, asdict, fields, replace
 from collections import deque
 import threading
 import asyncio
+from latency_histogram import LatencyHistogram
+from loop_lag_monitor import LoopLagMonitor, LoopStall
+from shared_metrics import SharedMetrics
+from time_series import TimeSeries, parse_resolution
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,10 @@ class Alert:
     message: str
     resolved: bool = False
 
+# Numeric PerformanceMetrics fields kept in the metrics time series
+SERIES_FIELDS = tuple(f.name for f in fields(PerformanceMetrics) if f.name != "timestamp")
+INTEGER_FIELDS = {f.name for f in fields(PerformanceMetrics) if f.type is int}
+
 class PerformanceMonitor:
     def __init__(self, 
                  cpu_threshold: float = 80.0,
@@ -42,7 +50,12 @@ class PerformanceMonitor:
                  disk_threshold: float = 90.0,
                  error_rate_threshold: float = 0.05,
                  response_time_threshold_ms: float = 1000.0,
-                 metrics_retention_minutes: int = 60):
+                 metrics_retention_minutes: int = 60,
+                 max_staleness_seconds: float = 60.0,
+                 max_tracked_endpoints: int = 200,
+                 shared_metrics: Optional[SharedMetrics] = None,
+                 history_capacity: int = 1000,
+                 loop_stall_threshold_ms: float = 100.0):
         
         self.cpu_threshold = cpu_threshold
         self.memory_threshold = memory_threshold
@@ -50,18 +63,42 @@ class PerformanceMonitor:
         self.error_rate_threshold = error_rate_threshold
         self.response_time_threshold_ms = response_time_threshold_ms
         self.metrics_retention_minutes = metrics_retention_minutes
+        self.max_staleness_seconds = max_staleness_seconds
+        self.max_tracked_endpoints = max_tracked_endpoints
+        # When set, counters and histograms are also written to a segment shared by
+        # all workers of the pod, and every read reports the pod-wide aggregate
+        self.shared_metrics = shared_metrics
         
-        self.metrics_history: deque = deque(maxlen=1000)
+        # Raw samples plus 1m/5m/1h rollups, fixed size whatever the retention window
+        self.metrics_series = TimeSeries(SERIES_FIELDS, capacity=history_capacity)
         self.alerts: List[Alert] = []
         self.request_count = 0
         self.error_count = 0
         self.response_times: deque = deque(maxlen=100)
+        self._response_time_sum = 0.0
         self.active_connections = 0
         
+        # Per-route latency distributions keyed by "METHOD /path/{template}"
+        self.latency_histogram = LatencyHistogram()
+        self.endpoint_histograms: Dict[str, LatencyHistogram] = {}
+        self.endpoint_errors: Dict[str, int] = {}
+        
+        self.loop_monitor = LoopLagMonitor(stall_threshold_ms=loop_stall_threshold_ms,
+                                           on_stall=self._on_loop_stall)
+        
         self._lock = threading.Lock()
         self._monitoring = False
         self._monitor_thread = None
         
+        # Latest system sample, replaced as a whole so readers never see a partial update
+        self._snapshot: Optional[PerformanceMetrics] = None
+        self._snapshot_taken_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self.snapshot_refreshes = 0
+        
+        # cpu_percent(interval=None) reports usage since the previous call; prime it
+        psutil.cpu_percent(interval=None)
+        
         logger.info(f"Performance monitor initialized with thresholds: CPU={cpu_threshold}%, Memory={memory_threshold}%, Disk={disk_threshold}%")
 
     def start_monitoring(self, interval_seconds: int = 30):
@@ -80,6 +117,24 @@ class PerformanceMonitor:
             self._monitor_thread.join(timeout=5)
         logger.info("Stopped performance monitoring")
 
+    def start_loop_monitoring(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        # Call from the event loop thread, e.g. in a startup handler
+        self.loop_monitor.start(loop)
+
+    async def stop_loop_monitoring(self):
+        await self.loop_monitor.stop()
+
+    def _on_loop_stall(self, stall: LoopStall):
+        threshold = self.loop_monitor.stall_threshold_ms
+        where = stall.stack[-1].strip().splitlines()[0] if stall.stack else "未知位置"
+        self._create_alert(
+            severity="error" if stall.lag_ms > threshold * 10 else "warning",
+            metric_type="event_loop_lag",
+            metric_value=stall.lag_ms,
+            threshold=threshold,
+            message=f"事件循环阻塞 {stall.lag_ms:.0f}ms: {where}"
+        )
+
     def _monitor_loop(self, interval_seconds: int):
         while self._monitoring:
             try:
@@ -91,30 +146,81 @@ class PerformanceMonitor:
                 time.sleep(interval_seconds)
 
     def collect_metrics(self) -> PerformanceMetrics:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
+        now = datetime.now()
         with self._lock:
-            avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0.0
-            
             metrics = PerformanceMetrics(
-                timestamp=datetime.now().isoformat(),
+                timestamp=now.isoformat(),
                 cpu_percent=cpu_percent,
                 memory_percent=memory.percent,
                 memory_used_mb=memory.used / (1024 * 1024),
                 memory_available_mb=memory.available / (1024 * 1024),
                 disk_percent=disk.percent,
-                request_count=self.request_count,
-                error_count=self.error_count,
-                avg_response_time_ms=avg_response_time,
-                active_connections=self.active_connections
+                **self._live_counters()
             )
             
-            self.metrics_history.append(metrics)
+            self.metrics_series.append(now.timestamp(), [getattr(metrics, name) for name in SERIES_FIELDS])
         
+        self._snapshot = metrics
+        self._snapshot_taken_at = time.monotonic()
         return metrics
 
+    def _avg_response_time(self) -> float:
+        return self._response_time_sum / len(self.response_times) if self.response_times else 0.0
+
+    def _live_counters(self) -> Dict:
+        # Caller holds self._lock
+        if self.shared_metrics is not None:
+            pod = self.shared_metrics.aggregate()
+            return {
+                "request_count": pod["request_count"],
+                "error_count": pod["error_count"],
+                "avg_response_time_ms": pod["avg_response_time_ms"],
+                "active_connections": pod["active_connections"]
+            }
+        return {
+            "request_count": self.request_count,
+            "error_count": self.error_count,
+            "avg_response_time_ms": self._avg_response_time(),
+            "active_connections": self.active_connections
+        }
+
+    def get_snapshot(self, max_staleness_seconds: Optional[float] = None) -> PerformanceMetrics:
+        # Latest system sample merged with live request counters. A stale sample is
+        # refreshed in a worker thread; the caller never waits for it.
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.collect_metrics()
+        else:
+            max_age = self.max_staleness_seconds if max_staleness_seconds is None else max_staleness_seconds
+            if time.monotonic() - self._snapshot_taken_at > max_age:
+                self._refresh_in_background()
+        
+        with self._lock:
+            return replace(snapshot, **self._live_counters())
+
+    def get_snapshot_age_seconds(self) -> Optional[float]:
+        if self._snapshot is None:
+            return None
+        return time.monotonic() - self._snapshot_taken_at
+
+    def _refresh_in_background(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._refresh_snapshot, daemon=True).start()
+
+    def _refresh_snapshot(self):
+        try:
+            self.collect_metrics()
+            self.snapshot_refreshes += 1
+        except Exception as e:
+            logger.error(f"Error refreshing metrics snapshot: {e}")
+        finally:
+            self._refresh_lock.release()
+
     def _check_thresholds(self, metrics: PerformanceMetrics):
         if metrics.cpu_percent > self.cpu_threshold:
             self._create_alert(
@@ -179,23 +285,94 @@ class PerformanceMonitor:
                 self.alerts.append(alert)
                 logger.warning(f"Alert created: {message}")
 
-    def record_request(self, response_time_ms: float, is_error: bool = False):
+    def record_request(self, response_time_ms: float, is_error: bool = False, route: Optional[str] = None):
         with self._lock:
-            self.request_count += 1
-            if is_error:
-                self.error_count += 1
-            self.response_times.append(response_time_ms)
+            self._record_locked(response_time_ms, is_error, route)
+
+    def record_requests(self, samples: List[Tuple[float, bool, Optional[str]]], connections_delta: int = 0):
+        # Batched form of record_request for middleware: one lock round-trip per batch
+        with self._lock:
+            for response_time_ms, is_error, route in samples:
+                self._record_locked(response_time_ms, is_error, route)
+            if connections_delta:
+                self.active_connections = max(0, self.active_connections + connections_delta)
+                if self.shared_metrics is not None:
+                    self.shared_metrics.add_connections(connections_delta)
+
+    def _record_locked(self, response_time_ms: float, is_error: bool, route: Optional[str]):
+        self.request_count += 1
+        if is_error:
+            self.error_count += 1
+        self.latency_histogram.record(response_time_ms)
+        if route is not None:
+            self._record_endpoint(route, response_time_ms, is_error)
+        if len(self.response_times) == self.response_times.maxlen:
+            self._response_time_sum -= self.response_times[0]
+        self.response_times.append(response_time_ms)
+        self._response_time_sum += response_time_ms
+        if self.shared_metrics is not None:
+            self.shared_metrics.record_request(response_time_ms, is_error, route)
+
+    def _record_endpoint(self, route: str, response_time_ms: float, is_error: bool):
+        histogram = self.endpoint_histograms.get(route)
+        if histogram is None:
+            if len(self.endpoint_histograms) >= self.max_tracked_endpoints:
+                route = "OTHER"
+                histogram = self.endpoint_histograms.get(route)
+            if histogram is None:
+                histogram = self.endpoint_histograms[route] = LatencyHistogram()
+                self.endpoint_errors[route] = 0
+        histogram.record(response_time_ms)
+        if is_error:
+            self.endpoint_errors[route] += 1
+
+    def _latency_view(self) -> Tuple[LatencyHistogram, Dict[str, LatencyHistogram], Dict[str, int]]:
+        if self.shared_metrics is not None:
+            return self.shared_metrics.histograms()
+        with self._lock:
+            return (
+                self.latency_histogram.copy(),
+                {route: histogram.copy() for route, histogram in self.endpoint_histograms.items()},
+                dict(self.endpoint_errors)
+            )
+
+    def get_endpoint_latencies(self, sort_by: str = "p99") -> List[Dict]:
+        _, histograms, errors_by_route = self._latency_view()
+        endpoints = []
+        for route, histogram in histograms.items():
+            errors = errors_by_route.get(route, 0)
+            endpoints.append({
+                "route": route,
+                "errors": errors,
+                "error_rate": round(errors / histogram.count, 4) if histogram.count else 0.0,
+                **histogram.summary()
+            })
+        
+        endpoints.sort(key=lambda e: e.get(sort_by, 0), reverse=True)
+        return endpoints
+
+    def get_histograms(self) -> Dict[str, LatencyHistogram]:
+        return self._latency_view()[1]
+
+    def get_latency_summary(self) -> Dict:
+        return self._latency_view()[0].summary()
 
     def increment_connections(self):
         with self._lock:
             self.active_connections += 1
+            if self.shared_metrics is not None:
+                self.shared_metrics.add_connections(1)
 
     def decrement_connections(self):
         with self._lock:
+            if self.shared_metrics is not None and self.active_connections > 0:
+                self.shared_metrics.add_connections(-1)
             self.active_connections = max(0, self.active_connections - 1)
 
     def get_current_status(self) -> Dict:
-        metrics = self.collect_metrics()
+        metrics = self.get_snapshot()
+        snapshot_age = self.get_snapshot_age_seconds()
+        latency = self.get_latency_summary()
         
         with self._lock:
             unresolved_alerts = [a for a in self.alerts if not a.resolved]
@@ -204,6 +381,7 @@ class PerformanceMonitor:
             
             status = {
                 "timestamp": metrics.timestamp,
+                "snapshot_age_seconds": round(snapshot_age, 2) if snapshot_age is not None else None,
                 "status": "critical" if any(a.severity == "critical" for a in unresolved_alerts) else 
                          "warning" if unresolved_alerts else "healthy",
                 "metrics": {
@@ -218,6 +396,7 @@ class PerformanceMonitor:
                     "avg_response_time_ms": round(metrics.avg_response_time_ms, 2),
                     "active_connections": metrics.active_connections
                 },
+                "latency": latency,
                 "alerts": {
                     "total": len(unresolved_alerts),
                     "critical": sum(1 for a in unresolved_alerts if a.severity == "critical"),
@@ -230,25 +409,42 @@ class PerformanceMonitor:
                     "memory": self.memory_threshold,
                     "disk": self.disk_threshold,
                     "error_rate": self.error_rate_threshold,
-                    "response_time_ms": self.response_time_threshold_ms
+                    "response_time_ms": self.response_time_threshold_ms,
+                    "event_loop_lag_ms": self.loop_monitor.stall_threshold_ms
                 }
             }
         
+        status["endpoints"] = self.get_endpoint_latencies()
+        status["event_loop"] = self.loop_monitor.get_stats(recent=1)
+        if self.shared_metrics is not None:
+            status["workers"] = self.shared_metrics.aggregate()["workers"]
         return status
 
-    def get_metrics_history(self, minutes: Optional[int] = None) -> List[Dict]:
+    def get_metrics_history(self, minutes: Optional[int] = None, resolution=None) -> List[Dict]:
+        # resolution: None for raw samples, or "1m" / "5m" / "1h" (or seconds) for rollups
         if minutes is None:
             minutes = self.metrics_retention_minutes
         
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
+        cutoff = time.time() - minutes * 60
+        
+        if resolution is not None:
+            seconds = parse_resolution(resolution)
+            with self._lock:
+                buckets = self.metrics_series.rollup(seconds, start=cutoff)
+            for bucket in buckets:
+                bucket["timestamp"] = datetime.fromtimestamp(bucket["timestamp"]).isoformat()
+            return buckets
         
         with self._lock:
-            filtered_metrics = [
-                asdict(m) for m in self.metrics_history
-                if datetime.fromisoformat(m.timestamp) >= cutoff_time
-            ]
+            timestamps, values = self.metrics_series.range(start=cutoff)
         
-        return filtered_metrics
+        history = []
+        for ts, row in zip(timestamps.tolist(), values.tolist()):
+            sample = {"timestamp": datetime.fromtimestamp(ts).isoformat()}
+            for name, value in zip(SERIES_FIELDS, row):
+                sample[name] = int(value) if name in INTEGER_FIELDS else value
+            history.append(sample)
+        return history
 
     def get_all_alerts(self, include_resolved: bool = False) -> List[Dict]:
         with self._lock:
@@ -269,10 +465,16 @@ class PerformanceMonitor:
             self.request_count = 0
             self.error_count = 0
             self.response_times.clear()
+            self._response_time_sum = 0.0
+            self.latency_histogram.reset()
+            self.endpoint_histograms.clear()
+            self.endpoint_errors.clear()
+        if self.shared_metrics is not None:
+            self.shared_metrics.reset()
         logger.info("Performance counters reset")
 
     def get_scaling_recommendation(self) -> Dict:
-        metrics = self.collect_metrics()
+        metrics = self.get_snapshot()
         
         should_scale_up = (
             metrics.cpu_percent > 70 or 
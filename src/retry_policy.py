@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Retry Policy Module
+Exponential backoff with full jitter and a per-dependency retry budget that caps
+retries at a fraction of the requests seen over a sliding window
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+def full_jitter_delay(attempt: int, base_seconds: float, cap_seconds: float,
+                      rng: Callable[[], float] = random.random) -> float:
+    """
+    Delay before retry number `attempt` (1-based): uniform in [0, min(cap, base * 2^(attempt-1))]
+
+    Args:
+        attempt: Retry number, 1 for the first retry
+        base_seconds: Upper bound of the first delay
+        cap_seconds: Upper bound of any delay
+        rng: Source of uniform [0, 1) values
+    """
+    ceiling = min(cap_seconds, base_seconds * (2 ** (attempt - 1)))
+    return ceiling * rng()
+
+
+class RetryBudget:
+    """
+    Retries allowed while retries <= ratio * requests + min_retries_per_second * window
+    over the last window_seconds. A dependency that fails every call therefore sees at
+    most ~ratio extra load instead of max_retry_attempts times the load.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0,
+                 window_seconds: int = 10, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ratio: Retries allowed per request in the window
+            min_retries_per_second: Retry allowance independent of traffic, so rarely
+                called dependencies can still retry
+            window_seconds: Sliding window length, kept as one bucket per second
+            clock: Monotonic time source
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window_seconds = window_seconds
+        self.clock = clock
+
+        self.requests_total = 0
+        self.retries_total = 0
+        self.budget_exhausted_total = 0
+        self.deadline_exceeded_total = 0
+
+        # [second, requests, retries], oldest first
+        self._buckets: deque = deque()
+        self._requests = 0
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def _current(self) -> list:
+        second = int(self.clock())
+        horizon = second - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= horizon:
+            _, requests, retries = self._buckets.popleft()
+            self._requests -= requests
+            self._retries -= retries
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def record_request(self):
+        with self._lock:
+            self._current()[1] += 1
+            self._requests += 1
+            self.requests_total += 1
+
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget; False (and counted) when it is spent"""
+        with self._lock:
+            bucket = self._current()
+            allowance = self.ratio * self._requests + self.min_retries_per_second * self.window_seconds
+            if self._retries + 1 > allowance:
+                self.budget_exhausted_total += 1
+                return False
+            bucket[2] += 1
+            self._retries += 1
+            self.retries_total += 1
+            return True
+
+    def record_deadline_exceeded(self):
+        with self._lock:
+            self.deadline_exceeded_total += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._current()
+            return {
+                "window_requests": self._requests,
+                "window_retries": self._retries,
+                "requests_total": self.requests_total,
+                "retries_total": self.retries_total,
+                "budget_exhausted_total": self.budget_exhausted_total,
+                "deadline_exceeded_total": self.deadline_exceeded_total
+            }
+
+
+def retry_fits_deadline(deadline: Optional[float], delay: float, expected_attempt_seconds: float,
+                        now: Optional[float] = None) -> bool:
+    """Whether a retry started after `delay` is expected to finish before `deadline` (time.monotonic clock)"""
+    if deadline is None:
+        return True
+    now = time.monotonic() if now is None else now
+    return now + delay + expected_attempt_seconds <= deadline
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Route Optimizer Module
+Orders multi-stop routes from a fixed origin: exact Held-Karp dynamic
+programming for small stop counts, nearest-neighbour construction improved by
+2-opt and Or-opt moves within a time budget for larger ones
+"""
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from distance_matrix import DistanceMatrixService, get_distance_service
+
+HELD_KARP_MAX_STOPS = 12
+DEFAULT_TIME_BUDGET_MS = 50.0
+OR_OPT_MAX_SEGMENT = 3
+
+_EPSILON = 1e-9
+
+
+@dataclass
+class RouteOptimizationResult:
+    order: List[str]
+    method: str
+    distance_km: Optional[float] = None
+    original_distance_km: Optional[float] = None
+    unresolved: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def path_length(matrix: Sequence[Sequence[float]], path: Sequence[int]) -> float:
+    """Total length of an open path over matrix indices"""
+    return float(sum(matrix[a][b] for a, b in zip(path, path[1:])))
+
+
+def solve_open_path(matrix: np.ndarray,
+                    time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                    exact_max_stops: int = HELD_KARP_MAX_STOPS) -> Tuple[List[int], str]:
+    """
+    Find a short open path that starts at node 0 and visits every other node once
+
+    Args:
+        matrix: Symmetric (N, N) distance matrix, node 0 is the origin
+        time_budget_ms: Time allowed for heuristic improvement
+        exact_max_stops: Largest stop count (N - 1) solved exactly
+
+    Returns:
+        Tuple of (path as node indices starting with 0, method name)
+    """
+    stops = len(matrix) - 1
+    if stops <= 2:
+        if stops == 2 and matrix[0][2] + matrix[2][1] < matrix[0][1] + matrix[1][2] - _EPSILON:
+            return [0, 2, 1], "exact"
+        return list(range(stops + 1)), "exact"
+
+    if stops <= exact_max_stops:
+        return _held_karp(np.asarray(matrix, dtype=np.float64)), "held_karp"
+
+    deadline = time.perf_counter() + time_budget_ms / 1000.0
+    dist = np.asarray(matrix, dtype=np.float64).tolist()
+    path = _nearest_neighbour(dist)
+    _improve(dist, path, deadline)
+    return path, "nn_2opt_oropt"
+
+
+def _held_karp(matrix: np.ndarray) -> List[int]:
+    stops = len(matrix) - 1
+    full = 1 << stops
+    stop_dist = matrix[1:, 1:]
+
+    # cost[mask, j]: shortest path from the origin visiting `mask`, ending at stop j
+    cost = np.full((full, stops), np.inf)
+    parent = np.full((full, stops), -1, dtype=np.int16)
+    for j in range(stops):
+        cost[1 << j, j] = matrix[0, j + 1]
+
+    masks = np.arange(full)
+    popcount = np.zeros(full, dtype=np.int8)
+    for j in range(stops):
+        popcount += (masks >> j) & 1
+
+    # Extend all subsets of one size at once; targets within a layer never collide for a fixed j
+    for size in range(1, stops):
+        layer = masks[popcount == size]
+        for j in range(stops):
+            sources = layer[(layer >> j) & 1 == 0]
+            candidates = cost[sources] + stop_dist[:, j]
+            best_prev = candidates.argmin(axis=1)
+            cost[sources | (1 << j), j] = candidates[np.arange(len(sources)), best_prev]
+            parent[sources | (1 << j), j] = best_prev
+
+    mask = full - 1
+    last = int(cost[mask].argmin())
+    path = []
+    while last >= 0:
+        path.append(last + 1)
+        previous = int(parent[mask, last])
+        mask ^= 1 << last
+        last = previous
+    path.append(0)
+    path.reverse()
+    return path
+
+
+def _nearest_neighbour(dist: List[List[float]]) -> List[int]:
+    remaining = set(range(1, len(dist)))
+    path = [0]
+    while remaining:
+        row = dist[path[-1]]
+        nxt = min(remaining, key=row.__getitem__)
+        remaining.remove(nxt)
+        path.append(nxt)
+    return path
+
+
+def _improve(dist: List[List[float]], path: List[int], deadline: float):
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = _two_opt_pass(dist, path, deadline)
+        improved = _or_opt_pass(dist, path, deadline) or improved
+
+
+def _two_opt_pass(dist: List[List[float]], path: List[int], deadline: float) -> bool:
+    """Reverse path[i..j] when it shortens the path; the end of an open path is free"""
+    n = len(path)
+    improved = False
+    for i in range(1, n - 1):
+        if time.perf_counter() >= deadline:
+            break
+        a, b = path[i - 1], path[i]
+        d_ab = dist[a][b]
+        row_a = dist[a]
+        for j in range(i + 1, n):
+            c = path[j]
+            if j + 1 < n:
+                d = path[j + 1]
+                delta = row_a[c] + dist[b][d] - d_ab - dist[c][d]
+            else:
+                delta = row_a[c] - d_ab
+            if delta < -_EPSILON:
+                path[i:j + 1] = path[i:j + 1][::-1]
+                improved = True
+                b = path[i]
+                d_ab = dist[a][b]
+    return improved
+
+
+def _or_opt_pass(dist: List[List[float]], path: List[int], deadline: float) -> bool:
+    """Move segments of up to OR_OPT_MAX_SEGMENT stops, optionally reversed, to a cheaper position"""
+    improved = False
+    for length in range(1, OR_OPT_MAX_SEGMENT + 1):
+        i = 1
+        while i + length <= len(path):
+            if time.perf_counter() >= deadline:
+                return improved
+            first, last = path[i], path[i + length - 1]
+            prev = path[i - 1]
+            nxt = path[i + length] if i + length < len(path) else None
+
+            removal_gain = dist[prev][first]
+            if nxt is not None:
+                removal_gain += dist[last][nxt] - dist[prev][nxt]
+
+            rest = path[:i] + path[i + length:]
+            best_delta, best_pos, best_reversed = -_EPSILON, None, False
+            for pos in range(len(rest)):
+                if pos == i - 1:
+                    continue
+                p = rest[pos]
+                q = rest[pos + 1] if pos + 1 < len(rest) else None
+                base = -dist[p][q] if q is not None else 0.0
+                forward = dist[p][first] + (dist[last][q] if q is not None else 0.0) + base
+                backward = dist[p][last] + (dist[first][q] if q is not None else 0.0) + base
+                for delta, rev in ((forward - removal_gain, False), (backward - removal_gain, True)):
+                    if delta < best_delta:
+                        best_delta, best_pos, best_reversed = delta, pos, rev
+
+            if best_pos is None:
+                i += 1
+                continue
+
+            segment = path[i:i + length]
+            if best_reversed:
+                segment.reverse()
+            path[:] = rest[:best_pos + 1] + segment + rest[best_pos + 1:]
+            improved = True
+    return improved
+
+
+def optimize_route(origin: str,
+                   destinations: Sequence[str],
+                   time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                   distance_service: Optional[DistanceMatrixService] = None) -> RouteOptimizationResult:
+    """
+    Reorder destinations to minimize the total distance travelled from origin
+
+    Destinations that cannot be located keep their relative order and are
+    visited after the optimized stops. If the origin cannot be located the
+    order is returned unchanged.
+
+    Args:
+        origin: Starting point
+        destinations: Stops to visit
+        time_budget_ms: Time allowed for heuristic improvement on large inputs
+        distance_service: Distance matrix provider (defaults to the shared service)
+
+    Returns:
+        RouteOptimizationResult with the new order and distances over located stops
+    """
+    started = time.perf_counter()
+    service = distance_service or get_distance_service()
+
+    origin_place = service.gazetteer.find(origin)
+    places = service.resolve(destinations)
+    located = [i for i, place in enumerate(places) if place is not None]
+    unresolved = [destinations[i] for i, place in enumerate(places) if place is None]
+
+    if origin_place is None or len(located) < 2:
+        return RouteOptimizationResult(
+            order=list(destinations),
+            method="unchanged",
+            unresolved=list(destinations) if origin_place is None else unresolved,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+
+    points = [(origin_place.lat, origin_place.lon)] + [(places[i].lat, places[i].lon) for i in located]
+    matrix = service.matrix_for_points(points)
+
+    remaining_ms = max(0.0, time_budget_ms - (time.perf_counter() - started) * 1000)
+    path, method = solve_open_path(matrix, remaining_ms)
+
+    return RouteOptimizationResult(
+        order=[destinations[located[node - 1]] for node in path[1:]] + unresolved,
+        method=method,
+        distance_km=round(path_length(matrix, path), 3),
+        original_distance_km=round(path_length(matrix, range(len(points))), 3),
+        unresolved=unresolved,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Shared Metrics Module
+Memory-mapped counter and latency-histogram segment shared by all uvicorn workers
+of a pod. Each worker owns one slot and is its only writer, so recording needs no
+cross-process lock; readers sum every slot to see the whole pod. A file lock is
+taken only to claim a slot or register a new route name.
+
+Enable by pointing AI_NAVIGATOR_SHARED_METRICS at a file, ideally on tmpfs
+(e.g. /dev/shm/ai-navigator-metrics).
+"""
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from latency_histogram import LatencyHistogram
+
+try:
+    import fcntl
+except ImportError:  # Windows: shared metrics are unavailable, workers report locally
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "AI_NAVIGATOR_SHARED_METRICS"
+
+MAGIC = 0x4149_4E41_564D_4554  # "AINAVMET"
+VERSION = 1
+
+# Header fields (int64)
+H_MAGIC, H_VERSION, H_GENERATION, H_WORKERS, H_ROUTES, H_BUCKETS, H_REPLICAS, H_ROUTE_COUNT = range(8)
+HEADER_FIELDS = 8
+ROUTE_NAME_BYTES = 128
+
+# Slot fields (int64 unless noted); slot 0 accumulates the totals of exited workers
+S_PID, S_REQUESTS, S_ERRORS, S_ACTIVE, S_EXCEPTIONS, S_EWMA_MS = range(6)
+SLOT_FIELDS = 16
+RETIRED_SLOT = 0
+
+# Histogram block fields, followed by the bucket counts
+B_COUNT, B_ERRORS, B_SUM_US, B_MAX_US = range(4)
+BLOCK_FIELDS = 8
+
+OTHER_ROUTE = "OTHER"
+EWMA_ALPHA = 2 / (100 + 1)  # comparable to the 100-request window kept per worker
+
+
+class SharedMetrics:
+    """Per-worker slots of request counters and latency histograms in one mmap'd file"""
+
+    def __init__(self, path: str, max_workers: int = 16, max_routes: int = 64):
+        """
+        Args:
+            path: Segment file shared by the workers
+            max_workers: Worker slots (exited workers' slots are folded and reused)
+            max_routes: Distinct route templates tracked; later ones count as OTHER
+        """
+        if fcntl is None:
+            raise RuntimeError("Shared metrics require fcntl (POSIX)")
+
+        self.path = path
+        self.max_workers = max_workers
+        self.max_routes = max_routes
+        self._template = LatencyHistogram()
+        self.buckets = len(self._template.counts)
+
+        self._block_size = BLOCK_FIELDS + self.buckets
+        self._slot_size = SLOT_FIELDS + (1 + max_routes) * self._block_size
+        self._routes_offset = HEADER_FIELDS * 8
+        self._slots_offset = self._routes_offset + max_routes * ROUTE_NAME_BYTES
+        self._size = self._slots_offset + (max_workers + 1) * self._slot_size * 8
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._file_lock():
+            if os.fstat(self._fd).st_size != self._size or not self._header_matches():
+                self._initialize()
+        self._mm = mmap.mmap(self._fd, self._size)
+        self._header = np.frombuffer(self._mm, dtype=np.int64, count=HEADER_FIELDS)
+        self._slots = np.frombuffer(self._mm, dtype=np.int64, offset=self._slots_offset,
+                                    count=(max_workers + 1) * self._slot_size).reshape(max_workers + 1, self._slot_size)
+        self._slot_floats = self._slots.view(np.float64)
+
+        self._route_index: Dict[str, int] = {}
+        self._pid = 0
+        self._slot: Optional[np.ndarray] = None
+        self._slot_floats_row: Optional[np.ndarray] = None
+        self._attach()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional["SharedMetrics"]:
+        """Open the segment named by $AI_NAVIGATOR_SHARED_METRICS, or None if unset or unsupported"""
+        path = os.getenv(ENV_VAR)
+        if not path:
+            return None
+        try:
+            return cls(path, **kwargs)
+        except Exception as e:
+            logger.warning(f"Shared metrics disabled, falling back to per-worker metrics: {e}")
+            return None
+
+    @contextmanager
+    def _file_lock(self):
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _generation(self) -> int:
+        # Workers of one uvicorn run share the supervisor as parent
+        return os.getppid()
+
+    def _header_matches(self) -> bool:
+        header = np.frombuffer(os.pread(self._fd, HEADER_FIELDS * 8, 0), dtype=np.int64)
+        if len(header) < HEADER_FIELDS:
+            return False
+        layout = (header[H_MAGIC], header[H_VERSION], header[H_WORKERS], header[H_ROUTES], header[H_BUCKETS])
+        if layout != (MAGIC, VERSION, self.max_workers, self.max_routes, self.buckets):
+            return False
+        generation = int(header[H_GENERATION])
+        return generation == self._generation() or _pid_alive(generation)
+
+    def _initialize(self):
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, self._size)
+        header = np.zeros(HEADER_FIELDS, dtype=np.int64)
+        header[[H_MAGIC, H_VERSION, H_GENERATION, H_WORKERS, H_ROUTES, H_BUCKETS]] = (
+            MAGIC, VERSION, self._generation(), self.max_workers, self.max_routes, self.buckets
+        )
+        os.pwrite(self._fd, header.tobytes(), 0)
+        logger.info(f"Initialized shared metrics segment {self.path} ({self._size // 1024} KiB)")
+
+    def _attach(self):
+        """Claim a slot for this process, folding the slot of an exited worker into the retired totals"""
+        pid = os.getpid()
+        with self._file_lock():
+            pids = self._slots[1:, S_PID]
+            own = np.flatnonzero(pids == pid)
+            if len(own):
+                index = int(own[0]) + 1
+            else:
+                index = next((i + 1 for i, p in enumerate(pids) if p == 0 or not _pid_alive(int(p))), None)
+                if index is None:
+                    raise RuntimeError(f"No free shared metrics slot among {self.max_workers}")
+                self._retire(index)
+                self._slots[index, S_PID] = pid
+
+        self._pid = pid
+        self._slot = self._slots[index]
+        self._slot_floats_row = self._slot_floats[index]
+
+    def _retire(self, index: int):
+        slot = self._slots[index]
+        if slot[S_PID] != 0:
+            retired = self._slots[RETIRED_SLOT]
+            retired[S_REQUESTS] += slot[S_REQUESTS]
+            retired[S_ERRORS] += slot[S_ERRORS]
+            retired[S_EXCEPTIONS] += slot[S_EXCEPTIONS]
+            blocks = slice(SLOT_FIELDS, None)
+            retired_blocks = retired[blocks].reshape(-1, self._block_size)
+            slot_blocks = slot[blocks].reshape(-1, self._block_size)
+            max_us = np.maximum(retired_blocks[:, B_MAX_US], slot_blocks[:, B_MAX_US])
+            retired_blocks += slot_blocks
+            retired_blocks[:, B_MAX_US] = max_us
+        slot[:] = 0
+
+    def _own_slot(self) -> np.ndarray:
+        if os.getpid() != self._pid:
+            self._attach()
+        return self._slot
+
+    def _block(self, slot: np.ndarray, block: int) -> np.ndarray:
+        start = SLOT_FIELDS + block * self._block_size
+        return slot[start:start + self._block_size]
+
+    def _read_routes(self):
+        count = int(self._header[H_ROUTE_COUNT])
+        for i in range(len(self._route_index), count):
+            start = self._routes_offset + i * ROUTE_NAME_BYTES
+            raw = self._mm[start:start + ROUTE_NAME_BYTES].rstrip(b"\0")
+            self._route_index.setdefault(raw.decode("utf-8", "replace"), i)
+
+    def _route_block(self, route: str) -> int:
+        """Block index for a route; block 0 is the overall histogram"""
+        index = self._route_index.get(route)
+        if index is None:
+            self._read_routes()
+            index = self._route_index.get(route)
+        if index is None:
+            with self._file_lock():
+                self._read_routes()
+                index = self._route_index.get(route)
+                count = int(self._header[H_ROUTE_COUNT])
+                if index is None and count < self.max_routes - 1:
+                    index = self._register_route(route, count)
+            if index is None:
+                return self._route_block(OTHER_ROUTE) if route != OTHER_ROUTE else self._register_other()
+        return index + 1
+
+    def _register_route(self, route: str, position: int) -> int:
+        encoded = route.encode("utf-8")[:ROUTE_NAME_BYTES]
+        start = self._routes_offset + position * ROUTE_NAME_BYTES
+        self._mm[start:start + ROUTE_NAME_BYTES] = encoded.ljust(ROUTE_NAME_BYTES, b"\0")
+        self._header[H_ROUTE_COUNT] = position + 1
+        self._route_index[route] = position
+        return position
+
+    def _register_other(self) -> int:
+        with self._file_lock():
+            self._read_routes()
+            index = self._route_index.get(OTHER_ROUTE)
+            if index is None:
+                index = self._register_route(OTHER_ROUTE, int(self._header[H_ROUTE_COUNT]))
+        return index + 1
+
+    def record_request(self, response_time_ms: float, is_error: bool = False, route: Optional[str] = None):
+        slot = self._own_slot()
+        bucket, value_us = self._template.bucket_for(response_time_ms)
+
+        slot[S_REQUESTS] += 1
+        if is_error:
+            slot[S_ERRORS] += 1
+        floats = self._slot_floats_row
+        floats[S_EWMA_MS] = response_time_ms if slot[S_REQUESTS] == 1 else \
+            floats[S_EWMA_MS] + EWMA_ALPHA * (response_time_ms - floats[S_EWMA_MS])
+
+        blocks = (0,) if route is None else (0, self._route_block(route))
+        for block_index in blocks:
+            block = self._block(slot, block_index)
+            block[B_COUNT] += 1
+            block[B_SUM_US] += value_us
+            if value_us > block[B_MAX_US]:
+                block[B_MAX_US] = value_us
+            if is_error:
+                block[B_ERRORS] += 1
+            block[BLOCK_FIELDS + bucket] += 1
+
+    def add_connections(self, delta: int):
+        self._own_slot()[S_ACTIVE] += delta
+
+    def increment_exceptions(self, count: int = 1):
+        self._own_slot()[S_EXCEPTIONS] += count
+
+    @property
+    def replicas(self) -> int:
+        return int(self._header[H_REPLICAS])
+
+    @replicas.setter
+    def replicas(self, value: int):
+        self._header[H_REPLICAS] = value
+
+    def _live_slots(self) -> np.ndarray:
+        pids = self._slots[1:, S_PID]
+        return np.array([i + 1 for i, p in enumerate(pids) if p and _pid_alive(int(p))], dtype=np.intp)
+
+    def aggregate(self) -> Dict:
+        """Pod-wide counters summed over every worker slot, including exited workers"""
+        totals = self._slots[:, :SLOT_FIELDS].sum(axis=0)
+        live = self._live_slots()
+
+        ewma = self._slot_floats[live, S_EWMA_MS] if len(live) else np.zeros(0)
+        weights = self._slots[live, S_REQUESTS].astype(np.float64) if len(live) else np.zeros(0)
+        avg_ms = float(np.average(ewma, weights=weights)) if weights.sum() > 0 else 0.0
+
+        return {
+            "request_count": int(totals[S_REQUESTS]),
+            "error_count": int(totals[S_ERRORS]),
+            "exception_count": int(totals[S_EXCEPTIONS]),
+            "active_connections": int(max(0, self._slots[live, S_ACTIVE].sum())) if len(live) else 0,
+            "avg_response_time_ms": avg_ms,
+            "workers": len(live)
+        }
+
+    def histograms(self) -> Tuple[LatencyHistogram, Dict[str, LatencyHistogram], Dict[str, int]]:
+        """Pod-wide overall and per-route histograms, plus per-route error counts"""
+        self._read_routes()
+        blocks = self._slots[:, SLOT_FIELDS:].reshape(self.max_workers + 1, -1, self._block_size)
+        summed = blocks.sum(axis=0)
+        max_us = blocks[:, :, B_MAX_US].max(axis=0)
+
+        def build(block_index: int) -> LatencyHistogram:
+            return LatencyHistogram.from_counts(summed[block_index, BLOCK_FIELDS:],
+                                                summed[block_index, B_SUM_US],
+                                                max_us[block_index])
+
+        routes: Dict[str, LatencyHistogram] = {}
+        errors: Dict[str, int] = {}
+        for route, index in self._route_index.items():
+            if summed[index + 1, B_COUNT]:
+                routes[route] = build(index + 1)
+                errors[route] = int(summed[index + 1, B_ERRORS])
+        return build(0), routes, errors
+
+    def reset(self):
+        """Zero every counter and histogram (route names are kept)"""
+        with self._file_lock():
+            self._slots[:, [S_REQUESTS, S_ERRORS, S_EXCEPTIONS]] = 0
+            self._slot_floats[:, S_EWMA_MS] = 0.0
+            self._slots[:, SLOT_FIELDS:] = 0
+
+    def close(self):
+        self._header = self._slots = self._slot_floats = None
+        self._slot = self._slot_floats_row = None
+        self._mm.close()
+        os.close(self._fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
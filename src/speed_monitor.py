@@ -3,14 +3,49 @@
 Speed Monitor Module
 Provides speed monitoring and overspeed alert functionality for navigation
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 from datetime import datetime
+from city_index import freeze
+from destination_store import DestinationStore, get_destination_store
+
+
+CITY_SPEED_LIMITS = freeze({
+    "北京": {
+        "环路": 80,
+        "快速路": 80,
+        "普通道路": 60,
+        "高速公路": 120
+    },
+    "上海": {
+        "高架路": 80,
+        "快速路": 80,
+        "普通道路": 60,
+        "高速公路": 120
+    },
+    "广州": {
+        "快速路": 80,
+        "普通道路": 60,
+        "高速公路": 120
+    },
+    "深圳": {
+        "快速路": 80,
+        "普通道路": 60,
+        "高速公路": 120
+    }
+})
+
+DEFAULT_CITY_SPEED_LIMITS = freeze({
+    "普通道路": 60,
+    "快速路": 80,
+    "高速公路": 120
+})
 
 
 class SpeedMonitor:
     """Handle speed monitoring and overspeed alerts during navigation"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[DestinationStore] = None):
+        self.store = store or get_destination_store()
         self.speed_limits = {
             "城市道路": 60,
             "城市快速路": 80,
@@ -150,7 +185,7 @@ class SpeedMonitor:
         
         return speed_info
     
-    def get_speed_limit_by_city(self, city: str) -> Dict[str, int]:
+    def get_speed_limit_by_city(self, city: str) -> Mapping[str, int]:
         """
         Get speed limits for different road types in a specific city
         
@@ -158,42 +193,10 @@ class SpeedMonitor:
             city: City name
             
         Returns:
-            Dictionary of road types and their speed limits
+            Read-only mapping of road types and their speed limits
         """
-        city_limits = {
-            "北京": {
-                "环路": 80,
-                "快速路": 80,
-                "普通道路": 60,
-                "高速公路": 120
-            },
-            "上海": {
-                "高架路": 80,
-                "快速路": 80,
-                "普通道路": 60,
-                "高速公路": 120
-            },
-            "广州": {
-                "快速路": 80,
-                "普通道路": 60,
-                "高速公路": 120
-            },
-            "深圳": {
-                "快速路": 80,
-                "普通道路": 60,
-                "高速公路": 120
-            }
-        }
-        
-        for city_name, limits in city_limits.items():
-            if city_name in city or city in city_name:
-                return limits
-        
-        return {
-            "普通道路": 60,
-            "快速路": 80,
-            "高速公路": 120
-        }
+        limits = self.store.lookup("speed_limits", city, CITY_SPEED_LIMITS)
+        return limits if limits is not None else DEFAULT_CITY_SPEED_LIMITS
     
     def create_speed_reminder_message(self, origin: str, destination: str, 
                                      route_type: str = "driving") -> str:
@@ -6,7 +6,7 @@ import requests
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from typing import Dict, List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
@@ -35,6 +35,7 @@ class SRENotifier:
     def __init__(self, config: Optional[NotificationConfig] = None):
         self.config = config or NotificationConfig()
         self.notification_history: List[NotificationRecord] = []
+        self.delivery_counts: Dict[Tuple[str, bool], int] = {}
         
         if not self.config.enabled:
             logger.warning("SRE Notifier is DISABLED. Notifications will not be sent.")
@@ -330,6 +331,8 @@ class SRENotifier:
         )
         
         self.notification_history.append(record)
+        key = (channel, success)
+        self.delivery_counts[key] = self.delivery_counts.get(key, 0) + 1
 
     def get_notification_history(self, limit: int = 50) -> List[Dict]:
         return [asdict(record) for record in self.notification_history[-limit:]]
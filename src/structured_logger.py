@@ -1,62 +1,305 @@
 #!/usr/bin/env python3
+import atexit
 import logging
 import json
+import queue
+import random
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional, TextIO
 
 class StructuredLogger:
-    def __init__(self, name: str, log_level: str = "INFO", json_format: bool = True):
+    def __init__(self, name: str, log_level: str = "INFO", json_format: bool = True,
+                 async_mode: bool = False,
+                 max_queue: int = 10000,
+                 batch_size: int = 256,
+                 flush_interval_seconds: float = 0.5,
+                 overflow: Literal["drop", "block"] = "drop",
+                 block_timeout_seconds: float = 0.05,
+                 stream: Optional[TextIO] = None,
+                 sample_rate: float = 1.0,
+                 slow_threshold_ms: Optional[float] = None,
+                 rate_limit_per_second: float = 0.0,
+                 rate_limit_burst: int = 10,
+                 max_rate_limit_keys: int = 1000,
+                 suppression_report_interval_seconds: float = 60.0):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, log_level.upper()))
         self.json_format = json_format
-        
-        if not self.logger.handlers:
-            handler = logging.StreamHandler(sys.stdout)
+        self.service = "ai-navigator"
+
+        # In async mode records are queued as tuples on the calling thread and
+        # serialized and written in batches by a background thread
+        self.async_mode = async_mode
+        self.overflow = overflow
+        self.block_timeout_seconds = block_timeout_seconds
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.stream = stream or sys.stdout
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Request records (those with response_time_ms) below WARNING that are neither
+        # errors nor slow are kept with probability sample_rate. Every other record that
+        # is neither an error nor slow is then subject to a token bucket per key
+        # (log_key=..., or the message); the max_rate_limit_keys most recently used
+        # buckets are kept. Both checks run before any serialization; what they drop is
+        # reported periodically.
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.rate_limit_per_second = rate_limit_per_second
+        self.rate_limit_burst = rate_limit_burst
+        self.max_rate_limit_keys = max_rate_limit_keys
+        self.suppression_report_interval_seconds = suppression_report_interval_seconds
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self._filtering = sample_rate < 1.0 or rate_limit_per_second > 0
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._suppressed_sampled = 0
+        self._suppressed_by_key: Dict[str, int] = {}
+        self._suppression_lock = threading.Lock()
+        self._last_report = time.monotonic()
+
+        if async_mode:
+            self._writer = threading.Thread(target=self._write_loop, name=f"{name}-log-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+        elif not self.logger.handlers:
+            handler = logging.StreamHandler(self.stream)
             handler.setLevel(getattr(logging, log_level.upper()))
-            
+
             if json_format:
                 formatter = JSONFormatter()
             else:
                 formatter = logging.Formatter(
                     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
                 )
-            
+
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
-    
-    def _log(self, level: str, message: str, extra: Optional[Dict[str, Any]] = None):
-        log_func = getattr(self.logger, level.lower())
-        
+
+    def _log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        key = extra.pop("log_key", None) if extra else None
+        if self._filtering and not self._admit(level, key or message, extra):
+            return
+        self._emit(level, message, extra)
+
+    def _admit(self, level: int, key: str, extra: Optional[Dict[str, Any]]) -> bool:
+        now = time.monotonic()
+        if now - self._last_report >= self.suppression_report_interval_seconds:
+            self._report_suppressed(now)
+
+        if self._always_kept(level, extra):
+            return True
+
+        if self.sample_rate < 1.0 and extra and "response_time_ms" in extra and level < logging.WARNING \
+                and random.random() >= self.sample_rate:
+            with self._suppression_lock:
+                self.sampled_out += 1
+                self._suppressed_sampled += 1
+            return False
+
+        if self.rate_limit_per_second > 0 and not self._take_token(key, now):
+            return False
+        return True
+
+    def _always_kept(self, level: int, extra: Optional[Dict[str, Any]]) -> bool:
+        # Errors and slow requests are never sampled out or rate limited
+        if level >= logging.ERROR:
+            return True
+        if not extra:
+            return False
+        return extra.get("status") == "error" or (
+            self.slow_threshold_ms is not None and "response_time_ms" in extra
+            and extra["response_time_ms"] >= self.slow_threshold_ms)
+
+    def _take_token(self, key: str, now: float) -> bool:
+        with self._suppression_lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.rate_limit_burst), now]
+                if len(self._buckets) > self.max_rate_limit_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens = min(self.rate_limit_burst, bucket[0] + (now - bucket[1]) * self.rate_limit_per_second)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True
+
+            bucket[0] = tokens
+            self.rate_limited += 1
+            self._suppressed_by_key[key] = self._suppressed_by_key.get(key, 0) + 1
+            return False
+
+    def _report_suppressed(self, now: float, force: bool = False):
+        with self._suppression_lock:
+            if now - self._last_report < self.suppression_report_interval_seconds and not force:
+                return
+            interval = now - self._last_report
+            self._last_report = now
+            sampled, self._suppressed_sampled = self._suppressed_sampled, 0
+            by_key, self._suppressed_by_key = self._suppressed_by_key, {}
+
+        if sampled or by_key:
+            top = dict(sorted(by_key.items(), key=lambda item: item[1], reverse=True)[:10])
+            self._emit(logging.INFO, "Log records suppressed", {
+                "suppressed_sampled": sampled,
+                "suppressed_rate_limited": sum(by_key.values()),
+                "rate_limited_keys": top,
+                "interval_seconds": round(interval, 1)
+            })
+
+    def _emit(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None):
+        if self.async_mode:
+            self._enqueue((time.time(), level, message, extra))
+            return
+
         if self.json_format:
             log_data = {
                 "timestamp": datetime.now().isoformat(),
-                "level": level.upper(),
+                "level": logging.getLevelName(level),
                 "message": message,
-                "service": "ai-navigator"
+                "service": self.service
             }
-            
+
             if extra:
                 log_data.update(extra)
-            
-            log_func(json.dumps(log_data, ensure_ascii=False))
+
+            self.logger.log(level, json.dumps(log_data, ensure_ascii=False))
         else:
-            log_func(message, extra=extra or {})
-    
+            self.logger.log(level, message, extra=extra or {})
+
+    def _enqueue(self, record: tuple):
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            if self.overflow == "block":
+                self._queue.put(record, timeout=self.block_timeout_seconds)
+            else:
+                self._queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _format(self, record: tuple) -> str:
+        created, level, message, extra = record
+        timestamp = datetime.fromtimestamp(created).isoformat()
+        if not self.json_format:
+            return f"{timestamp} - {self.logger.name} - {logging.getLevelName(level)} - {message}"
+
+        log_data = {
+            "timestamp": timestamp,
+            "level": logging.getLevelName(level),
+            "logger": self.logger.name,
+            "message": message,
+            "service": self.service
+        }
+        if extra:
+            log_data.update(extra)
+        return json.dumps(log_data, ensure_ascii=False, default=str)
+
+    def _write_loop(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval_seconds)
+            except queue.Empty:
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            lines = []
+            for item in batch:
+                if item is None:
+                    continue
+                try:
+                    lines.append(self._format(item))
+                except Exception as e:
+                    lines.append(json.dumps({"level": "ERROR", "message": f"Unserializable log record: {e}",
+                                             "service": self.service}))
+
+            try:
+                if lines:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                    self.written += len(lines)
+                    self.batches += 1
+            except Exception:
+                self.dropped += len(lines)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if stop:
+                break
+
+    def flush(self):
+        # Block until every queued record has been written
+        if self.async_mode and self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: float = 2.0):
+        if self._closed:
+            return
+        if self._filtering:
+            self._report_suppressed(time.monotonic(), force=True)
+        self._closed = True
+        if not self.async_mode:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer.join(timeout=timeout)
+
+    def get_stats(self) -> Dict:
+        return {
+            "async_mode": self.async_mode,
+            "overflow": self.overflow,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited
+        }
+
     def info(self, message: str, **kwargs):
-        self._log("info", message, kwargs)
-    
+        self._log(logging.INFO, message, kwargs)
+
     def warning(self, message: str, **kwargs):
-        self._log("warning", message, kwargs)
-    
+        self._log(logging.WARNING, message, kwargs)
+
     def error(self, message: str, **kwargs):
-        self._log("error", message, kwargs)
-    
+        self._log(logging.ERROR, message, kwargs)
+
     def critical(self, message: str, **kwargs):
-        self._log("critical", message, kwargs)
-    
+        self._log(logging.CRITICAL, message, kwargs)
+
     def debug(self, message: str, **kwargs):
-        self._log("debug", message, kwargs)
+        self._log(logging.DEBUG, message, kwargs)
 
 class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -69,11 +312,11 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno
         }
-        
+
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
-        
+
         if hasattr(record, 'extra'):
             log_data.update(record.extra)
-        
+
         return json.dumps(log_data, ensure_ascii=False)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Time Series Module
+Fixed-size ring buffers of numeric samples keyed by epoch seconds, with binary-search
+range queries and automatic min/max/avg/p95 rollups at coarser resolutions
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (bucket width in seconds, buckets kept): 1 minute for a day, 5 minutes for a week,
+# 1 hour for 30 days
+DEFAULT_ROLLUPS = ((60, 1440), (300, 2016), (3600, 720))
+
+ROLLUP_STATS = ("min", "max", "avg", "p95")
+
+RESOLUTIONS = {"1m": 60, "5m": 300, "1h": 3600}
+
+
+class _Ring:
+    """Preallocated ring of (timestamp, row) pairs in timestamp order"""
+
+    def __init__(self, capacity: int, row_shape: Tuple[int, ...]):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.rows = np.zeros((capacity,) + row_shape, dtype=np.float64)
+        self.head = 0  # next write position
+        self.size = 0
+
+    def append(self, timestamp: float, row):
+        self.timestamps[self.head] = timestamp
+        self.rows[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Physical [start, stop) ranges in chronological order"""
+        if self.size < self.capacity:
+            return [(0, self.size)]
+        return [(self.head, self.capacity), (0, self.head)]
+
+    def range(self, start: float = -np.inf, end: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """Entries with start <= timestamp < end, oldest first"""
+        parts_ts, parts_rows = [], []
+        for lo, hi in self._segments():
+            segment = self.timestamps[lo:hi]
+            if hi == lo or segment[-1] < start or segment[0] >= end:
+                continue
+            i = lo + int(np.searchsorted(segment, start, side="left"))
+            j = lo + int(np.searchsorted(segment, end, side="left"))
+            parts_ts.append(self.timestamps[i:j])
+            parts_rows.append(self.rows[i:j])
+        if not parts_ts:
+            return np.zeros(0), np.zeros((0,) + self.rows.shape[1:])
+        if len(parts_ts) == 1:
+            return parts_ts[0].copy(), parts_rows[0].copy()
+        return np.concatenate(parts_ts), np.concatenate(parts_rows)
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+
+def _summarize(values: np.ndarray) -> np.ndarray:
+    """(samples, fields) -> (fields, len(ROLLUP_STATS))"""
+    return np.stack([
+        values.min(axis=0),
+        values.max(axis=0),
+        values.mean(axis=0),
+        np.percentile(values, 95, axis=0)
+    ], axis=-1)
+
+
+def _combine(rows: np.ndarray) -> np.ndarray:
+    """Merge finer buckets (buckets, fields, stats); p95 becomes the largest child p95, an upper bound"""
+    return np.stack([
+        rows[:, :, 0].min(axis=0),
+        rows[:, :, 1].max(axis=0),
+        rows[:, :, 2].mean(axis=0),
+        rows[:, :, 3].max(axis=0)
+    ], axis=-1)
+
+
+class TimeSeries:
+    """
+    Raw samples plus rollups of named numeric fields
+
+    Timestamps are epoch seconds and never go backwards: a sample older than the
+    previous one is recorded at the previous timestamp. Memory is fixed by the
+    capacities, whatever the retention window. Not thread-safe; callers hold a lock.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int = 1000,
+                 rollups: Sequence[Tuple[int, int]] = DEFAULT_ROLLUPS):
+        """
+        Args:
+            fields: Names of the values in each sample
+            capacity: Raw samples kept
+            rollups: (bucket width in seconds, buckets kept) per rollup level
+        """
+        self.fields = tuple(fields)
+        self.raw = _Ring(capacity, (len(self.fields),))
+        self.rollups: Dict[int, _Ring] = {
+            width: _Ring(buckets, (len(self.fields), len(ROLLUP_STATS)))
+            for width, buckets in sorted(rollups)
+        }
+        # Start of the open bucket per level; its samples are read back from the raw ring
+        self._open_bucket: Dict[int, Optional[float]] = {width: None for width in self.rollups}
+        self._last_timestamp: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self.raw.size
+
+    def append(self, timestamp: float, values: Sequence[float]):
+        if self._last_timestamp is not None and timestamp < self._last_timestamp:
+            timestamp = self._last_timestamp
+        self._close_buckets(timestamp)
+        self.raw.append(timestamp, values)
+        self._last_timestamp = timestamp
+
+    def _close_buckets(self, timestamp: float):
+        for width, ring in self.rollups.items():
+            bucket = timestamp - timestamp % width
+            opened = self._open_bucket[width]
+            if opened is not None and bucket > opened:
+                summary = self._bucket_summary(opened, width)
+                if summary is not None:
+                    ring.append(opened, summary)
+            if opened is None or bucket > opened:
+                self._open_bucket[width] = bucket
+
+    def _bucket_summary(self, bucket_start: float, width: int) -> Optional[np.ndarray]:
+        _, values = self.raw.range(bucket_start, bucket_start + width)
+        oldest = self.raw.timestamps[self.raw.head] if self.raw.size == self.raw.capacity else -np.inf
+        finer = [w for w in self.rollups if w < width]
+        if oldest > bucket_start and finer:
+            # Raw samples no longer cover the bucket; build it from the next finer level
+            _, rows = self.rollups[finer[-1]].range(bucket_start, bucket_start + width)
+            if len(rows):
+                return _combine(rows)
+        return _summarize(values) if len(values) else None
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Raw (timestamps, values) with start <= timestamp < end"""
+        return self.raw.range(-np.inf if start is None else start, np.inf if end is None else end)
+
+    def samples(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict]:
+        timestamps, values = self.range(start, end)
+        return [
+            {"timestamp": float(ts), **dict(zip(self.fields, row.tolist()))}
+            for ts, row in zip(timestamps, values)
+        ]
+
+    def rollup(self, resolution: int, start: Optional[float] = None, end: Optional[float] = None,
+               include_open: bool = True) -> List[Dict]:
+        """
+        Buckets of one rollup level overlapping [start, end), oldest first
+
+        Args:
+            resolution: Bucket width in seconds, one of the configured levels
+            include_open: Also summarize the bucket still being filled
+
+        Returns:
+            [{"timestamp": bucket start, field: {"min", "max", "avg", "p95"}, ...}]
+        """
+        ring = self.rollups.get(resolution)
+        if ring is None:
+            raise ValueError(f"No rollup at {resolution}s; available: {sorted(self.rollups)}")
+
+        lo = -np.inf if start is None else start - start % resolution
+        hi = np.inf if end is None else end
+        timestamps, rows = ring.range(lo, hi)
+        buckets = list(zip(timestamps.tolist(), rows))
+
+        opened = self._open_bucket[resolution]
+        if include_open and opened is not None and lo <= opened < hi:
+            summary = self._bucket_summary(opened, resolution)
+            if summary is not None:
+                buckets.append((opened, summary))
+
+        return [
+            {"timestamp": ts, **{
+                name: dict(zip(ROLLUP_STATS, row[i].tolist())) for i, name in enumerate(self.fields)
+            }}
+            for ts, row in buckets
+        ]
+
+    def latest(self) -> Optional[Dict]:
+        if not self.raw.size:
+            return None
+        index = self.raw.head - 1
+        return {"timestamp": float(self.raw.timestamps[index]),
+                **dict(zip(self.fields, self.raw.rows[index].tolist()))}
+
+    def clear(self):
+        self.raw.clear()
+        for ring in self.rollups.values():
+            ring.clear()
+        self._open_bucket = {width: None for width in self.rollups}
+        self._last_timestamp = None
+
+
+def parse_resolution(value) -> int:
+    """"1m" / "5m" / "1h" or a number of seconds -> seconds"""
+    if isinstance(value, str) and value in RESOLUTIONS:
+        return RESOLUTIONS[value]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown resolution {value!r}; use one of {', '.join(RESOLUTIONS)}") from None
@@ -3,6 +3,8 @@ from typing import Dict, List, Optional, Literal
 from pydantic import BaseModel
 from datetime import datetime
 import re
+from destination_store import DestinationStore, get_destination_store
+from distance_matrix import DistanceMatrixService, get_distance_service
 
 
 class TransportationOption(BaseModel):
@@ -247,7 +249,12 @@ class TransportationRecommender:
         "very_long": (500, float('inf'))
     }
     
-    def __init__(self):
+    DEFAULT_DISTANCE_KM = 50
+    
+    def __init__(self, store: Optional[DestinationStore] = None,
+                 distance_service: Optional[DistanceMatrixService] = None):
+        self.store = store or get_destination_store()
+        self.distance_service = distance_service or get_distance_service()
         self.transportation_modes = self.TRANSPORTATION_MODES
         self.distance_ranges = self.DISTANCE_RANGES
     
@@ -305,21 +312,15 @@ class TransportationRecommender:
         )
     
     def _estimate_distance(self, origin: str, destination: str) -> float:
-        city_distances = {
-            ("北京", "上海"): 1200,
-            ("北京", "广州"): 2000,
-            ("上海", "杭州"): 170,
-            ("北京", "天津"): 120,
-            ("上海", "南京"): 300,
-            ("广州", "深圳"): 120,
-            ("成都", "重庆"): 300,
-        }
+        stored = self.store.get_distance(origin, destination)
+        if stored is not None:
+            return stored
         
-        for (city1, city2), distance in city_distances.items():
-            if (city1 in origin and city2 in destination) or (city2 in origin and city1 in destination):
-                return distance
+        road_distance = self.distance_service.road_distance_km(origin, destination)
+        if road_distance is not None:
+            return round(road_distance, 1)
         
-        return 50
+        return self.DEFAULT_DISTANCE_KM
     
     def _generate_recommendations(
         self,
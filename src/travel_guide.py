@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 import re
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Tuple
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
+from city_index import freeze
+from destination_store import DestinationStore, get_destination_store
 
 
 class Attraction(BaseModel):
@@ -42,6 +44,69 @@ class TravelGuide(BaseModel):
     best_season: str
 
 
+CITY_BASE_BUDGETS = freeze({
+    "北京": {"transport": 500, "hotel": 400, "food": 150, "ticket": 200},
+    "上海": {"transport": 500, "hotel": 450, "food": 180, "ticket": 150},
+    "杭州": {"transport": 400, "hotel": 350, "food": 140, "ticket": 120},
+    "成都": {"transport": 450, "hotel": 300, "food": 120, "ticket": 150},
+    "西安": {"transport": 400, "hotel": 280, "food": 100, "ticket": 180},
+})
+
+DEFAULT_BASE_BUDGET = freeze({"transport": 450, "hotel": 350, "food": 150, "ticket": 150})
+
+GENERAL_TRAVEL_TIPS = freeze([
+    "提前预订酒店和景点门票，可享受优惠",
+    "携带身份证件，部分景点需要实名制购票",
+    "关注天气预报，准备相应的衣物和雨具",
+    "下载离线地图，避免迷路",
+    "准备一些常用药品(感冒药、创可贴等)",
+    "尊重当地风俗习惯",
+])
+
+_CITY_SPECIFIC_TIPS = {
+    "北京": [
+        "故宫需要提前网上预约购票",
+        "地铁是最方便的交通工具",
+        "北京烤鸭、炸酱面等特色美食值得品尝",
+    ],
+    "上海": [
+        "可以购买上海公共交通卡方便出行",
+        "外滩夜景最佳观赏时间是晚上7-9点",
+        "小笼包、生煎包等本帮菜不容错过",
+    ],
+    "杭州": [
+        "西湖景区很大，建议租用自行车或乘坐观光车",
+        "龙井茶是杭州特产，可以品尝购买",
+        "杭帮菜清淡鲜美，西湖醋鱼是代表菜",
+    ],
+    "成都": [
+        "熊猫基地最好早上去，熊猫比较活跃",
+        "成都火锅、串串香必须尝试",
+        "市区交通拥堵，建议乘坐地铁",
+    ],
+    "西安": [
+        "兵马俑景区较远，建议参加一日游或包车",
+        "回民街美食众多，羊肉泡馍、肉夹馍必吃",
+        "古城墙可以租自行车骑行，体验更佳",
+    ],
+}
+
+CITY_TRAVEL_TIPS = freeze({
+    city: GENERAL_TRAVEL_TIPS + tuple(city_tips)
+    for city, city_tips in _CITY_SPECIFIC_TIPS.items()
+})
+
+BEST_SEASONS = freeze({
+    "北京": "春季(4-5月)和秋季(9-10月)，气候宜人，适合旅游",
+    "上海": "春季(3-5月)和秋季(9-11月)，温度适中，降雨较少",
+    "杭州": "春季(3-5月)和秋季(9-11月)，西湖景色最美",
+    "成都": "春季(3-5月)和秋季(9-11月)，气候舒适，适合游玩",
+    "西安": "春季(4-5月)和秋季(9-10月)，避开夏季高温和冬季严寒",
+})
+
+DEFAULT_BEST_SEASON = "春秋季节通常是最佳旅游时间"
+
+
 class TravelGuidePlanner:
     
     CITY_ATTRACTIONS = {
@@ -275,15 +340,21 @@ class TravelGuidePlanner:
         }
     }
     
-    def __init__(self):
+    def __init__(self, store: Optional[DestinationStore] = None):
+        self.store = store or get_destination_store()
         self.city_attractions = self.CITY_ATTRACTIONS
         self.travel_styles = self.TRAVEL_STYLES
     
     def get_attractions_for_city(self, city: str) -> List[Attraction]:
-        for city_name in self.city_attractions.keys():
-            if city_name in city or city in city_name:
-                return self.city_attractions[city_name]
-        return []
+        city_name = self.store.resolve(city)
+        if city_name is None:
+            return []
+        
+        stored = self.store.get("attractions", city_name)
+        if stored is not None:
+            return [Attraction(**attraction) for attraction in stored]
+        
+        return self.city_attractions.get(city_name, [])
     
     def create_itinerary(
         self,
@@ -357,22 +428,7 @@ class TravelGuidePlanner:
         style_config = self.travel_styles.get(travel_style, self.travel_styles["经典游"])
         multiplier = style_config["budget_multiplier"]
         
-        base_budget = {
-            "北京": {"transport": 500, "hotel": 400, "food": 150, "ticket": 200},
-            "上海": {"transport": 500, "hotel": 450, "food": 180, "ticket": 150},
-            "杭州": {"transport": 400, "hotel": 350, "food": 140, "ticket": 120},
-            "成都": {"transport": 450, "hotel": 300, "food": 120, "ticket": 150},
-            "西安": {"transport": 400, "hotel": 280, "food": 100, "ticket": 180},
-        }
-        
-        city_base = None
-        for city_name in base_budget.keys():
-            if city_name in destination or destination in city_name:
-                city_base = base_budget[city_name]
-                break
-        
-        if not city_base:
-            city_base = {"transport": 450, "hotel": 350, "food": 150, "ticket": 150}
+        city_base = self.store.lookup("budget", destination, CITY_BASE_BUDGETS) or DEFAULT_BASE_BUDGET
         
         transportation = city_base["transport"] * multiplier
         accommodation = city_base["hotel"] * duration_days * multiplier
@@ -391,66 +447,16 @@ class TravelGuidePlanner:
             total=round(total, 2)
         )
     
-    def _generate_travel_tips(self, destination: str) -> List[str]:
-        general_tips = [
-            "提前预订酒店和景点门票，可享受优惠",
-            "携带身份证件，部分景点需要实名制购票",
-            "关注天气预报，准备相应的衣物和雨具",
-            "下载离线地图，避免迷路",
-            "准备一些常用药品(感冒药、创可贴等)",
-            "尊重当地风俗习惯",
-        ]
-        
-        city_specific_tips = {
-            "北京": [
-                "故宫需要提前网上预约购票",
-                "地铁是最方便的交通工具",
-                "北京烤鸭、炸酱面等特色美食值得品尝",
-            ],
-            "上海": [
-                "可以购买上海公共交通卡方便出行",
-                "外滩夜景最佳观赏时间是晚上7-9点",
-                "小笼包、生煎包等本帮菜不容错过",
-            ],
-            "杭州": [
-                "西湖景区很大，建议租用自行车或乘坐观光车",
-                "龙井茶是杭州特产，可以品尝购买",
-                "杭帮菜清淡鲜美，西湖醋鱼是代表菜",
-            ],
-            "成都": [
-                "熊猫基地最好早上去，熊猫比较活跃",
-                "成都火锅、串串香必须尝试",
-                "市区交通拥堵，建议乘坐地铁",
-            ],
-            "西安": [
-                "兵马俑景区较远，建议参加一日游或包车",
-                "回民街美食众多，羊肉泡馍、肉夹馍必吃",
-                "古城墙可以租自行车骑行，体验更佳",
-            ],
-        }
+    def _generate_travel_tips(self, destination: str) -> Tuple[str, ...]:
+        city_name = self.store.resolve(destination)
+        stored = self.store.get("travel_tips", city_name) if city_name else None
+        if stored is not None:
+            return GENERAL_TRAVEL_TIPS + stored
         
-        tips = general_tips.copy()
-        for city_name, city_tips in city_specific_tips.items():
-            if city_name in destination or destination in city_name:
-                tips.extend(city_tips)
-                break
-        
-        return tips
+        return CITY_TRAVEL_TIPS.get(city_name, GENERAL_TRAVEL_TIPS)
     
     def _get_best_season(self, destination: str) -> str:
-        seasons = {
-            "北京": "春季(4-5月)和秋季(9-10月)，气候宜人，适合旅游",
-            "上海": "春季(3-5月)和秋季(9-11月)，温度适中，降雨较少",
-            "杭州": "春季(3-5月)和秋季(9-11月)，西湖景色最美",
-            "成都": "春季(3-5月)和秋季(9-11月)，气候舒适，适合游玩",
-            "西安": "春季(4-5月)和秋季(9-10月)，避开夏季高温和冬季严寒",
-        }
-        
-        for city_name, season in seasons.items():
-            if city_name in destination or destination in city_name:
-                return season
-        
-        return "春秋季节通常是最佳旅游时间"
+        return self.store.lookup("best_season", destination, BEST_SEASONS) or DEFAULT_BEST_SEASON
     
     def parse_travel_query(self, query: str) -> Dict:
         result = {
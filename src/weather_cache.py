@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Weather Cache Module
+Per-location weather cache with TTL, LRU eviction and stale-while-revalidate
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class WeatherCache:
+    """Bounded LRU cache for weather payloads with stale-while-revalidate support"""
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+
+    def __init__(self,
+                 ttl_seconds: float = 600.0,
+                 stale_ttl_seconds: float = 1800.0,
+                 max_entries: int = 256):
+        """
+        Args:
+            ttl_seconds: How long an entry is served as fresh
+            stale_ttl_seconds: How long after expiry an entry may still be served
+                while a background refresh runs
+            max_entries: Maximum number of locations kept before LRU eviction
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict]]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Dict], str]:
+        """
+        Look up a cached payload
+
+        Args:
+            key: Cache key (normalized location and language)
+
+        Returns:
+            Tuple of (payload or None, one of "fresh", "stale", "miss")
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, self.MISS
+
+            stored_at, value = entry
+            age = now - stored_at
+            if age <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, self.FRESH
+
+            if age <= self.ttl_seconds + self.stale_ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, self.STALE
+
+            del self._entries[key]
+            self.misses += 1
+            return None, self.MISS
+
+    def store(self, key: Hashable, value: Dict):
+        """Insert or replace a payload, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """
+        Claim the background refresh for a key
+
+        Returns:
+            True if the caller should perform the refresh, False if one is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key: Hashable, success: bool = True):
+        """Release a refresh claimed with begin_refresh"""
+        with self._lock:
+            self._refreshing.discard(key)
+            if not success:
+                self.refresh_failures += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "stale_ttl_seconds": self.stale_ttl_seconds,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "refreshes_in_flight": len(self._refreshing),
+                "evictions": self.evictions
+            }
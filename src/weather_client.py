@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Weather Client Module
+Asyncio-native HTTP client for the wttr.in weather upstream with pooled keep-alive connections
+"""
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import httpx
+
+
+class AsyncWeatherClient:
+    """Non-blocking wttr.in client sharing one keep-alive connection pool per event loop"""
+
+    def __init__(self,
+                 base_url: str = "https://wttr.in",
+                 timeout_seconds: float = 10.0,
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 10,
+                 keepalive_expiry_seconds: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            base_url: Weather service base URL
+            timeout_seconds: Default deadline for a single request
+            max_connections: Upper bound on concurrent upstream connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry_seconds: How long an idle connection is kept
+            transport: Optional custom httpx transport (e.g. a mock transport in tests)
+        """
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds
+        )
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: set = set()
+
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.clients_created = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._discard_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout_seconds,
+                transport=self.transport,
+                headers={"User-Agent": "ai-navigator/2.0"}
+            )
+            self._loop = loop
+            self.clients_created += 1
+        return self._client
+
+    def _discard_client(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        # Close the replaced pool on the loop that owns its connections when that loop is
+        # still running; otherwise close it from the current loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._close_quietly(client), loop)
+        else:
+            task = asyncio.get_running_loop().create_task(self._close_quietly(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_quietly(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+    async def fetch_weather_json(self, location: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Fetch the raw wttr.in JSON document for a location
+
+        Args:
+            location: Location name
+            timeout: Overall deadline in seconds for this request (defaults to timeout_seconds)
+
+        Returns:
+            Parsed JSON payload
+
+        Raises:
+            asyncio.TimeoutError: The deadline elapsed before a response arrived (httpx
+                timeouts are re-raised as asyncio.TimeoutError)
+            httpx.HTTPError: Transport failure or non-2xx response
+            ValueError: The response body was not valid JSON
+        """
+        deadline = timeout if timeout is not None else self.timeout_seconds
+        client = self._get_client()
+        self.requests += 1
+
+        try:
+            response = await asyncio.wait_for(
+                client.get(f"/{quote(location)}", params={"format": "j1", "lang": "zh"}, timeout=deadline),
+                timeout=deadline
+            )
+            response.raise_for_status()
+            return response.json()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except httpx.TimeoutException as e:
+            # httpx enforces the same deadline and usually fires first
+            self.timeouts += 1
+            raise asyncio.TimeoutError(str(e)) from e
+        except Exception:
+            self.failures += 1
+            raise
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "clients_created": self.clients_created,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections
+        }
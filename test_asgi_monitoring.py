@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the ASGI monitoring middleware
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from asgi_monitoring import MonitoringMiddleware
+from performance_monitor import PerformanceMonitor
+
+
+def make_app(**kwargs):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    monitor = PerformanceMonitor()
+    access, errors = [], []
+    app.add_middleware(MonitoringMiddleware, perf_monitor=monitor,
+                       access_log=access.append,
+                       error_log=lambda method, path, e: errors.append((method, path, str(e))),
+                       **kwargs)
+    return app, monitor, access, errors
+
+
+def test_batched_accounting():
+    print("\n=== 测试批量计数 ===")
+    app, monitor, access, _ = make_app(batch_size=4, flush_interval_seconds=60)
+    with TestClient(app) as client:
+        for i in range(3):
+            assert client.get(f"/items/{i}").status_code == 200
+        assert monitor.get_snapshot().request_count == 0  # still buffered
+
+        assert client.get("/missing").status_code == 404
+        snapshot = monitor.get_snapshot()
+        assert snapshot.request_count == 4
+        assert snapshot.error_count == 1
+        assert snapshot.active_connections == 0
+
+        routes = {e["route"]: e["count"] for e in monitor.get_endpoint_latencies()}
+        assert routes == {"GET /items/{item_id}": 3, "GET UNMATCHED": 1}
+    print("✓ 测试通过")
+
+
+def test_periodic_flush_and_access_log():
+    print("\n=== 测试定时刷新与访问日志 ===")
+    app, monitor, access, _ = make_app(batch_size=1000, flush_interval_seconds=0.05)
+    with TestClient(app) as client:
+        client.get("/items/7")
+        time.sleep(0.3)
+        assert monitor.get_snapshot().request_count == 1
+
+    method, path, response_time_ms, is_error, route_key = access[0]
+    assert (method, path, is_error) == ("GET", "/items/7", False)
+    assert route_key == "GET /items/{item_id}"
+    assert response_time_ms > 0
+    print("✓ 测试通过")
+
+
+def test_exception_counted_and_logged():
+    print("\n=== 测试异常请求 ===")
+    app, monitor, _, errors = make_app(batch_size=1)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        assert client.get("/boom").status_code == 500
+    assert monitor.get_snapshot().error_count == 1
+    assert errors == [("GET", "/boom", "boom")]
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试 ASGI 监控中间件...")
+    test_batched_accounting()
+    test_periodic_flush_and_access_log()
+    test_exception_counted_and_logged()
+    print("\n所有测试完成!")
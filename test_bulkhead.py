@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for dependency bulkheads
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import asyncio
+import time
+
+import httpx
+
+from bulkhead import Bulkhead, BulkheadFullError
+from destination_reminder import DestinationReminder
+from exception_handler import ExceptionHandler
+from metrics_exporter import MetricsExporter
+from performance_monitor import PerformanceMonitor
+from weather_client import AsyncWeatherClient
+
+
+def test_limits_concurrency_and_rejects_when_queue_full():
+    print("\n=== 测试并发上限与排队拒绝 ===")
+    bulkhead = Bulkhead("weather", max_concurrent=2, max_queue=3)
+    running = peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(bulkhead.call(work) for _ in range(8)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert peak == 2
+    assert results.count("ok") == 5
+    assert sum(isinstance(r, BulkheadFullError) for r in results) == 3
+
+    stats = bulkhead.get_stats()
+    assert stats["accepted_total"] == 5 and stats["rejected_total"] == 3
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+    print("✓ 测试通过")
+
+
+def test_queue_timeout_rejects():
+    print("\n=== 测试排队超时 ===")
+    bulkhead = Bulkhead("kubectl", max_concurrent=1, max_queue=5, queue_timeout_seconds=0.02)
+
+    async def run():
+        slow = asyncio.create_task(bulkhead.call(asyncio.sleep, 0.2))
+        await asyncio.sleep(0)
+        try:
+            await bulkhead.call(asyncio.sleep, 0)
+        except BulkheadFullError as e:
+            slow.cancel()
+            return e
+
+    assert isinstance(asyncio.run(run()), BulkheadFullError)
+    assert bulkhead.get_stats()["queue_timeouts_total"] == 1
+    print("✓ 测试通过")
+
+
+def test_run_sync_keeps_event_loop_free():
+    print("\n=== 测试阻塞调用隔离 ===")
+    bulkhead = Bulkhead("notifications", max_concurrent=1, max_queue=1)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await bulkhead.run_sync(time.sleep, 0.1)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 5
+    print("✓ 测试通过")
+
+
+def test_weather_bulkhead_fails_fast():
+    print("\n=== 测试天气请求隔离 ===")
+    handler = ExceptionHandler()
+    bulkhead = handler.bulkhead("weather", max_concurrent=1, max_queue=0)
+    assert handler.bulkhead("weather", max_concurrent=50) is bulkhead
+
+    async def slow_upstream(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"current_condition": [{"temp_C": "20"}], "weather": []})
+
+    reminder = DestinationReminder(weather_bulkhead=bulkhead)
+    reminder.weather_client = AsyncWeatherClient(transport=httpx.MockTransport(slow_upstream))
+
+    async def run():
+        return await asyncio.gather(reminder._fetch_weather_async("北京"), reminder._fetch_weather_async("上海"))
+
+    first, second = asyncio.run(run())
+    assert first["current"]["temperature"] == "20"
+    assert "繁忙" in second["error"]
+    assert reminder.get_weather_stats()["bulkhead"]["rejected_total"] == 1
+
+    text = MetricsExporter(PerformanceMonitor(), handler).render()
+    assert 'ai_navigator_bulkhead_rejections_total{bulkhead="weather"} 1' in text
+    assert 'ai_navigator_bulkhead_queue_depth{bulkhead="weather"} 0' in text
+    assert handler.get_exception_summary()["bulkheads"]["weather"]["max_concurrent"] == 1
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试舱壁隔离...")
+    test_limits_concurrency_and_rejects_when_queue_full()
+    test_queue_timeout_rejects()
+    test_run_sync_keeps_event_loop_free()
+    test_weather_bulkhead_fails_fast()
+    print("\n所有测试完成!")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for the circuit breaker state machine
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import asyncio
+import threading
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from exception_handler import ExceptionHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        breaker.on_failure(breaker.acquire())
+
+
+def succeed(breaker, times=1):
+    for _ in range(times):
+        breaker.on_success(breaker.acquire())
+
+
+def test_opens_on_consecutive_failures():
+    print("\n=== 测试连续失败熔断 ===")
+    breaker = CircuitBreaker("amap", failure_threshold=3, minimum_calls=100, clock=FakeClock())
+    fail(breaker, 2)
+    succeed(breaker)
+    fail(breaker, 2)
+    assert breaker.state is CircuitState.CLOSED
+    fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.acquire() is None
+    assert breaker.get_state()["rejected_total"] == 1
+    print("✓ 测试通过")
+
+
+def test_opens_on_window_failure_rate():
+    print("\n=== 测试滑动窗口失败率熔断 ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker("weather", failure_threshold=100, failure_rate_threshold=0.5,
+                             window_seconds=10, minimum_calls=10, clock=clock)
+    for _ in range(4):
+        fail(breaker)
+        succeed(breaker)
+    assert breaker.state is CircuitState.CLOSED  # 4/8, below minimum_calls
+
+    clock.now += 11  # failures age out of the window
+    succeed(breaker, 6)
+    fail(breaker, 4)
+    assert breaker.get_state()["failure_rate"] == 0.4
+    assert breaker.state is CircuitState.CLOSED
+    fail(breaker, 2)
+    assert breaker.state is CircuitState.OPEN
+    print("✓ 测试通过")
+
+
+def test_half_open_limits_probes_and_closes():
+    print("\n=== 测试半开探测 ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker("llm", failure_threshold=1, open_timeout_seconds=30,
+                             half_open_max_probes=2, clock=clock)
+    fail(breaker)
+    clock.now += 10
+    assert breaker.retry_after_seconds() == 20
+    clock.now += 20
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    first, second = breaker.acquire(), breaker.acquire()
+    assert first.probe and second.probe
+    assert breaker.acquire() is None  # probe slots full
+
+    breaker.on_success(first)
+    assert breaker.state is CircuitState.HALF_OPEN
+    third = breaker.acquire()
+    breaker.on_success(second)
+    assert breaker.state is CircuitState.CLOSED
+    breaker.on_failure(third)  # admitted before the transition, ignored
+    assert breaker.get_state()["failure_count"] == 0
+    print("✓ 测试通过")
+
+
+def test_probe_failure_reopens():
+    print("\n=== 测试探测失败重新熔断 ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker("llm", failure_threshold=1, open_timeout_seconds=5, clock=clock)
+    fail(breaker)
+    clock.now += 5
+    fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_after_seconds() == 5
+    print("✓ 测试通过")
+
+
+def test_concurrent_probes_bounded():
+    print("\n=== 测试并发探测数量 ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker("amap", failure_threshold=1, open_timeout_seconds=1,
+                             half_open_max_probes=3, clock=clock)
+    fail(breaker)
+    clock.now += 1
+
+    permits = []
+    start = threading.Barrier(16)
+
+    def worker():
+        start.wait()
+        permit = breaker.acquire()
+        if permit is not None:
+            permits.append(permit)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(permits) == 3
+    assert breaker.get_state()["rejected_total"] == 13
+    print("✓ 测试通过")
+
+
+def test_handler_fails_fast_when_open():
+    print("\n=== 测试处理器快速失败 ===")
+    handler = ExceptionHandler(max_retry_attempts=3, retry_delay_seconds=0,
+                               circuit_breaker_threshold=2, circuit_breaker_timeout_seconds=60)
+    calls = 0
+
+    async def fetch_weather():
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("upstream reset")
+
+    async def run():
+        try:
+            await handler.handle_with_retry(fetch_weather, dependency="weather")
+        except CircuitOpenError as e:
+            return e
+
+    error = asyncio.run(run())
+    assert calls == 2
+    assert error.name == "weather" and error.retry_after_seconds > 0
+    assert handler.get_degraded_services() == ["weather"]
+    state = handler.get_exception_summary()["circuit_breakers"]["weather"]
+    assert state["status"] == "OPEN" and state["rejected_total"] == 1
+    print("✓ 测试通过")
+
+
+def test_cancelled_probe_returns_its_slot():
+    print("\n=== 测试取消的探测归还名额 ===")
+    clock = FakeClock()
+    handler = ExceptionHandler(max_retry_attempts=1, circuit_breaker_threshold=1,
+                               circuit_breaker_timeout_seconds=10, circuit_breaker_half_open_probes=2)
+    breaker = handler.circuit_breaker("weather")
+    breaker.clock = clock
+    fail(breaker)
+    clock.now += 10
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def healthy():
+        return "ok"
+
+    async def run():
+        for _ in range(2):
+            try:
+                await asyncio.wait_for(handler.handle_with_retry(hang, dependency="weather"), 0.01)
+            except asyncio.TimeoutError:
+                pass
+        assert breaker.get_state()["probes_in_flight"] == 0
+        return await handler.handle_with_retry(healthy, dependency="weather")
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state is CircuitState.HALF_OPEN
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试熔断器...")
+    test_opens_on_consecutive_failures()
+    test_opens_on_window_failure_rate()
+    test_half_open_limits_probes_and_closes()
+    test_probe_failure_reopens()
+    test_concurrent_probes_bounded()
+    test_handler_fails_fast_when_open()
+    test_cancelled_probe_returns_its_slot()
+    print("\n所有测试完成!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared city index
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from city_index import resolve_city, freeze
+from destination_reminder import DestinationReminder
+from speed_monitor import SpeedMonitor
+from travel_guide import TravelGuidePlanner
+
+
+def test_resolve_aliases():
+    assert resolve_city("北京") == "北京"
+    assert resolve_city("北京市") == "北京"
+    assert resolve_city("beijing") == "北京"
+    assert resolve_city("帝都") == "北京"
+    assert resolve_city("上海东方明珠") == "上海"
+    assert resolve_city("拉萨") is None
+    assert resolve_city("  ") is None
+    print("✓ 测试通过")
+
+
+def test_freeze_is_read_only():
+    frozen = freeze({"tips": ["a", "b"]})
+    assert frozen["tips"] == ("a", "b")
+    try:
+        frozen["tips"] = []
+        assert False, "frozen mapping should reject assignment"
+    except TypeError:
+        pass
+    print("✓ 测试通过")
+
+
+def test_lookups_share_structures():
+    reminder = DestinationReminder()
+    first = reminder.get_travel_recommendations("Beijing")
+    second = reminder.get_travel_recommendations("北京市")
+    assert first["attractions"] is second["attractions"]
+    assert first["location"] == "Beijing"
+
+    fallback = reminder.get_travel_recommendations("拉萨")
+    assert len(fallback["tips"]) == 5
+    assert fallback["attractions"] == ()
+
+    monitor = SpeedMonitor()
+    assert monitor.get_speed_limit_by_city("上海浦东")["高架路"] == 80
+    assert "环路" not in monitor.get_speed_limit_by_city("拉萨")
+
+    planner = TravelGuidePlanner()
+    assert planner._get_best_season("杭州西湖").startswith("春季")
+    assert len(planner._generate_travel_tips("西安")) == 9
+    assert planner._estimate_budget("成都", 2, "经典游").accommodation > 0
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing City Index\n")
+
+    test_resolve_aliases()
+    test_freeze_is_read_only()
+    test_lookups_share_structures()
+
+    print("\nAll tests completed!")
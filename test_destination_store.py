@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the destination data store
+"""
+import os
+import sys
+import tempfile
+sys.path.insert(0, 'src')
+
+from destination_store import DestinationStore, builtin_documents, write_store
+from destination_reminder import DestinationReminder
+from speed_monitor import SpeedMonitor
+from travel_guide import TravelGuidePlanner
+from transportation_recommender import TransportationRecommender
+
+LHASA = {
+    "cities": {
+        "拉萨": {
+            "aliases": ["Lhasa", "拉萨市"],
+            "tips": {
+                "best_time": "5-10月",
+                "tips": ["注意高原反应"],
+                "transportation": ["市区打车方便"],
+                "attractions": ["布达拉宫"],
+                "cuisine": ["酥油茶"]
+            },
+            "speed_limits": {"普通道路": 50},
+            "best_season": "夏秋季"
+        }
+    },
+    "distances": [["成都", "拉萨", 2000]]
+}
+
+
+def test_missing_store_falls_back_to_builtins():
+    store = DestinationStore(path=os.path.join(tempfile.mkdtemp(), "missing.db"))
+    assert not store.available
+    assert store.lookup("best_season", "北京", {"北京": "秋季"}) == "秋季"
+    assert store.resolve("拉萨") is None
+    print("✓ 测试通过")
+
+
+def test_build_import_and_lookup():
+    path = os.path.join(tempfile.mkdtemp(), "destinations.db")
+    write_store(builtin_documents(), path, merge=False)
+    write_store(LHASA, path, merge=True)
+
+    store = DestinationStore(path=path)
+    assert store.resolve("Lhasa") == "拉萨"
+    assert store.resolve("拉萨布达拉宫") == "拉萨"
+    assert store.get("tips", "北京")["cuisine"][0].startswith("北京烤鸭")
+
+    reminder = DestinationReminder(store=store)
+    assert reminder.get_travel_recommendations("拉萨市")["cuisine"] == ("酥油茶",)
+    assert SpeedMonitor(store=store).get_speed_limit_by_city("拉萨")["普通道路"] == 50
+    assert TravelGuidePlanner(store=store)._get_best_season("Lhasa") == "夏秋季"
+    assert len(TravelGuidePlanner(store=store).get_attractions_for_city("北京")) > 0
+    assert TransportationRecommender(store=store)._estimate_distance("拉萨", "成都") == 2000
+    print("✓ 测试通过")
+
+
+def test_hot_reload():
+    path = os.path.join(tempfile.mkdtemp(), "destinations.db")
+    store = DestinationStore(path=path, reload_check_interval_seconds=0)
+    assert store.resolve("拉萨") is None
+
+    write_store(LHASA, path, merge=False)
+    assert store.resolve("拉萨") == "拉萨"
+    assert store.get("best_season", "拉萨") == "夏秋季"
+
+    updated = {"cities": {"拉萨": {"best_season": "全年"}}}
+    write_store(updated, path, merge=True)
+    assert store.get("best_season", "拉萨") == "全年"
+    assert store.get_stats()["reloads"] == 1
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Destination Store\n")
+
+    test_missing_store_falls_back_to_builtins()
+    test_build_import_and_lookup()
+    test_hot_reload()
+
+    print("\nAll tests completed!")
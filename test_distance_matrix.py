@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the distance matrix service
+"""
+import sys
+import random
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from distance_matrix import DistanceMatrixService, haversine_matrix
+from gazetteer import haversine_km
+from transportation_recommender import TransportationRecommender
+
+
+def test_matrix_matches_scalar_haversine():
+    rng = random.Random(8)
+    points = [(rng.uniform(18, 50), rng.uniform(75, 130)) for _ in range(30)]
+    matrix = haversine_matrix(np.array([p[0] for p in points]), np.array([p[1] for p in points]))
+
+    assert matrix.shape == (30, 30)
+    assert np.allclose(matrix, matrix.T)
+    assert np.allclose(np.diag(matrix), 0.0)
+    for i, j in [(0, 1), (3, 17), (29, 5)]:
+        assert abs(matrix[i, j] - haversine_km(*points[i], *points[j])) < 1e-6
+    print("✓ 测试通过")
+
+
+def test_cache_reused_for_reordered_points():
+    service = DistanceMatrixService()
+    points = [(39.9042, 116.4074), (31.2304, 121.4737), (30.2741, 120.1551)]
+
+    first = service.matrix_for_points(points)
+    reordered = service.matrix_for_points(list(reversed(points)))
+
+    assert service.get_stats()["misses"] == 1
+    assert service.get_stats()["hits"] == 1
+    assert np.allclose(reordered, first[::-1, ::-1])
+    print("✓ 测试通过")
+
+
+def test_matrix_for_locations():
+    result = DistanceMatrixService().matrix_for_locations(["北京", "上海", "火星基地", "北京天安门"])
+    assert [item["place"] for item in result["resolved"]] == ["北京", "上海", "天安门"]
+    assert result["unresolved"] == ["火星基地"]
+    assert result["matrix"].shape == (3, 3)
+    assert 1000 < result["matrix"][0, 1] < 1150
+    print("✓ 测试通过")
+
+
+def test_transport_distance_estimate():
+    recommender = TransportationRecommender()
+    assert 1100 < recommender._estimate_distance("北京", "上海") < 1400
+    assert recommender._estimate_distance("北京天安门", "北京故宫") < 3
+    assert recommender._estimate_distance("某地", "别处") == TransportationRecommender.DEFAULT_DISTANCE_KM
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Distance Matrix\n")
+
+    test_matrix_matches_scalar_haversine()
+    test_cache_reused_for_reordered_points()
+    test_matrix_for_locations()
+    test_transport_distance_estimate()
+
+    print("\nAll tests completed!")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded exception store
+"""
+import sys
+sys.path.insert(0, 'src')
+
+
+from exception_handler import ExceptionHandler
+from exception_store import ExceptionRecord, ExceptionStore, fingerprint_exception
+
+
+def make_record(i, exc_type="TimeoutError", severity="critical", fingerprint="fp-a"):
+    return ExceptionRecord(
+        timestamp=f"2024-01-01T00:00:{i:02d}",
+        exception_type=exc_type,
+        exception_message=f"failure {i}",
+        fingerprint=fingerprint,
+        severity=severity,
+        context={},
+        retry_count=1,
+        resolved=False
+    )
+
+
+def test_ring_evicts_and_keeps_counters():
+    print("\n=== 测试环形缓冲与计数 ===")
+    store = ExceptionStore(capacity=5)
+    for i in range(4):
+        store.add(make_record(i))
+    for i in range(4, 8):
+        store.add(make_record(i, exc_type="ValueError", severity="medium"))
+
+    assert len(store) == 5
+    assert store.total_recorded == 8
+    assert store.type_counts == {"TimeoutError": 1, "ValueError": 4}
+    assert store.severity_counts["critical"] == 1 and store.severity_counts["medium"] == 4
+    assert store.unresolved_count == 5
+    assert [r.exception_message for r in store.recent(2)] == ["failure 6", "failure 7"]
+    assert [r.exception_message for r in store.unresolved()][0] == "failure 3"
+    print("✓ 测试通过")
+
+
+def test_resolve_by_type_and_evict_resolved():
+    print("\n=== 测试按类型解决 ===")
+    store = ExceptionStore(capacity=4)
+    store.add(make_record(0, exc_type="KeyError"))
+    store.add(make_record(1))
+    store.add(make_record(2, exc_type="KeyError"))
+
+    assert store.resolve_type("KeyError") == 2
+    assert store.resolve_type("KeyError") == 0
+    assert store.unresolved_count == 1
+    assert all(r.resolution_time for r in store if r.exception_type == "KeyError")
+
+    for i in range(3, 7):
+        store.add(make_record(i))
+    assert store.unresolved_count == 4
+    assert "KeyError" not in store.type_counts
+    print("✓ 测试通过")
+
+
+def raise_timeout(i):
+    raise TimeoutError(f"upstream timeout {i}")
+
+
+def raise_value():
+    raise ValueError("bad value")
+
+
+def capture(func, *args):
+    try:
+        func(*args)
+    except Exception as e:
+        return e
+
+
+def test_fingerprints_aggregate_occurrences():
+    print("\n=== 测试异常指纹聚合 ===")
+    first = capture(raise_timeout, 0)
+    assert fingerprint_exception(first)[0] == fingerprint_exception(capture(raise_timeout, 1))[0]
+    assert fingerprint_exception(first)[0] != fingerprint_exception(capture(raise_value))[0]
+    assert "raise_timeout" in fingerprint_exception(first)[1]
+
+    store = ExceptionStore(capacity=3)
+    for i in range(5):
+        fp = store.record_occurrence(capture(raise_timeout, i))
+    store.record_occurrence(capture(raise_value))
+    assert store.distinct_fingerprints() == 2
+
+    top = store.fingerprints(limit=1)[0]
+    assert top["fingerprint"] == fp
+    assert top["exception_type"] == "TimeoutError"
+    assert top["count"] == 5
+    assert top["first_seen"] <= top["last_seen"]
+    assert top["last_message"] == "upstream timeout 4"
+    print("✓ 测试通过")
+
+
+def test_traceback_rendered_once_on_demand():
+    print("\n=== 测试调用栈按需生成 ===")
+    store = ExceptionStore()
+    fp = store.record_occurrence(capture(raise_timeout, 0))
+    entry = store._fingerprints[fp]
+    assert entry.rendered is None
+
+    text = store.traceback_for(fp)
+    assert text.startswith("Traceback (most recent call last):")
+    assert 'raise TimeoutError(f"upstream timeout {i}")' in text
+    assert text.rstrip().endswith("TimeoutError: upstream timeout 0")
+    assert store.traceback_for(fp) is text
+
+    store.add(make_record(0, fingerprint=fp))
+    assert store.to_dict(store.recent(1)[0])["traceback"] is text
+    assert store.traceback_for("missing") is None
+    print("✓ 测试通过")
+
+
+def test_fingerprints_bounded():
+    print("\n=== 测试指纹数量上限 ===")
+    store = ExceptionStore(max_fingerprints=2)
+    errors = [capture(raise_timeout, 0), capture(raise_value), capture(lambda: {}["k"])]
+    fps = [store.record_occurrence(e) for e in errors]
+    assert store.distinct_fingerprints() == 2
+    assert store.traceback_for(fps[0]) is None
+    assert store.traceback_for(fps[2]) is not None
+    print("✓ 测试通过")
+
+
+def test_handler_uses_bounded_store():
+    print("\n=== 测试异常处理器 ===")
+    handler = ExceptionHandler(max_retry_attempts=3, retry_delay_seconds=0, max_history=4,
+                               circuit_breaker_threshold=100)
+
+    def flaky():
+        raise TimeoutError("upstream timeout")
+
+    for _ in range(2):
+        try:
+            handler.handle_sync_with_retry(flaky)
+        except TimeoutError:
+            pass
+
+    summary = handler.get_exception_summary()
+    assert summary["total_exceptions"] == 6
+    assert summary["retained_exceptions"] == 4
+    assert summary["unresolved_exceptions"] == 4
+    assert summary["exception_types"] == {"TimeoutError": 4}
+    assert len(handler.get_unresolved_exceptions()) == 4
+    assert handler.mark_resolved("TimeoutError") == 4
+    assert handler.get_exception_summary()["unresolved_exceptions"] == 0
+
+    summary = handler.get_exception_summary()
+    assert summary["distinct_fingerprints"] == 1
+    assert summary["top_fingerprints"][0]["count"] == 6
+    assert "flaky" in summary["recent_exceptions"][-1]["traceback"]
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试异常存储...")
+    test_ring_evicts_and_keeps_counters()
+    test_resolve_by_type_and_evict_resolved()
+    test_fingerprints_aggregate_occurrences()
+    test_traceback_rendered_once_on_demand()
+    test_fingerprints_bounded()
+    test_handler_uses_bounded_store()
+    print("\n所有测试完成!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline gazetteer
+"""
+import sys
+import random
+sys.path.insert(0, 'src')
+
+from gazetteer import Gazetteer, get_gazetteer, haversine_km
+
+
+def test_lookup_and_find():
+    gazetteer = get_gazetteer()
+    assert gazetteer.get("Beijing").name == "北京"
+    assert gazetteer.get("紫禁城").name == "故宫"
+    assert gazetteer.find("北京天安门").name == "天安门"
+    assert gazetteer.find("上海东方明珠").name == "东方明珠"
+    assert gazetteer.find("杭州市").name == "杭州"
+    assert gazetteer.find("火星基地") is None
+    print("✓ 测试通过")
+
+
+def test_haversine():
+    beijing = get_gazetteer().get("北京")
+    shanghai = get_gazetteer().get("上海")
+    distance = haversine_km(beijing.lat, beijing.lon, shanghai.lat, shanghai.lon)
+    assert 1000 < distance < 1150
+    print("✓ 测试通过")
+
+
+def test_radius_query():
+    tiananmen = get_gazetteer().get("天安门")
+    names = [place.name for place, _ in get_gazetteer().within_radius(tiananmen.lat, tiananmen.lon, 5)]
+    assert names[0] == "天安门"
+    assert "故宫" in names and "西单" in names
+    assert "颐和园" not in names
+    print("✓ 测试通过")
+
+
+def test_nearest_matches_brute_force():
+    gazetteer = Gazetteer()
+    assert len(gazetteer) > 50
+    everything = gazetteer._places
+    rng = random.Random(7)
+
+    for _ in range(200):
+        lat = rng.uniform(15, 50)
+        lon = rng.uniform(80, 130)
+        expected = sorted(everything, key=lambda p: haversine_km(lat, lon, p.lat, p.lon))[:3]
+        actual = [place for place, _ in gazetteer.nearest(lat, lon, k=3)]
+        assert actual == expected
+
+    cities = gazetteer.nearest(39.9, 116.4, k=2, kind="city")
+    assert [place.name for place, _ in cities] == ["北京", "天津"]
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Gazetteer\n")
+
+    test_lookup_and_find()
+    test_haversine()
+    test_radius_query()
+    test_nearest_matches_brute_force()
+
+    print("\nAll tests completed!")
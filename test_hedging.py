@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for hedged requests
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import asyncio
+
+import httpx
+
+from destination_reminder import DestinationReminder
+from hedging import HedgePolicy
+from weather_client import AsyncWeatherClient
+
+
+def warmed_policy(latency_ms=10.0, **kwargs):
+    policy = HedgePolicy("weather", min_samples=20, **kwargs)
+    for _ in range(100):
+        policy.record_latency(latency_ms)
+    return policy
+
+
+def test_no_hedge_until_enough_samples():
+    print("\n=== 测试样本不足时不对冲 ===")
+    policy = HedgePolicy("weather", min_samples=20)
+    assert policy.hedge_delay_seconds() is None
+
+    async def slow():
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    assert asyncio.run(policy.run(slow)) == "ok"
+    assert policy.hedges_sent == 0 and policy.requests == 1
+    print("✓ 测试通过")
+
+
+def test_hedge_wins_and_loser_cancelled():
+    print("\n=== 测试对冲请求胜出并取消慢请求 ===")
+    policy = warmed_policy(max_hedge_ratio=1.0)
+    assert 0.009 <= policy.hedge_delay_seconds() <= 0.011
+    calls = 0
+    cancelled = []
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        attempt = calls
+        try:
+            await asyncio.sleep(1.0 if attempt == 1 else 0.005)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    async def run():
+        for _ in range(10):
+            policy.budget.record_request()
+        return await policy.run(call)
+
+    assert asyncio.run(run()) == 2
+    assert cancelled == [1]
+    stats = policy.get_stats()
+    assert stats["hedges_sent"] == 1 and stats["hedge_wins"] == 1
+    assert stats["hedge_win_rate"] == 1.0 and stats["losers_cancelled"] == 1
+    print("✓ 测试通过")
+
+
+def test_failed_hedge_falls_back_to_primary():
+    print("\n=== 测试对冲失败时等待原请求 ===")
+    policy = warmed_policy(max_hedge_ratio=1.0)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise ConnectionError("reset")
+
+    async def run():
+        for _ in range(10):
+            policy.budget.record_request()
+        return await policy.run(call)
+
+    assert asyncio.run(run()) == "primary"
+    assert policy.primary_wins == 1 and policy.losers_cancelled == 0
+    print("✓ 测试通过")
+
+
+def test_hedge_rate_capped():
+    print("\n=== 测试对冲比例上限 ===")
+    policy = warmed_policy(latency_ms=1.0, max_hedge_ratio=0.1)
+
+    async def slow():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def run():
+        for _ in range(50):
+            await policy.run(slow)
+
+    asyncio.run(run())
+    stats = policy.get_stats()
+    assert 1 <= stats["hedges_sent"] <= 5
+    assert stats["hedges_denied"] == 50 - stats["hedges_sent"]
+    print("✓ 测试通过")
+
+
+def test_weather_fetch_is_hedged():
+    print("\n=== 测试天气请求对冲 ===")
+    calls = 0
+
+    async def upstream(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.001)
+        return httpx.Response(200, json={"current_condition": [{"temp_C": str(calls)}], "weather": []})
+
+    policy = warmed_policy(max_hedge_ratio=1.0)
+    reminder = DestinationReminder(weather_hedge=policy)
+    reminder.weather_client = AsyncWeatherClient(transport=httpx.MockTransport(upstream))
+
+    async def run():
+        for _ in range(10):
+            policy.budget.record_request()
+        return await reminder._fetch_weather_async("成都")
+
+    weather = asyncio.run(run())
+    assert weather["current"]["temperature"] == "2"
+    assert reminder.get_weather_stats()["hedging"]["hedge_wins"] == 1
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试请求对冲...")
+    test_no_hedge_until_enough_samples()
+    test_hedge_wins_and_loser_cancelled()
+    test_failed_hedge_falls_back_to_primary()
+    test_hedge_rate_capped()
+    test_weather_fetch_is_hedged()
+    print("\n所有测试完成!")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for log-linear latency histograms
+"""
+import sys
+import random
+sys.path.insert(0, 'src')
+
+from latency_histogram import LatencyHistogram
+from performance_monitor import PerformanceMonitor
+
+
+def exact_percentile(values, p):
+    ordered = sorted(values)
+    rank = max(1, -(-p * len(ordered) // 100))
+    return ordered[int(rank) - 1]
+
+
+def test_percentiles_within_relative_error():
+    rng = random.Random(12)
+    values = [rng.lognormvariate(3, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for v in values:
+        histogram.record(v)
+
+    for p, estimate in histogram.percentiles().items():
+        exact = exact_percentile(values, p)
+        assert abs(estimate - exact) / exact < 0.07, (p, estimate, exact)
+    assert histogram.count == len(values)
+    print("✓ 测试通过")
+
+
+def test_bounded_memory_and_merge():
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    size = len(a.counts)
+    for v in (0.001, 5.0, 250.0, 10_000_000.0):
+        a.record(v)
+        b.record(v * 2)
+    assert len(a.counts) == size
+    assert a.max_us == 3_600_000_000
+
+    a.merge(b)
+    assert a.count == 8
+    assert a.summary()["min_ms"] == 0.001
+    print("✓ 测试通过")
+
+
+def test_endpoint_histograms():
+    monitor = PerformanceMonitor(max_tracked_endpoints=2)
+    for _ in range(99):
+        monitor.record_request(10.0, route="GET /api/weather/{location}")
+    monitor.record_request(900.0, is_error=True, route="GET /api/weather/{location}")
+    monitor.record_request(5.0, route="GET /health")
+    monitor.record_request(5.0, route="GET /docs")
+
+    endpoints = {e["route"]: e for e in monitor.get_endpoint_latencies()}
+    weather = endpoints["GET /api/weather/{location}"]
+    assert weather["count"] == 100 and weather["errors"] == 1
+    assert weather["p50"] < 11 and weather["p999"] > 850
+    assert "OTHER" in endpoints and "GET /docs" not in endpoints
+
+    status = monitor.get_current_status()
+    assert status["latency"]["count"] == 102
+    assert status["endpoints"][0]["route"] == "GET /api/weather/{location}"
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Latency Histogram\n")
+
+    test_percentiles_within_relative_error()
+    test_bounded_memory_and_merge()
+    test_endpoint_histograms()
+
+    print("\nAll tests completed!")
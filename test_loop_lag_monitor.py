@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the event loop lag monitor
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import asyncio
+import time
+
+from loop_lag_monitor import LoopLagMonitor
+from performance_monitor import PerformanceMonitor
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+async def handler():
+    blocking_handler()
+
+
+def test_stall_captured_with_stack():
+    print("\n=== 测试阻塞检测与调用栈 ===")
+
+    async def scenario():
+        monitor = LoopLagMonitor(interval_seconds=0.02, stall_threshold_ms=100)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await asyncio.create_task(handler(), name="slow-request")
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+    stats = monitor.get_stats()
+    print(f"阻塞次数: {stats['stalls']}, 最大延迟: {stats['max_lag_ms']}ms")
+    assert stats["stalls"] == 1
+    assert stats["max_lag_ms"] >= 200
+    assert not stats["running"]
+
+    stall = monitor.stalls[-1]
+    assert any("blocking_handler" in frame for frame in stall.stack)
+    assert "time.sleep" in stall.stack[-1]
+    assert stall.task.startswith("slow-request")
+    print("✓ 测试通过")
+
+
+def test_no_stall_on_idle_loop():
+    print("\n=== 测试空闲事件循环 ===")
+
+    async def scenario():
+        monitor = LoopLagMonitor(interval_seconds=0.01, stall_threshold_ms=100)
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+    assert monitor.stall_count == 0
+    assert monitor.lag_histogram.count >= 5
+    print("✓ 测试通过")
+
+
+def test_stall_raises_alert():
+    print("\n=== 测试阻塞告警 ===")
+    perf = PerformanceMonitor(loop_stall_threshold_ms=100)
+    perf.loop_monitor.interval_seconds = 0.02
+
+    async def scenario():
+        perf.start_loop_monitoring()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+        await perf.stop_loop_monitoring()
+
+    asyncio.run(scenario())
+    alerts = [a for a in perf.get_all_alerts() if a["metric_type"] == "event_loop_lag"]
+    assert len(alerts) == 1
+    assert "blocking_handler" in alerts[0]["message"] or "time.sleep" in alerts[0]["message"]
+    assert perf.get_current_status()["event_loop"]["stalls"] == 1
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试事件循环延迟监控...")
+    test_stall_captured_with_stack()
+    test_no_stall_on_idle_loop()
+    test_stall_raises_alert()
+    print("\n所有测试完成!")
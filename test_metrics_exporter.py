@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the OpenMetrics exporter
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from auto_scaler import AutoScaler
+from exception_handler import ExceptionHandler
+from metrics_exporter import MetricsExporter
+from performance_monitor import PerformanceMonitor
+from sre_notifier import SRENotifier
+
+
+def make_exporter():
+    monitor = PerformanceMonitor()
+    handler = ExceptionHandler(circuit_breaker_threshold=2)
+    notifier = SRENotifier()
+    exporter = MetricsExporter(monitor, handler, AutoScaler(min_replicas=2, max_replicas=6), notifier)
+    return exporter, monitor, handler, notifier
+
+
+def parse_samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return samples
+
+
+def test_render_format():
+    exporter, monitor, handler, notifier = make_exporter()
+    for latency in (0.5, 3.0, 40.0, 700.0, 20000.0):
+        monitor.record_request(latency, route='GET /api/weather/{location}')
+    monitor.record_request(2.0, is_error=True, route="GET UNMATCHED")
+    breaker = handler.circuit_breaker("fetch_weather")
+    breaker.on_failure(breaker.acquire())
+    breaker.on_failure(breaker.acquire())
+    notifier._record_notification("webhook", "alert", "subject", "message", True)
+
+    text = exporter.render()
+    assert text.endswith("# EOF\n")
+
+    declared = set()
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            declared.add(line.split()[2])
+        elif line and not line.startswith("#"):
+            name = line.split("{")[0].split(" ")[0]
+            assert any(name == d or name.startswith(d + "_") for d in declared), name
+
+    samples = parse_samples(text)
+    assert samples["ai_navigator_requests_total"] == 6
+    assert samples["ai_navigator_request_errors_total"] == 1
+    weather = 'route="GET /api/weather/{location}"'
+    assert samples[f'ai_navigator_request_duration_seconds_bucket{{{weather},le="0.005"}}'] == 2
+    assert samples[f'ai_navigator_request_duration_seconds_bucket{{{weather},le="10.0"}}'] == 4
+    assert samples[f'ai_navigator_request_duration_seconds_bucket{{{weather},le="+Inf"}}'] == 5
+    assert samples[f'ai_navigator_request_duration_seconds_count{{{weather}}}'] == 5
+    assert samples['ai_navigator_circuit_breaker_state{breaker="fetch_weather",ai_navigator_circuit_breaker_state="open"}'] == 1
+    assert samples['ai_navigator_replicas{kind="max"}'] == 6
+    assert samples['ai_navigator_notifications_total{channel="webhook",result="success"}'] == 1
+    print("✓ 测试通过")
+
+
+def test_buckets_are_cumulative():
+    exporter, monitor, _, _ = make_exporter()
+    for i in range(1000):
+        monitor.record_request(i * 7.3, route="POST /api/navigate")
+
+    buckets = [value for key, value in parse_samples(exporter.render()).items()
+               if key.startswith("ai_navigator_request_duration_seconds_bucket")]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == 1000
+    print("✓ 测试通过")
+
+
+def test_label_escaping():
+    exporter, monitor, _, _ = make_exporter()
+    monitor.record_request(1.0, route='GET /odd"path\\')
+    assert 'route="GET /odd\\"path\\\\"' in exporter.render()
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Metrics Exporter\n")
+
+    test_render_format()
+    test_buckets_are_cumulative()
+    test_label_escaping()
+
+    print("\nAll tests completed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for performance monitor snapshots
+"""
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from performance_monitor import PerformanceMonitor
+
+
+def test_status_does_not_block():
+    monitor = PerformanceMonitor()
+    start = time.perf_counter()
+    for _ in range(20):
+        monitor.get_current_status()
+        monitor.get_scaling_recommendation()
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5, f"status calls took {elapsed:.2f}s"
+    print("✓ 测试通过")
+
+
+def test_snapshot_merges_live_counters():
+    monitor = PerformanceMonitor()
+    monitor.collect_metrics()
+    monitor.record_request(100.0)
+    monitor.record_request(300.0, is_error=True)
+    monitor.increment_connections()
+
+    snapshot = monitor.get_snapshot()
+    assert snapshot.request_count == 2
+    assert snapshot.error_count == 1
+    assert snapshot.avg_response_time_ms == 200.0
+    assert snapshot.active_connections == 1
+    print("✓ 测试通过")
+
+
+def test_response_time_window_average():
+    monitor = PerformanceMonitor()
+    for i in range(250):
+        monitor.record_request(float(i))
+    assert monitor.get_snapshot().avg_response_time_ms == sum(range(150, 250)) / 100
+    print("✓ 测试通过")
+
+
+def test_stale_snapshot_refreshed_in_background():
+    monitor = PerformanceMonitor(max_staleness_seconds=0.05)
+    first = monitor.collect_metrics()
+    time.sleep(0.1)
+
+    served = monitor.get_snapshot()
+    assert served.timestamp == first.timestamp
+
+    deadline = time.time() + 2
+    while monitor.snapshot_refreshes == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert monitor.snapshot_refreshes == 1
+    assert monitor.get_snapshot_age_seconds() < 0.05
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Performance Monitor\n")
+
+    test_status_does_not_block()
+    test_snapshot_merges_live_counters()
+    test_response_time_window_average()
+    test_stale_snapshot_refreshed_in_background()
+
+    print("\nAll tests completed!")
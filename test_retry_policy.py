@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for retry backoff, budgets and deadlines
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import asyncio
+import time
+
+from exception_handler import ExceptionHandler
+from retry_policy import RetryBudget, full_jitter_delay, retry_fits_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_full_jitter_delay_bounds():
+    print("\n=== 测试全抖动指数退避 ===")
+    assert full_jitter_delay(1, 0.5, 10, rng=lambda: 0.999) < 0.5
+    assert full_jitter_delay(3, 0.5, 10, rng=lambda: 0.5) == 1.0
+    assert full_jitter_delay(10, 0.5, 10, rng=lambda: 0.5) == 5.0
+    delays = {round(full_jitter_delay(2, 1.0, 10), 3) for _ in range(50)}
+    assert len(delays) > 10 and all(0 <= d <= 2.0 for d in delays)
+    print("✓ 测试通过")
+
+
+def test_budget_caps_retries_to_ratio_of_requests():
+    print("\n=== 测试重试预算 ===")
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.1, min_retries_per_second=0.5, window_seconds=10, clock=clock)
+    for _ in range(100):
+        budget.record_request()
+
+    granted = sum(budget.try_acquire() for _ in range(100))
+    assert granted == 15  # 0.1 * 100 + 0.5 * 10
+    assert budget.get_stats()["budget_exhausted_total"] == 85
+
+    clock.now += 11  # window slides past every request and retry
+    assert budget.get_stats()["window_requests"] == 0
+    assert sum(budget.try_acquire() for _ in range(10)) == 5
+    print("✓ 测试通过")
+
+
+def test_deadline_check():
+    print("\n=== 测试截止时间判断 ===")
+    assert retry_fits_deadline(None, 100, 100)
+    assert retry_fits_deadline(10.0, 2.0, 3.0, now=5.0)
+    assert not retry_fits_deadline(10.0, 2.0, 3.5, now=5.0)
+    print("✓ 测试通过")
+
+
+def test_handler_skips_retry_past_deadline():
+    print("\n=== 测试截止时间前不再重试 ===")
+    handler = ExceptionHandler(max_retry_attempts=5, retry_delay_seconds=0.01,
+                               circuit_breaker_threshold=100)
+    calls = []
+
+    async def slow_failure():
+        calls.append(time.monotonic())
+        await asyncio.sleep(0.05)
+        raise ConnectionError("upstream reset")
+
+    async def run():
+        try:
+            await handler.handle_with_retry(slow_failure, dependency="weather",
+                                            deadline=time.monotonic() + 0.08)
+        except ConnectionError:
+            pass
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    stats = handler.get_exception_summary()["retry_budgets"]["weather"]
+    assert stats["deadline_exceeded_total"] == 1 and stats["retries_total"] == 0
+    print("✓ 测试通过")
+
+
+def test_handler_stops_when_budget_spent():
+    print("\n=== 测试预算耗尽后不再重试 ===")
+    handler = ExceptionHandler(max_retry_attempts=3, retry_delay_seconds=0,
+                               retry_budget_ratio=0.1, retry_budget_min_per_second=0.2,
+                               circuit_breaker_threshold=1000, circuit_breaker_min_calls=1000)
+    calls = 0
+
+    def failing():
+        nonlocal calls
+        calls += 1
+        raise TimeoutError("upstream timeout")
+
+    for _ in range(20):
+        try:
+            handler.handle_sync_with_retry(failing, dependency="amap")
+        except TimeoutError:
+            pass
+
+    stats = handler.retry_budgets["amap"].get_stats()
+    assert stats["requests_total"] == 20
+    assert calls == 20 + stats["retries_total"]
+    assert stats["retries_total"] <= 0.1 * 20 + 0.2 * 10
+    assert stats["budget_exhausted_total"] > 0
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试重试策略...")
+    test_full_jitter_delay_bounds()
+    test_budget_caps_retries_to_ratio_of_requests()
+    test_deadline_check()
+    test_handler_skips_retry_past_deadline()
+    test_handler_stops_when_budget_spent()
+    print("\n所有测试完成!")
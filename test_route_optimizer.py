@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-stop route optimizer
+"""
+import sys
+import random
+import time
+from itertools import permutations
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from distance_matrix import haversine_matrix
+from route_optimizer import optimize_route, path_length, solve_open_path
+
+
+def random_matrix(rng, stops):
+    lats = np.array([rng.uniform(30.0, 30.5) for _ in range(stops + 1)])
+    lons = np.array([rng.uniform(120.0, 120.5) for _ in range(stops + 1)])
+    return haversine_matrix(lats, lons)
+
+
+def test_exact_matches_brute_force():
+    rng = random.Random(9)
+    for stops in range(2, 9):
+        matrix = random_matrix(rng, stops)
+        best = min(path_length(matrix, (0,) + p) for p in permutations(range(1, stops + 1)))
+        path, _ = solve_open_path(matrix)
+        assert path[0] == 0 and sorted(path) == list(range(stops + 1))
+        assert abs(path_length(matrix, path) - best) < 1e-6
+    print("✓ 测试通过")
+
+
+def test_heuristic_within_budget():
+    rng = random.Random(10)
+    for stops in (15, 30, 120):
+        matrix = random_matrix(rng, stops)
+        start = time.perf_counter()
+        path, method = solve_open_path(matrix, time_budget_ms=50)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert method == "nn_2opt_oropt"
+        assert sorted(path) == list(range(stops + 1))
+        assert elapsed_ms < 100
+        assert path_length(matrix, path) < path_length(matrix, range(stops + 1))
+    print("✓ 测试通过")
+
+
+def test_optimize_named_route():
+    result = optimize_route("北京", ["广州", "天津", "火星基地", "上海", "南京"])
+    assert result.order == ["天津", "南京", "上海", "广州", "火星基地"]
+    assert result.unresolved == ["火星基地"]
+    assert result.distance_km < result.original_distance_km
+
+    unchanged = optimize_route("火星基地", ["广州", "天津", "上海"])
+    assert unchanged.method == "unchanged"
+    assert unchanged.order == ["广州", "天津", "上海"]
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Route Optimizer\n")
+
+    test_exact_matches_brute_force()
+    test_heuristic_within_budget()
+    test_optimize_named_route()
+
+    print("\nAll tests completed!")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-worker shared metrics segment
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import multiprocessing
+import os
+import tempfile
+
+from auto_scaler import AutoScaler
+from exception_handler import ExceptionHandler
+from performance_monitor import PerformanceMonitor
+from shared_metrics import SharedMetrics
+
+
+def worker(path, requests, route):
+    metrics = SharedMetrics(path)
+    for i in range(requests):
+        metrics.record_request(10.0 + i, is_error=(i % 10 == 0), route=route)
+    metrics.increment_exceptions(2)
+    metrics.close()
+
+
+def run_workers(path, jobs):
+    ctx = multiprocessing.get_context("fork")
+    processes = [ctx.Process(target=worker, args=(path, n, route)) for n, route in jobs]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+
+def test_aggregate_across_processes():
+    print("\n=== 测试跨进程聚合 ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics")
+        metrics = SharedMetrics(path)
+        metrics.record_request(5.0, route="GET /health")
+
+        run_workers(path, [(100, "GET /api/weather/{location}"), (50, "GET /health")])
+
+        pod = metrics.aggregate()
+        print(f"聚合结果: {pod}")
+        assert pod["request_count"] == 151
+        assert pod["error_count"] == 10 + 5
+        assert pod["exception_count"] == 4
+        assert pod["workers"] == 1  # exited workers are no longer live
+
+        overall, routes, errors = metrics.histograms()
+        assert overall.count == 151
+        assert routes["GET /health"].count == 51
+        assert routes["GET /api/weather/{location}"].count == 100
+        assert errors["GET /api/weather/{location}"] == 10
+        assert routes["GET /api/weather/{location}"].max_us == 109_000
+        metrics.close()
+    print("✓ 测试通过")
+
+
+def test_dead_worker_slot_is_reused():
+    print("\n=== 测试退出进程的槽位回收 ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics")
+        metrics = SharedMetrics(path, max_workers=2)
+        run_workers(path, [(10, "GET /a")])
+        run_workers(path, [(10, "GET /a")])
+        run_workers(path, [(10, "GET /b")])
+
+        pod = metrics.aggregate()
+        assert pod["request_count"] == 30
+        _, routes, _ = metrics.histograms()
+        assert routes["GET /a"].count == 20
+        assert routes["GET /b"].count == 10
+        metrics.close()
+    print("✓ 测试通过")
+
+
+def test_route_overflow():
+    print("\n=== 测试路由数量上限 ===")
+    with tempfile.TemporaryDirectory() as directory:
+        metrics = SharedMetrics(os.path.join(directory, "metrics"), max_routes=4)
+        for i in range(10):
+            metrics.record_request(1.0, route=f"GET /r{i}")
+        _, routes, _ = metrics.histograms()
+        assert len(routes) == 4
+        assert routes["OTHER"].count == 7
+        metrics.close()
+    print("✓ 测试通过")
+
+
+def other_worker(path, ready, done):
+    metrics = SharedMetrics(path)
+    metrics.record_request(40.0, is_error=True, route="GET /health")
+    metrics.add_connections(1)
+    metrics.increment_exceptions()
+    AutoScaler(min_replicas=3, shared_metrics=metrics).current_replicas = 5
+    ready.set()
+    done.wait(10)
+    metrics.close()
+
+
+def test_monitoring_singletons_share_state():
+    print("\n=== 测试监控组件共享状态 ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics")
+        monitor = PerformanceMonitor(shared_metrics=SharedMetrics(path))
+        handler = ExceptionHandler(shared_metrics=SharedMetrics(path))
+        scaler = AutoScaler(min_replicas=3, shared_metrics=SharedMetrics(path))
+        assert scaler.current_replicas == 3
+
+        monitor.record_request(20.0, route="GET /health")
+        monitor.increment_connections()
+
+        ctx = multiprocessing.get_context("fork")
+        ready, done = ctx.Event(), ctx.Event()
+        process = ctx.Process(target=other_worker, args=(path, ready, done))
+        process.start()
+        try:
+            assert ready.wait(10)
+
+            snapshot = monitor.get_snapshot()
+            assert snapshot.request_count == 2
+            assert snapshot.error_count == 1
+            assert snapshot.active_connections == 2
+            assert monitor.get_latency_summary()["count"] == 2
+            assert monitor.get_endpoint_latencies()[0]["errors"] == 1
+            assert monitor.get_current_status()["workers"] == 2
+            assert handler.get_exception_count() == 1
+            assert scaler.current_replicas == 5
+
+            monitor.reset_counters()
+            assert monitor.get_snapshot().request_count == 0
+            assert monitor.get_snapshot().active_connections == 2
+        finally:
+            done.set()
+            process.join()
+        assert process.exitcode == 0
+        assert monitor.get_current_status()["workers"] == 1
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试跨进程指标共享...")
+    test_aggregate_across_processes()
+    test_dead_worker_slot_is_reused()
+    test_route_overflow()
+    test_monitoring_singletons_share_state()
+    print("\n所有测试完成!")
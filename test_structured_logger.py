@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured logger
+"""
+import sys
+sys.path.insert(0, 'src')
+
+import io
+import json
+import threading
+import time
+
+from structured_logger import StructuredLogger
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, gate: threading.Event):
+        super().__init__()
+        self.gate = gate
+
+    def write(self, text):
+        self.gate.wait()
+        return super().write(text)
+
+
+def test_async_batches_and_serializes_off_thread():
+    print("\n=== 测试异步批量写出 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-async", async_mode=True, batch_size=50, stream=stream)
+    for i in range(120):
+        logger.info("GET /health", response_time_ms=i, status="success")
+    logger.flush()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 120
+    first = json.loads(lines[0])
+    assert first["message"] == "GET /health"
+    assert first["level"] == "INFO"
+    assert first["response_time_ms"] == 0
+    assert first["service"] == "ai-navigator"
+
+    stats = logger.get_stats()
+    assert stats["written"] == 120 and stats["dropped"] == 0
+    assert 3 <= stats["batches"] < 120
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_disabled_level_is_skipped_before_formatting():
+    print("\n=== 测试级别过滤 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-level", log_level="INFO", async_mode=True, stream=stream)
+
+    class Explodes:
+        def __str__(self):
+            raise AssertionError("should not be serialized")
+
+    logger.debug("hidden", payload=Explodes())
+    logger.warning("shown")
+    logger.flush()
+    assert logger.get_stats()["enqueued"] == 1
+    assert json.loads(stream.getvalue())["message"] == "shown"
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_drop_policy_when_queue_full():
+    print("\n=== 测试队列满时丢弃 ===")
+    gate = threading.Event()
+    stream = SlowStream(gate)
+    logger = StructuredLogger("test-drop", async_mode=True, max_queue=10, batch_size=5, stream=stream)
+
+    start = time.perf_counter()
+    for i in range(100):
+        logger.info("line", i=i)
+    assert time.perf_counter() - start < 0.5  # never blocks the caller
+
+    gate.set()
+    logger.flush()
+    stats = logger.get_stats()
+    assert stats["dropped"] > 0
+    assert stats["written"] + stats["dropped"] == 100
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_block_policy_waits_for_space():
+    print("\n=== 测试队列满时等待 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-block", async_mode=True, max_queue=5, batch_size=5,
+                              overflow="block", block_timeout_seconds=1.0, stream=stream)
+    for i in range(200):
+        logger.info("line", i=i)
+    logger.flush()
+    assert logger.get_stats()["dropped"] == 0
+    assert len(stream.getvalue().splitlines()) == 200
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_sampling_keeps_errors_and_slow_requests():
+    print("\n=== 测试请求日志采样 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-sample", async_mode=True, stream=stream,
+                              sample_rate=0.01, slow_threshold_ms=500)
+    for i in range(2000):
+        logger.info("GET /health", response_time_ms=1.0, status="success")
+    for i in range(20):
+        logger.info("GET /api/weather/北京", response_time_ms=800.0, status="success")
+        logger.info("GET /missing", response_time_ms=1.0, status="error")
+    logger.info("Service started")
+    logger.flush()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    fast = sum(1 for r in records if r["message"] == "GET /health")
+    assert 1 <= fast <= 60
+    assert sum(1 for r in records if r["message"] == "GET /api/weather/北京") == 20
+    assert sum(1 for r in records if r["message"] == "GET /missing") == 20
+    assert any(r["message"] == "Service started" for r in records)
+    assert logger.get_stats()["sampled_out"] == 2000 - fast
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_rate_limit_per_key_and_suppression_report():
+    print("\n=== 测试按键限流与抑制汇总 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-rate", async_mode=True, stream=stream,
+                              rate_limit_per_second=1, rate_limit_burst=5,
+                              suppression_report_interval_seconds=3600)
+    for i in range(50):
+        logger.warning("upstream timeout", attempt=i)
+        logger.warning("cache miss", log_key="cache", attempt=i)
+    logger.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert sum(1 for r in records if r["message"] == "upstream timeout") == 5
+    assert sum(1 for r in records if r["message"] == "cache miss") == 5
+    assert all("log_key" not in r for r in records)
+
+    report = records[-1]
+    assert report["message"] == "Log records suppressed"
+    assert report["suppressed_rate_limited"] == 90
+    assert report["rate_limited_keys"] == {"upstream timeout": 45, "cache": 45}
+    assert logger.get_stats()["rate_limited"] == 90
+    print("✓ 测试通过")
+
+
+def test_rate_limit_keys_evicted_and_errors_kept():
+    print("\n=== 测试限流键淘汰与错误保留 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-keys", async_mode=True, stream=stream,
+                              slow_threshold_ms=1000,
+                              rate_limit_per_second=0.001, rate_limit_burst=100,
+                              max_rate_limit_keys=1000,
+                              suppression_report_interval_seconds=3600)
+    # More distinct keys than the table holds: each new one still gets its own bucket
+    for i in range(1500):
+        logger.info(f"GET /static/{i}.js", response_time_ms=1.0, status="success")
+    assert len(logger._buckets) == 1000
+    # Requests for one route share its bucket whatever the concrete path
+    for i in range(300):
+        logger.info(f"GET /api/weather/city{i}", log_key="GET /api/weather/{location}",
+                    response_time_ms=1.0, status="success")
+    for i in range(300):
+        logger.info(f"GET /api/weather/missing{i}", log_key="GET /api/weather/{location}",
+                    response_time_ms=1.0, status="error")
+        logger.info(f"GET /api/weather/slow{i}", log_key="GET /api/weather/{location}",
+                    response_time_ms=1500.0, status="success")
+        logger.error(f"Request failed: boom {i}", path=f"/api/weather/x{i}", method="GET")
+    logger.flush()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert sum(1 for m in messages if m.startswith("GET /static/")) == 1500
+    assert sum(1 for m in messages if m.startswith("GET /api/weather/city")) == 100
+    assert sum(1 for m in messages if m.startswith("GET /api/weather/missing")) == 300
+    assert sum(1 for m in messages if m.startswith("GET /api/weather/slow")) == 300
+    assert sum(1 for m in messages if m.startswith("Request failed")) == 300
+    assert logger.get_stats()["rate_limited"] == 200
+    logger.close()
+    print("✓ 测试通过")
+
+
+def test_suppression_reported_periodically():
+    print("\n=== 测试定期汇总 ===")
+    stream = io.StringIO()
+    logger = StructuredLogger("test-report", async_mode=True, stream=stream,
+                              rate_limit_per_second=0.001, rate_limit_burst=1,
+                              suppression_report_interval_seconds=0.05)
+    for _ in range(10):
+        logger.info("noisy")
+    time.sleep(0.1)
+    logger.info("noisy")
+    logger.flush()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages == ["noisy", "Log records suppressed"]
+    logger.close()
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试结构化日志...")
+    test_async_batches_and_serializes_off_thread()
+    test_disabled_level_is_skipped_before_formatting()
+    test_drop_policy_when_queue_full()
+    test_block_policy_waits_for_space()
+    test_sampling_keeps_errors_and_slow_requests()
+    test_rate_limit_per_key_and_suppression_report()
+    test_rate_limit_keys_evicted_and_errors_kept()
+    test_suppression_reported_periodically()
+    print("\n所有测试完成!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the metrics time series
+"""
+import sys
+sys.path.insert(0, 'src')
+
+from performance_monitor import PerformanceMonitor
+from time_series import TimeSeries
+
+BASE = 1_700_000_000.0 - 1_700_000_000.0 % 3600
+
+
+def test_range_queries_across_wraparound():
+    print("\n=== 测试环形缓冲区范围查询 ===")
+    series = TimeSeries(["value"], capacity=10, rollups=())
+    for i in range(25):
+        series.append(BASE + i, [i])
+
+    assert len(series) == 10
+    timestamps, values = series.range()
+    assert values[:, 0].tolist() == list(range(15, 25))
+
+    timestamps, values = series.range(BASE + 18, BASE + 22)
+    assert timestamps.tolist() == [BASE + 18, BASE + 19, BASE + 20, BASE + 21]
+    assert series.range(BASE + 100)[0].size == 0
+    assert series.latest()["value"] == 24
+    print("✓ 测试通过")
+
+
+def test_timestamps_never_go_backwards():
+    print("\n=== 测试时间戳单调 ===")
+    series = TimeSeries(["value"], capacity=10, rollups=())
+    series.append(BASE + 10, [1])
+    series.append(BASE + 5, [2])
+    timestamps, _ = series.range()
+    assert timestamps.tolist() == [BASE + 10, BASE + 10]
+    print("✓ 测试通过")
+
+
+def test_rollups():
+    print("\n=== 测试分钟/小时聚合 ===")
+    series = TimeSeries(["cpu", "requests"], capacity=200, rollups=((60, 10), (300, 10)))
+    for i in range(600):  # one sample every 5s for 50 minutes
+        series.append(BASE + i * 5, [i % 12, i])
+
+    minutes = series.rollup(60)
+    assert len(minutes) == 11  # 10 kept one-minute buckets plus the open one
+    last = minutes[-1]
+    assert last["timestamp"] == BASE + 49 * 60
+    assert last["cpu"]["min"] == 0 and last["cpu"]["max"] == 11
+    assert last["cpu"]["avg"] == 5.5
+    assert 10 <= last["cpu"]["p95"] <= 11
+
+    five = series.rollup(300, start=BASE + 30 * 60)
+    assert [b["timestamp"] for b in five] == [BASE + m * 60 for m in (30, 35, 40, 45)]
+    assert five[0]["requests"]["min"] == 360 and five[0]["requests"]["max"] == 419
+
+    closed = series.rollup(60, include_open=False)
+    assert len(closed) == 10 and closed[-1]["timestamp"] == BASE + 48 * 60
+    print("✓ 测试通过")
+
+
+def test_rollup_from_finer_level_when_raw_is_short():
+    print("\n=== 测试原始数据不足时的聚合 ===")
+    series = TimeSeries(["value"], capacity=6, rollups=((60, 100), (3600, 10)))
+    for i in range(3600 // 10 + 1):  # an hour at 10s, raw ring holds one minute
+        series.append(BASE + i * 10, [i])
+
+    hour = series.rollup(3600, include_open=False)
+    assert len(hour) == 1
+    assert hour[0]["value"]["min"] == 0
+    assert hour[0]["value"]["max"] == 359
+    print("✓ 测试通过")
+
+
+def test_monitor_history_resolutions():
+    print("\n=== 测试监控历史接口 ===")
+    monitor = PerformanceMonitor()
+    for _ in range(3):
+        monitor.record_request(10.0)
+        monitor.collect_metrics()
+
+    raw = monitor.get_metrics_history(minutes=5)
+    assert len(raw) == 3
+    assert raw[-1]["request_count"] == 3 and isinstance(raw[-1]["request_count"], int)
+    assert "T" in raw[-1]["timestamp"]
+
+    buckets = monitor.get_metrics_history(minutes=5, resolution="1m")
+    assert 1 <= len(buckets) <= 2
+    assert buckets[-1]["request_count"]["max"] == 3
+
+    try:
+        monitor.get_metrics_history(resolution="2d")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试指标时间序列...")
+    test_range_queries_across_wraparound()
+    test_timestamps_never_go_backwards()
+    test_rollups()
+    test_rollup_from_finer_level_when_raw_is_short()
+    test_monitor_history_resolutions()
+    print("\n所有测试完成!")
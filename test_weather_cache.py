@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for weather cache functionality
+"""
+import sys
+import time
+sys.path.insert(0, 'src')
+
+from weather_cache import WeatherCache
+from destination_reminder import DestinationReminder
+
+
+class CountingReminder(DestinationReminder):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetch_count = 0
+
+    def _fetch_weather(self, location, language="zh-CN"):
+        self.fetch_count += 1
+        return {"location": location, "current": {"temperature": str(self.fetch_count)}, "forecast": []}
+
+
+def test_cache_fresh_and_miss():
+    cache = WeatherCache(ttl_seconds=60, stale_ttl_seconds=60, max_entries=4)
+
+    value, state = cache.lookup("北京")
+    assert value is None and state == WeatherCache.MISS
+
+    cache.store("北京", {"location": "北京"})
+    value, state = cache.lookup("北京")
+    assert state == WeatherCache.FRESH
+    assert value["location"] == "北京"
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    print("✓ 测试通过")
+
+
+def test_cache_lru_eviction():
+    cache = WeatherCache(ttl_seconds=60, max_entries=2)
+    cache.store("北京", {})
+    cache.store("上海", {})
+    cache.lookup("北京")
+    cache.store("杭州", {})
+
+    assert cache.lookup("上海")[1] == WeatherCache.MISS
+    assert cache.lookup("北京")[1] == WeatherCache.FRESH
+    assert cache.get_stats()["evictions"] == 1
+    print("✓ 测试通过")
+
+
+def test_stale_while_revalidate():
+    reminder = CountingReminder(cache_ttl_seconds=0.05, cache_stale_seconds=60)
+
+    first = reminder.get_weather("北京")
+    assert reminder.fetch_count == 1
+    assert reminder.get_weather("北京") is first
+
+    time.sleep(0.1)
+    stale = reminder.get_weather("北京")
+    assert stale is first
+
+    deadline = time.time() + 2
+    while reminder.weather_cache.get_stats()["refreshes_in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+
+    refreshed = reminder.get_weather("北京")
+    assert reminder.fetch_count == 2
+    assert refreshed["current"]["temperature"] == "2"
+
+    stats = reminder.get_weather_stats()["cache"]
+    assert stats["stale_hits"] == 1
+    assert stats["refreshes"] == 1
+    print("✓ 测试通过")
+
+
+def test_errors_not_cached():
+    class FailingReminder(DestinationReminder):
+        def _fetch_weather(self, location, language="zh-CN"):
+            return {"error": "获取天气信息失败: timeout", "location": location}
+
+    reminder = FailingReminder()
+    reminder.get_weather("上海")
+    reminder.get_weather("上海")
+    assert reminder.weather_cache.get_stats()["entries"] == 0
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Weather Cache Module\n")
+
+    test_cache_fresh_and_miss()
+    test_cache_lru_eviction()
+    test_stale_while_revalidate()
+    test_errors_not_cached()
+
+    print("\nAll tests completed!")
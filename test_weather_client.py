@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test script for the async weather client
+"""
+import sys
+import asyncio
+sys.path.insert(0, 'src')
+
+import httpx
+from weather_client import AsyncWeatherClient
+from destination_reminder import DestinationReminder
+
+SAMPLE_PAYLOAD = {
+    "current_condition": [{
+        "temp_C": "21",
+        "FeelsLikeC": "20",
+        "weatherDesc": [{"value": "Sunny"}],
+        "humidity": "40",
+        "windspeedKmph": "10",
+        "winddir16Point": "N",
+        "uvIndex": "5",
+        "visibility": "10"
+    }],
+    "weather": []
+}
+
+
+def make_reminder(handler) -> DestinationReminder:
+    reminder = DestinationReminder()
+    reminder.weather_client = AsyncWeatherClient(transport=httpx.MockTransport(handler))
+    return reminder
+
+
+def test_async_weather_uses_cache():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=SAMPLE_PAYLOAD)
+
+    async def run():
+        reminder = make_reminder(handler)
+        first = await reminder.get_weather_async("北京")
+        second = await reminder.get_weather_async("北京")
+        await reminder.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["current"]["temperature"] == "21"
+    assert second is first
+    assert len(calls) == 1
+    print("✓ 测试通过")
+
+
+def test_async_weather_deadline():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200, json=SAMPLE_PAYLOAD)
+
+    async def run():
+        reminder = make_reminder(handler)
+        result = await reminder.get_weather_async("上海", timeout=0.05)
+        stats = reminder.get_weather_stats()
+        await reminder.aclose()
+        return result, stats
+
+    result, stats = asyncio.run(run())
+    assert "error" in result
+    assert stats["client"]["timeouts"] == 1
+    print("✓ 测试通过")
+
+
+def test_httpx_timeout_counted_as_timeout():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    async def run():
+        reminder = make_reminder(handler)
+        result = await reminder.get_weather_async("广州")
+        stats = reminder.get_weather_stats()["client"]
+        await reminder.aclose()
+        return result, stats
+
+    result, stats = asyncio.run(run())
+    assert result["error"] == "获取天气信息失败: 请求超时"
+    assert stats["timeouts"] == 1 and stats["failures"] == 0
+    print("✓ 测试通过")
+
+
+def test_client_from_previous_loop_closed():
+    client = AsyncWeatherClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=SAMPLE_PAYLOAD)))
+
+    async def fetch():
+        await client.fetch_weather_json("北京")
+        return client._client
+
+    first = asyncio.run(fetch())
+
+    async def fetch_again():
+        second = await fetch()
+        await asyncio.sleep(0)
+        return second
+
+    second = asyncio.run(fetch_again())
+    assert second is not first
+    assert first.is_closed
+    assert client.get_stats()["clients_created"] == 2
+    print("✓ 测试通过")
+
+
+def test_async_weather_http_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def run():
+        reminder = make_reminder(handler)
+        result = await reminder.get_weather_async("杭州")
+        await reminder.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result["error"].startswith("获取天气信息失败")
+    print("✓ 测试通过")
+
+
+def test_concurrent_lookups_coalesced():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=SAMPLE_PAYLOAD)
+
+    async def run():
+        reminder = make_reminder(handler)
+        results = await asyncio.gather(*[reminder.get_destination_info_async("北京") for _ in range(20)])
+        stats = reminder.get_weather_stats()["single_flight"]
+        await reminder.aclose()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert stats["destination_info"]["coalesced"] == 19
+    assert stats["weather"]["executions"] == 1
+    print("✓ 测试通过")
+
+
+def test_coalesced_lookups_echo_normalized_location():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=SAMPLE_PAYLOAD)
+
+    async def run():
+        reminder = make_reminder(handler)
+        results = await asyncio.gather(reminder.get_destination_info_async(" 北京"),
+                                       reminder.get_destination_info_async("北京 "))
+        await reminder.aclose()
+        return results
+
+    first, second = asyncio.run(run())
+    assert first["location"] == second["location"] == "北京"
+    assert first["weather"]["location"] == "北京"
+    print("✓ 测试通过")
+
+
+def test_weather_batch_partial_results():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if "%E9%94%99" in request.url.raw_path.decode():
+            return httpx.Response(404)
+        return httpx.Response(200, json=SAMPLE_PAYLOAD)
+
+    async def run():
+        reminder = make_reminder(handler)
+        batch = await reminder.get_weather_batch_async(["北京", "错误地点", "北京 ", "上海", ""])
+        await reminder.aclose()
+        return batch
+
+    batch = asyncio.run(run())
+    assert batch["total"] == 5
+    assert batch["unique_locations"] == 3
+    assert len(calls) == 3
+    assert [item["success"] for item in batch["results"]] == [True, False, True, True, False]
+    assert batch["succeeded"] == 3 and batch["failed"] == 2
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    print("Testing Async Weather Client\n")
+
+    test_async_weather_uses_cache()
+    test_async_weather_deadline()
+    test_httpx_timeout_counted_as_timeout()
+    test_client_from_previous_loop_closed()
+    test_async_weather_http_error()
+    test_concurrent_lookups_coalesced()
+    test_coalesced_lookups_echo_normalized_location()
+    test_weather_batch_partial_results()
+
+    print("\nAll tests completed!")